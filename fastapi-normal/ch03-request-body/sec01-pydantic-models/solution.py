@@ -4,9 +4,9 @@ sec01 모범 답안: Pydantic 기본 모델
 테스트: python solution.py
 """
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.testclient import TestClient
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError
 from typing import Optional
 
 app = FastAPI()
@@ -116,6 +116,97 @@ async def create_review(review: ProductReview):
     }
 
 
+# ============================================================
+# 상품 리뷰 대량 등록 (JSON Lines)
+# ============================================================
+# 리뷰 수백만 건을 /reviews로 한 건씩 보내면 요청마다 HTTP 처리와 검증 준비 비용이 듭니다.
+# /reviews/bulk는 한 줄에 리뷰 하나인 NDJSON(application/x-ndjson) 본문을 받아
+# request.stream()으로 청크를 읽으면서 완성된 줄부터 바로 검증합니다.
+# 본문 전체나 검증된 리뷰 목록을 쌓아두지 않으므로, 스트림이 아무리 커도
+# 메모리는 줄 하나(최대 MAX_LINE_BYTES)와 에러 보고(최대 MAX_REPORTED_ERRORS건) 수준입니다.
+
+review_adapter = TypeAdapter(ProductReview)
+
+MAX_LINE_BYTES = 64 * 1024        # 한 줄(리뷰 하나)의 최대 크기
+MAX_REPORTED_ERRORS = 100         # 응답에 담을 줄별 에러 최대 개수
+
+
+class BulkReviewReport:
+    """줄 단위 검증 결과를 집계합니다. 에러 상세는 최대 max_errors건만 보관합니다."""
+
+    def __init__(self, max_errors: int = MAX_REPORTED_ERRORS):
+        self.max_errors = max_errors
+        self.total = 0
+        self.accepted = 0
+        self.rejected = 0
+        self.errors: list[dict] = []
+
+    def add_line(self, line_no: int, line: bytes) -> None:
+        line = line.strip()
+        if not line:
+            return
+        self.total += 1
+        if len(line) > MAX_LINE_BYTES:
+            self.reject(line_no, [{
+                "type": "line_too_long",
+                "loc": [],
+                "msg": f"줄이 {MAX_LINE_BYTES}바이트를 넘습니다"
+            }])
+            return
+        try:
+            review_adapter.validate_json(line)
+        except ValidationError as exc:
+            self.reject(line_no, exc.errors(
+                include_url=False, include_context=False, include_input=False
+            ))
+            return
+        # 실제 서비스에서는 여기서 검증된 리뷰를 배치로 모아 저장합니다.
+        self.accepted += 1
+
+    def reject(self, line_no: int, errors: list) -> None:
+        self.rejected += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"line": line_no, "errors": errors})
+
+
+@app.post("/reviews/bulk", openapi_extra={
+    "requestBody": {
+        "content": {"application/x-ndjson": {"schema": {"type": "string"}}},
+        "required": True,
+    }
+})
+async def create_reviews_bulk(request: Request):
+    """
+    NDJSON 스트림으로 상품 리뷰를 대량 등록합니다.
+
+    줄마다 ProductReview 규칙으로 검증하고, 실패한 줄의 번호와 에러를 보고합니다.
+    한 줄이 실패해도 나머지 줄은 계속 처리합니다.
+    """
+    report = BulkReviewReport()
+    buffer = b""
+    line_no = 0
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            line_no += 1
+            report.add_line(line_no, line)
+        # 줄바꿈 없이 계속 들어오는 데이터가 버퍼를 키우지 않도록 잘라냅니다.
+        if len(buffer) > MAX_LINE_BYTES:
+            buffer = buffer[:MAX_LINE_BYTES + 1]
+    if buffer:
+        report.add_line(line_no + 1, buffer)
+
+    return {
+        "message": "리뷰 대량 등록이 완료되었습니다",
+        "total": report.total,
+        "accepted": report.accepted,
+        "rejected": report.rejected,
+        "errors": report.errors,
+        "errors_truncated": report.rejected > len(report.errors)
+    }
+
+
 # ============================================================
 # 테스트 코드
 # ============================================================
@@ -225,6 +316,40 @@ if __name__ == "__main__":
     assert response.status_code == 422
     print("[PASS] 제목 길이 검증 테스트 통과")
 
+    # 테스트 2-5: NDJSON 대량 등록 - 잘못된 줄만 보고하고 나머지는 등록
+    import json
+    lines = [
+        json.dumps({"product_id": i, "rating": 4, "title": "대량 등록 리뷰", "reviewer_name": "홍길동"})
+        for i in range(1, 1001)
+    ]
+    lines[9] = json.dumps({"product_id": 10, "rating": 9, "title": "별점 오류 리뷰", "reviewer_name": "홍길동"})
+    lines[19] = "{not json"
+    body = ("\n".join(lines) + "\n\n").encode()
+    chunks = [body[i:i + 1000] for i in range(0, len(body), 1000)]  # 줄 중간에서 잘린 청크
+    response = client.post(
+        "/reviews/bulk",
+        content=iter(chunks),
+        headers={"Content-Type": "application/x-ndjson"}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == 1000
+    assert data["accepted"] == 998
+    assert data["rejected"] == 2
+    assert [error["line"] for error in data["errors"]] == [10, 20]
+    assert data["errors"][0]["errors"][0]["loc"] == ["rating"]
+    assert data["errors_truncated"] is False
+    print("[PASS] NDJSON 대량 등록 테스트 통과")
+
+    # 테스트 2-6: 에러 보고 개수 제한 (마지막 줄은 줄바꿈 없이 끝남)
+    body = "\n".join(["{}"] * (MAX_REPORTED_ERRORS + 50)).encode()
+    response = client.post("/reviews/bulk", content=body)
+    data = response.json()
+    assert data["rejected"] == MAX_REPORTED_ERRORS + 50
+    assert len(data["errors"]) == MAX_REPORTED_ERRORS
+    assert data["errors_truncated"] is True
+    print("[PASS] 에러 보고 개수 제한 테스트 통과")
+
     print()
     print("=" * 50)
     print("모든 테스트를 통과했습니다!")
@@ -0,0 +1,53 @@
+# 벤치마크: 주문 상품 수에 따른 requests/sec (/orders vs /orders/ingest)
+# 실행: python benchmark.py [요청 수]
+
+import json
+import sys
+import time
+
+from fastapi.testclient import TestClient
+
+from solution import app
+
+ITEM_COUNTS = [10, 100, 1_000, 10_000]
+
+
+def make_order(item_count: int) -> bytes:
+    return json.dumps({
+        "customer_name": "대량주문",
+        "address": {"city": "서울", "street": "테스트로 1", "zip_code": "12345"},
+        "items": [
+            {"product_name": f"상품{i}", "quantity": i % 5 + 1, "unit_price": 1000 + i}
+            for i in range(item_count)
+        ],
+    }).encode()
+
+
+def requests_per_sec(client: TestClient, path: str, body: bytes, n: int) -> float:
+    headers = {"Content-Type": "application/json"}
+    client.post(path, content=body, headers=headers)  # 워밍업
+    start = time.perf_counter()
+    for _ in range(n):
+        response = client.post(path, content=body, headers=headers)
+    elapsed = time.perf_counter() - start
+    assert response.status_code == 200
+    return n / elapsed
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    print("=" * 50)
+    print("주문 처리 벤치마크 (requests/sec)")
+    print("=" * 50)
+
+    client = TestClient(app)
+    for item_count in ITEM_COUNTS:
+        body = make_order(item_count)
+        # 큰 주문은 요청 수를 줄여 실행 시간을 비슷하게 맞춥니다.
+        repeat = max(5, n * 10 // item_count) if item_count > 10 else n
+        legacy = requests_per_sec(client, "/orders", body, repeat)
+        fast = requests_per_sec(client, "/orders/ingest", body, repeat)
+        print(f"  상품 {item_count:>6,}개 ({len(body) / 1024:>7,.1f} KB)"
+              f"  /orders: {legacy:>8,.1f} req/s   /orders/ingest: {fast:>8,.1f} req/s"
+              f"  ({fast / legacy:.1f}x)")
@@ -4,9 +4,10 @@ sec02 모범 답안: 중첩 모델
 테스트: python solution.py
 """
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, Response
+from fastapi.exceptions import RequestValidationError
 from fastapi.testclient import TestClient
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ValidationError
 from typing import Optional
 
 app = FastAPI()
@@ -119,6 +120,54 @@ async def create_order(order: OrderCreate):
     }
 
 
+# ============================================================
+# 대량 주문 고속 처리 경로
+# ============================================================
+# /orders는 본문 JSON → 파이썬 dict → OrderCreate 검증 → model_dump() → dict
+# → jsonable_encoder → json.dumps 순서로 처리합니다. 상품이 수천 개인 주문에서는
+# 중간에 만들어지는 dict/list 복사본이 대부분의 시간을 차지합니다.
+#
+# /orders/ingest는 같은 요청/응답 형식을 유지하면서
+# - model_validate_json()으로 원본 bytes를 Rust 파서에서 바로 검증하고
+# - total_amount를 상품 목록 한 번 순회로 계산한 뒤
+# - model_dump_json()이 만든 bytes를 응답 본문에 그대로 이어 붙입니다.
+
+ORDER_CREATED_PREFIX = '{"message":"주문이 생성되었습니다","order":'.encode()
+
+
+@app.post("/orders/ingest", openapi_extra={
+    "requestBody": {
+        "content": {"application/json": {"schema": OrderCreate.model_json_schema()}},
+        "required": True,
+    }
+})
+async def ingest_order(request: Request):
+    """
+    /orders와 같은 주문을 더 적은 복사로 처리합니다.
+
+    검증 실패 시에는 FastAPI 기본 형식과 같은 422 응답을 반환합니다.
+    """
+    try:
+        order = OrderCreate.model_validate_json(await request.body())
+    except ValidationError as exc:
+        raise RequestValidationError([
+            {**error, "loc": ("body", *error["loc"])}
+            for error in exc.errors(include_url=False)
+        ])
+
+    total_amount = 0
+    for item in order.items:
+        total_amount += item.quantity * item.unit_price
+
+    body = (
+        ORDER_CREATED_PREFIX
+        + order.model_dump_json().encode()
+        + b',"total_amount":' + str(total_amount).encode()
+        + b"}"
+    )
+    return Response(content=body, media_type="application/json")
+
+
 # ============================================================
 # 테스트 코드
 # ============================================================
@@ -227,6 +276,34 @@ if __name__ == "__main__":
     assert response.json()["order"]["note"] is None
     print("[PASS] note 기본값(None) 테스트 통과")
 
+    # 테스트 7: /orders/ingest는 /orders와 같은 응답을 반환
+    bulk_order = {
+        "customer_name": "대량주문",
+        "address": {"city": "서울", "street": "테스트로 1", "zip_code": "12345"},
+        "items": [
+            {"product_name": f"상품{i}", "quantity": i % 5 + 1, "unit_price": 1000 + i}
+            for i in range(1000)
+        ]
+    }
+    expected = client.post("/orders", json=bulk_order).json()
+    response = client.post("/orders/ingest", json=bulk_order)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert response.json() == expected
+    print(f"[PASS] 고속 경로 응답 일치 테스트 통과 (총액: {expected['total_amount']:,}원)")
+
+    # 테스트 8: /orders/ingest 검증 실패 -> /orders와 같은 422 응답
+    invalid_order = {
+        "customer_name": "x",
+        "address": {"city": "서울", "street": "테스트로 1", "zip_code": "123"},
+        "items": []
+    }
+    expected = client.post("/orders", json=invalid_order)
+    response = client.post("/orders/ingest", json=invalid_order)
+    assert response.status_code == 422
+    assert response.json() == expected.json()
+    print("[PASS] 고속 경로 검증 실패 422 테스트 통과")
+
     print()
     print("=" * 50)
     print("모든 테스트를 통과했습니다!")
@@ -0,0 +1,154 @@
+# 벤치마크 1 (memory): 큰 파일 업로드 시 최대 메모리(RSS)
+#   - read-all : 이전 방식 (contents = await file.read())
+#   - chunked  : POST /upload (UploadFile을 CHUNK_SIZE씩 읽기)
+#   - stream   : POST /upload/stream (request.stream()으로 본문 직접 읽기)
+# 벤치마크 2 (multi): 여러 파일 크기/SHA-256 계산 - 순차 처리 vs 스레드 풀 동시 처리
+# 실행: python benchmark.py [memory] [MB 단위 크기, 기본 1024]
+#       python benchmark.py multi [파일 수, 기본 50] [파일당 MB, 기본 20]
+#
+# 최대 RSS는 프로세스마다 한 번만 기록되므로 방식마다 별도 프로세스에서 실행합니다.
+# TestClient는 요청 본문을 통째로 메모리에 올리므로, 본문을 스트리밍으로 보내는
+# httpx.AsyncClient + ASGITransport를 사용합니다.
+
+import asyncio
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+from fastapi import File, UploadFile
+from starlette.concurrency import run_in_threadpool
+
+import solution
+from solution import app, digest_file
+
+MB = 1024 * 1024
+BOUNDARY = "benchmark-boundary"
+VARIANTS = ["read-all", "chunked", "stream"]
+
+
+@app.post("/upload/read-all")
+async def upload_read_all(file: UploadFile = File(...)):
+    contents = await file.read()
+    return {"filename": file.filename, "size": len(contents)}
+
+
+async def zero_chunks(total: int):
+    chunk = b"\0" * MB
+    sent = 0
+    while sent < total:
+        piece = chunk[: min(MB, total - sent)]
+        sent += len(piece)
+        yield piece
+
+
+async def multipart_body(total: int):
+    yield (
+        f"--{BOUNDARY}\r\n"
+        'Content-Disposition: form-data; name="file"; filename="big.bin"\r\n'
+        "Content-Type: application/octet-stream\r\n\r\n"
+    ).encode()
+    async for piece in zero_chunks(total):
+        yield piece
+    yield f"\r\n--{BOUNDARY}--\r\n".encode()
+
+
+async def upload(variant: str, total: int) -> dict:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test", timeout=None) as client:
+        if variant == "stream":
+            response = await client.post(
+                "/upload/stream", params={"filename": "big.bin"}, content=zero_chunks(total)
+            )
+        else:
+            path = "/upload/read-all" if variant == "read-all" else "/upload"
+            response = await client.post(
+                path,
+                content=multipart_body(total),
+                headers={"Content-Type": f"multipart/form-data; boundary={BOUNDARY}"},
+            )
+    response.raise_for_status()
+    return response.json()
+
+
+def peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # Linux: KB 단위
+
+
+def run_variant(variant: str, size_mb: int) -> None:
+    solution.MAX_UPLOAD_SIZE = max(solution.MAX_UPLOAD_SIZE, size_mb * MB)
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    result = asyncio.run(upload(variant, size_mb * MB))
+    elapsed = time.perf_counter() - start
+    assert result["size"] == size_mb * MB
+    print(f"  {variant:<9}  최대 RSS 증가: {peak_rss_mb() - baseline:>8.1f} MB"
+          f"   소요 시간: {elapsed:6.2f} s   ({size_mb / elapsed:,.0f} MB/s)")
+
+
+async def digest_serial(files: list[UploadFile]) -> list:
+    """이전 방식처럼 파일을 하나씩 이벤트 루프에서 처리"""
+    return [digest_file(file.file, solution.MAX_UPLOAD_SIZE) for file in files]
+
+
+async def digest_concurrent(files: list[UploadFile]) -> list:
+    """/upload/multiple과 같은 방식: 파일마다 스레드 풀에서 동시에 처리"""
+    return await asyncio.gather(*(
+        run_in_threadpool(digest_file, file.file, solution.MAX_UPLOAD_SIZE) for file in files
+    ))
+
+
+def run_multi(count: int, size_mb: int) -> None:
+    print("=" * 50)
+    print(f"여러 파일 처리 벤치마크 ({count}개 x {size_mb} MB)")
+    print("=" * 50)
+
+    data = os.urandom(size_mb * MB)
+    with tempfile.TemporaryDirectory() as tmp:
+        # multipart 파싱이 끝난 상태처럼 디스크에 저장된 UploadFile 목록을 만듭니다.
+        files = []
+        for i in range(count):
+            fileobj = open(os.path.join(tmp, f"file{i}.bin"), "w+b")
+            fileobj.write(data)
+            files.append(UploadFile(file=fileobj, filename=f"file{i}.bin"))
+
+        for label, fn in [("순차 처리", digest_serial), ("동시 처리", digest_concurrent)]:
+            start = time.perf_counter()
+            digests = asyncio.run(fn(files))
+            elapsed = time.perf_counter() - start
+            assert len({digest.sha256 for digest in digests}) == 1
+            print(f"  {label}: {elapsed:6.2f} s   ({count * size_mb / elapsed:,.0f} MB/s)")
+
+        for file in files:
+            file.file.close()
+
+
+def run_memory(size_mb: int) -> None:
+    print("=" * 50)
+    print(f"업로드 최대 메모리 벤치마크 ({size_mb:,} MB)")
+    print("=" * 50)
+    for variant in VARIANTS:
+        subprocess.run(
+            [sys.executable, __file__, "--variant", variant, str(size_mb)], check=True
+        )
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if args[:1] == ["--variant"]:
+        run_variant(args[1], int(args[2]))
+    elif args[:1] == ["multi"]:
+        count = int(args[1]) if len(args) > 1 else 50
+        size_mb = int(args[2]) if len(args) > 2 else 20
+        run_multi(count, size_mb)
+    else:
+        # 이전처럼 "python benchmark.py 512"도 memory 벤치마크 크기로 받습니다.
+        if args[:1] == ["memory"]:
+            args = args[1:]
+        if len(args) > 1 or (args and not args[0].isdigit()):
+            sys.exit(f"알 수 없는 인자: {' '.join(args)}\n"
+                     "사용법: python benchmark.py [memory] [MB] | multi [파일 수] [파일당 MB]")
+        run_memory(int(args[0]) if args else 1024)
@@ -5,14 +5,70 @@ sec03 모범 답안: 폼 데이터와 파일 업로드
 사전 설치: pip install python-multipart
 """
 
-from fastapi import FastAPI, Form, File, UploadFile
+from fastapi import FastAPI, Form, File, UploadFile, HTTPException, Request, Query, status
 from fastapi.testclient import TestClient
+from starlette.concurrency import run_in_threadpool
 from typing import Optional
+import asyncio
+import hashlib
 import io
+import os
+import tempfile
 
 app = FastAPI()
 
 
+# ============================================================
+# 공통: 청크 단위 업로드 처리
+# ============================================================
+# await file.read()는 업로드 전체를 메모리에 올립니다 (1GB 파일 → 1GB 메모리).
+# 고정 크기 청크로 나눠 읽으면서 크기와 SHA-256을 누적 계산하면
+# 파일 크기와 관계없이 메모리 사용량이 CHUNK_SIZE 수준으로 유지됩니다.
+
+CHUNK_SIZE = 1024 * 1024                      # 한 번에 읽을 크기 (1MB)
+MAX_UPLOAD_SIZE = 2 * 1024 * 1024 * 1024      # 최대 업로드 크기 (2GB)
+UPLOAD_DIR = os.environ.get("UPLOAD_DIR", tempfile.gettempdir())
+
+
+class UploadDigest:
+    """청크를 받을 때마다 크기와 SHA-256을 갱신하고, 최대 크기를 넘으면 413을 발생시킵니다."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.size = 0
+        self._sha256 = hashlib.sha256()
+
+    def update(self, chunk: bytes) -> None:
+        self.size += len(chunk)
+        if self.size > self.max_size:
+            raise payload_too_large(self.max_size)
+        self._sha256.update(chunk)
+
+    @property
+    def sha256(self) -> str:
+        return self._sha256.hexdigest()
+
+
+def digest_file(fileobj, max_size: int) -> UploadDigest:
+    """파일 객체를 CHUNK_SIZE씩 읽어 크기와 SHA-256을 계산합니다 (블로킹 함수).
+
+    hashlib은 큰 청크를 해싱하는 동안 GIL을 놓기 때문에
+    스레드 풀에서 여러 파일을 동시에 처리하면 CPU 코어를 나눠 쓸 수 있습니다.
+    """
+    digest = UploadDigest(max_size)
+    fileobj.seek(0)
+    while chunk := fileobj.read(CHUNK_SIZE):
+        digest.update(chunk)
+    return digest
+
+
+def payload_too_large(max_size: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"파일이 너무 큽니다 (최대 {max_size}바이트)"
+    )
+
+
 # ============================================================
 # 문제 1: 로그인 폼 API
 # ============================================================
@@ -63,15 +119,107 @@ async def upload_file(
     - filename: 원본 파일명
     - content_type: MIME 타입 (예: text/plain, image/png)
 
-    파일 내용은 비동기 read() 메서드로 읽습니다.
+    파일 내용은 비동기 read(size) 메서드로 CHUNK_SIZE씩 나눠 읽습니다.
+    전체를 한 번에 읽지 않으므로 큰 파일도 메모리를 거의 쓰지 않습니다.
     """
-    # 파일 전체 내용을 읽습니다
-    contents = await file.read()
+    digest = UploadDigest(MAX_UPLOAD_SIZE)
+    while chunk := await file.read(CHUNK_SIZE):
+        digest.update(chunk)
 
     return {
         "filename": file.filename,
         "content_type": file.content_type,
-        "size": len(contents)
+        "size": digest.size,
+        "sha256": digest.sha256
+    }
+
+
+@app.post("/upload/stream")
+async def upload_stream(
+    request: Request,
+    filename: str = Query(..., min_length=1, description="저장할 파일명"),
+    spool: bool = Query(False, description="True이면 UPLOAD_DIR에 디스크로 저장")
+):
+    """
+    요청 본문(application/octet-stream)을 스트리밍으로 받아 처리합니다.
+
+    UploadFile은 multipart 파싱이 끝나야(= 업로드가 전부 도착해야) 핸들러가
+    실행되므로 크기 제한을 늦게 알게 됩니다. request.stream()으로 본문을 직접 읽으면
+    - Content-Length가 최대 크기를 넘으면 본문을 읽기 전에 바로 413
+    - Content-Length가 없어도(chunked) 최대 크기를 넘는 순간 413
+    으로 초과 업로드를 조기에 거절할 수 있습니다.
+    """
+    content_length = request.headers.get("content-length")
+    if content_length is not None:
+        try:
+            declared_size = int(content_length)
+        except ValueError:
+            declared_size = -1
+        if declared_size < 0:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Content-Length 헤더가 올바르지 않습니다"
+            )
+        if declared_size > MAX_UPLOAD_SIZE:
+            raise payload_too_large(MAX_UPLOAD_SIZE)
+
+    digest = UploadDigest(MAX_UPLOAD_SIZE)
+    spool_file = None
+    if spool:
+        spool_file = tempfile.NamedTemporaryFile(
+            dir=UPLOAD_DIR, prefix="upload-", suffix=f"-{os.path.basename(filename)}", delete=False
+        )
+    try:
+        async for chunk in request.stream():
+            digest.update(chunk)
+            if spool_file is not None:
+                # 디스크 쓰기는 블로킹 I/O이므로 스레드 풀에서 실행
+                await run_in_threadpool(spool_file.write, chunk)
+    except BaseException:
+        if spool_file is not None:
+            spool_file.close()
+            os.unlink(spool_file.name)
+        raise
+    if spool_file is not None:
+        spool_file.close()
+
+    return {
+        "filename": filename,
+        "content_type": request.headers.get("content-type"),
+        "size": digest.size,
+        "sha256": digest.sha256,
+        "stored_path": spool_file.name if spool_file is not None else None
+    }
+
+
+@app.post("/upload/multiple")
+async def upload_multiple(
+    files: list[UploadFile] = File(
+        ...,
+        description="업로드할 파일 목록"
+    )
+):
+    """
+    여러 파일을 받아 파일별 크기와 SHA-256을 반환합니다.
+
+    파일마다 digest_file()을 스레드 풀에서 실행하고 asyncio.gather()로 동시에 기다립니다.
+    해싱(CPU 작업)이 이벤트 루프를 막지 않고, 파일들이 병렬로 처리됩니다.
+    """
+    digests = await asyncio.gather(*(
+        run_in_threadpool(digest_file, file.file, MAX_UPLOAD_SIZE) for file in files
+    ))
+
+    return {
+        "count": len(files),
+        "total_size": sum(digest.size for digest in digests),
+        "files": [
+            {
+                "filename": file.filename,
+                "content_type": file.content_type,
+                "size": digest.size,
+                "sha256": digest.sha256
+            }
+            for file, digest in zip(files, digests)
+        ]
     }
 
 
@@ -109,10 +257,15 @@ async def create_post(
     image_size = 0
 
     if image is not None:
-        # 이미지가 첨부된 경우에만 읽기
-        image_contents = await image.read()
+        # 크기만 필요하므로 내용을 읽지 않습니다. multipart 파싱 중에 기록된 image.size를 쓰고,
+        # 없으면 파일 끝으로 이동해 위치로 계산합니다. (해시는 /upload 계열에서만 계산)
         image_filename = image.filename
-        image_size = len(image_contents)
+        image_size = image.size
+        if image_size is None:
+            image_size = image.file.seek(0, os.SEEK_END)
+            image.file.seek(0)
+        if image_size > MAX_UPLOAD_SIZE:
+            raise payload_too_large(MAX_UPLOAD_SIZE)
 
     return {
         "message": "게시글이 생성되었습니다",
@@ -191,6 +344,77 @@ if __name__ == "__main__":
     assert response.json()["content_type"] == "image/png"
     print("[PASS] 이미지 파일 업로드 테스트 통과")
 
+    # 테스트 2-3: 청크 단위로 계산한 SHA-256이 전체 해시와 일치
+    big_content = os.urandom(CHUNK_SIZE * 2 + 123)
+    response = client.post("/upload", files={
+        "file": ("big.bin", io.BytesIO(big_content), "application/octet-stream")
+    })
+    assert response.status_code == 200
+    assert response.json()["size"] == len(big_content)
+    assert response.json()["sha256"] == hashlib.sha256(big_content).hexdigest()
+    print("[PASS] 청크 단위 크기/SHA-256 계산 테스트 통과")
+
+    # 테스트 2-4: 스트리밍 업로드 + 디스크 저장
+    response = client.post(
+        "/upload/stream",
+        params={"filename": "big.bin", "spool": True},
+        content=big_content,
+        headers={"Content-Type": "application/octet-stream"}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["size"] == len(big_content)
+    assert data["sha256"] == hashlib.sha256(big_content).hexdigest()
+    with open(data["stored_path"], "rb") as f:
+        assert f.read() == big_content
+    os.unlink(data["stored_path"])
+    print("[PASS] 스트리밍 업로드 디스크 저장 테스트 통과")
+
+    # 테스트 2-5: 최대 크기 초과 -> 413 (Content-Length 사전 검사 / 스트리밍 중 검사)
+    original_max = MAX_UPLOAD_SIZE
+    MAX_UPLOAD_SIZE = 1000
+    try:
+        response = client.post("/upload/stream", params={"filename": "x.bin"}, content=b"x" * 1001)
+        assert response.status_code == 413
+        response = client.post(
+            "/upload/stream",
+            params={"filename": "x.bin", "spool": True},
+            content=iter([b"x" * 600, b"x" * 600])  # chunked 전송 (Content-Length 없음)
+        )
+        assert response.status_code == 413
+        response = client.post("/upload", files={"file": ("x.bin", io.BytesIO(b"x" * 1001))})
+        assert response.status_code == 413
+    finally:
+        # 단언이 실패해도 다음 테스트가 줄어든 한도를 보지 않도록 되돌립니다.
+        MAX_UPLOAD_SIZE = original_max
+    print("[PASS] 최대 크기 초과 413 테스트 통과")
+
+    # 테스트 2-5b: 잘못된 Content-Length -> 500이 아니라 400
+    response = client.post(
+        "/upload/stream",
+        params={"filename": "x.bin"},
+        content=iter([b"x"]),
+        headers={"Content-Length": "abc"}
+    )
+    assert response.status_code == 400
+    print("[PASS] 잘못된 Content-Length 400 테스트 통과")
+
+    # 테스트 2-6: 여러 파일 동시 업로드
+    contents = [os.urandom(size) for size in (10, CHUNK_SIZE + 1, 0)]
+    response = client.post("/upload/multiple", files=[
+        ("files", (f"file{i}.bin", io.BytesIO(content), "application/octet-stream"))
+        for i, content in enumerate(contents)
+    ])
+    assert response.status_code == 200
+    data = response.json()
+    assert data["count"] == 3
+    assert data["total_size"] == sum(len(content) for content in contents)
+    for result, content in zip(data["files"], contents):
+        assert result["size"] == len(content)
+        assert result["sha256"] == hashlib.sha256(content).hexdigest()
+    assert [result["filename"] for result in data["files"]] == ["file0.bin", "file1.bin", "file2.bin"]
+    print("[PASS] 여러 파일 동시 업로드 테스트 통과")
+
     print()
     print("=" * 50)
     print("문제 3: 게시글 생성 API 테스트")
@@ -208,7 +432,7 @@ if __name__ == "__main__":
     assert data["post"]["title"] == "첫 번째 게시글"
     assert data["post"]["content"] == "게시글 내용입니다."
     assert data["post"]["image_filename"] == "post_image.jpg"
-    assert data["post"]["image_size"] > 0
+    assert data["post"]["image_size"] == len(b"fake image data for post")
     print("[PASS] 이미지 포함 게시글 테스트 통과")
 
     # 테스트 3-2: 이미지 없이 게시글
@@ -0,0 +1,44 @@
+# 벤치마크: 저장소별 동시 생성 처리량 (스레드 1 / 8 / 32개)
+# 실행: python benchmark.py [스레드당 생성 수]
+
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from solution import InMemoryRepository, SQLiteRepository
+
+THREAD_COUNTS = [1, 8, 32]
+
+
+def run(repo, threads: int, per_thread: int) -> float:
+    """threads개 스레드가 per_thread건씩 생성하고 초당 생성 수를 반환합니다."""
+    data = {"username": "hong", "email": "hong@example.com", "password": "secret"}
+
+    def worker(_):
+        return [repo.create(data)["id"] for _ in range(per_thread)]
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        ids = [i for chunk in pool.map(worker, range(threads)) for i in chunk]
+    elapsed = time.perf_counter() - start
+
+    assert len(set(ids)) == len(ids) == threads * per_thread, "ID가 중복 발급되었습니다"
+    return len(ids) / elapsed
+
+
+if __name__ == "__main__":
+    per_thread = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+
+    print("=" * 50)
+    print(f"동시 생성 처리량 벤치마크 (스레드당 {per_thread:,}건)")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for threads in THREAD_COUNTS:
+            memory_rate = run(InMemoryRepository(), threads, per_thread)
+            sqlite_repo = SQLiteRepository(os.path.join(tmp, f"bench_{threads}.db"), "users")
+            sqlite_rate = run(sqlite_repo, threads, per_thread)
+            print(f"  스레드 {threads:>2}개  memory: {memory_rate:>12,.0f} creates/s"
+                  f"   sqlite: {sqlite_rate:>10,.0f} creates/s")
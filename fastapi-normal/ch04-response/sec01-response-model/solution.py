@@ -1,6 +1,12 @@
 # 실행: uvicorn solution:app --reload
 # 테스트: python solution.py
 
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
 from pydantic import BaseModel
@@ -8,9 +14,172 @@ from typing import Optional
 
 app = FastAPI()
 
+
+# ── 저장소 계층 ──
+# 모듈 전역 딕셔너리 + `global *_id_counter` 방식은 sync 핸들러가 스레드 풀에서
+# 동시에 실행되면 같은 ID가 두 번 발급될 수 있고, uvicorn 워커를 여러 개 띄우면
+# 워커마다 다른 데이터를 보게 됩니다.
+# 저장소를 교체 가능한 계층으로 분리하고, 환경 변수로 구현체를 고릅니다.
+#   STORE_BACKEND=memory (기본값): 프로세스 내부 딕셔너리 + 잠금
+#   STORE_BACKEND=sqlite         : SQLite 파일을 여러 워커가 공유 (STORE_PATH)
+# STORE_PATH 기본값은 임시 디렉터리라서 실행한 위치에 DB 파일이 생기지 않습니다.
+
+STORE_BACKEND = os.environ.get("STORE_BACKEND", "memory")
+STORE_PATH = os.environ.get("STORE_PATH", os.path.join(tempfile.gettempdir(), "ch04_store.db"))
+
+
+class IdAllocator:
+    """스레드 안전한 순차 ID 발급기"""
+
+    def __init__(self, start: int = 1):
+        self._next_id = start
+        self._lock = threading.Lock()
+
+    def allocate(self) -> int:
+        with self._lock:
+            new_id = self._next_id
+            self._next_id += 1
+            return new_id
+
+
+class InMemoryRepository:
+    """프로세스 내부 저장소 - 빠르지만 워커 간에 공유되지 않습니다."""
+
+    def __init__(self, initial: dict[int, dict] | None = None):
+        self._items: dict[int, dict] = dict(initial or {})
+        self._ids = IdAllocator(max(self._items, default=0) + 1)
+        self._lock = threading.Lock()
+
+    def create(self, data: dict) -> dict:
+        item = {**data, "id": self._ids.allocate()}
+        with self._lock:
+            self._items[item["id"]] = item
+        return item
+
+    def get(self, item_id: int) -> dict | None:
+        return self._items.get(item_id)
+
+    def list(self) -> list[dict]:
+        with self._lock:
+            return list(self._items.values())
+
+    def update(self, item_id: int, changes: dict) -> dict | None:
+        with self._lock:
+            item = self._items.get(item_id)
+            if item is None:
+                return None
+            item.update(changes)
+            return item
+
+    def delete(self, item_id: int) -> bool:
+        with self._lock:
+            return self._items.pop(item_id, None) is not None
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+class SQLiteRepository:
+    """SQLite 파일 저장소 - 여러 프로세스(uvicorn 워커)가 같은 데이터를 공유합니다.
+
+    ID는 SQLite의 AUTOINCREMENT가 발급하므로 프로세스 사이에서도 중복되지 않습니다.
+    sqlite3 연결은 스레드 간에 공유할 수 없어서 스레드마다 따로 엽니다.
+    """
+
+    def __init__(self, path: str, table: str, initial: dict[int, dict] | None = None):
+        self.path = path
+        self.table = table
+        self._local = threading.local()
+        conn = self._conn()
+        # 초기 데이터는 테이블을 처음 만들 때 한 번만 넣습니다. 워커가 뜰 때마다 넣으면
+        # 삭제한 초기 데이터가 되살아납니다. store_seeds 표시와 삽입을 쓰기 잠금 하나로
+        # 묶어, 여러 워커가 동시에 시작해도 한 워커만 넣습니다.
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} "
+                "(id INTEGER PRIMARY KEY AUTOINCREMENT, data TEXT NOT NULL)"
+            )
+            conn.execute("CREATE TABLE IF NOT EXISTS store_seeds (name TEXT PRIMARY KEY)")
+            first_boot = conn.execute(
+                "INSERT OR IGNORE INTO store_seeds (name) VALUES (?)", (table,)
+            ).rowcount == 1
+            if first_boot:
+                for item_id, item in (initial or {}).items():
+                    data = {k: v for k, v in item.items() if k != "id"}
+                    conn.execute(
+                        f"INSERT OR IGNORE INTO {table} (id, data) VALUES (?, ?)",
+                        (item_id, json.dumps(data)),
+                    )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # isolation_level=None: 각 문장이 바로 커밋되고, 필요한 곳만 BEGIN으로 묶습니다.
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _to_item(item_id: int, data: str) -> dict:
+        return {**json.loads(data), "id": item_id}
+
+    def create(self, data: dict) -> dict:
+        cursor = self._conn().execute(
+            f"INSERT INTO {self.table} (data) VALUES (?)", (json.dumps(data),)
+        )
+        return {**data, "id": cursor.lastrowid}
+
+    def get(self, item_id: int) -> dict | None:
+        row = self._conn().execute(
+            f"SELECT id, data FROM {self.table} WHERE id = ?", (item_id,)
+        ).fetchone()
+        return self._to_item(*row) if row else None
+
+    def list(self) -> list[dict]:
+        rows = self._conn().execute(f"SELECT id, data FROM {self.table} ORDER BY id")
+        return [self._to_item(*row) for row in rows]
+
+    def update(self, item_id: int, changes: dict) -> dict | None:
+        conn = self._conn()
+        # 읽기-수정-쓰기 사이에 다른 워커가 끼어들지 않도록 쓰기 잠금을 먼저 잡습니다.
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            item = self.get(item_id)
+            if item is not None:
+                item.update(changes)
+                data = {k: v for k, v in item.items() if k != "id"}
+                conn.execute(
+                    f"UPDATE {self.table} SET data = ? WHERE id = ?", (json.dumps(data), item_id)
+                )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return item
+
+    def delete(self, item_id: int) -> bool:
+        cursor = self._conn().execute(f"DELETE FROM {self.table} WHERE id = ?", (item_id,))
+        return cursor.rowcount > 0
+
+    def __len__(self) -> int:
+        return self._conn().execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+
+def make_repository(table: str, initial: dict[int, dict] | None = None):
+    """STORE_BACKEND 설정에 맞는 저장소를 만듭니다."""
+    if STORE_BACKEND == "sqlite":
+        return SQLiteRepository(STORE_PATH, table, initial)
+    return InMemoryRepository(initial)
+
+
 # 가상 데이터베이스
-fake_db = {}
-user_id_counter = 0
+fake_db = make_repository("users")
 
 
 # 요청용 모델: 클라이언트가 보내는 데이터
@@ -34,15 +203,9 @@ class UserResponse(BaseModel):
 # 반환 데이터에서 password가 자동으로 제거됩니다.
 @app.post("/users", response_model=UserResponse)
 async def create_user(user: UserCreate):
-    global user_id_counter
-    user_id_counter += 1
-
-    # 사용자 데이터를 딕셔너리로 변환하고 ID 추가
-    user_data = user.model_dump()
-    user_data["id"] = user_id_counter
-
-    # 가상 데이터베이스에 저장 (password 포함)
-    fake_db[user_id_counter] = user_data
+    # 사용자 데이터를 딕셔너리로 변환하고 가상 데이터베이스에 저장 (password 포함)
+    # ID는 저장소가 원자적으로 발급합니다.
+    user_data = fake_db.create(user.model_dump())
 
     # user_data에는 password가 포함되어 있지만,
     # response_model=UserResponse 덕분에 응답에서 자동 제외됩니다.
@@ -102,4 +265,32 @@ if __name__ == "__main__":
     assert data["full_name"] is None
     print("✓ full_name 없는 사용자 생성 테스트 통과")
 
+    # 테스트 4: 여러 스레드가 동시에 생성해도 ID가 중복되지 않음
+    from concurrent.futures import ThreadPoolExecutor
+
+    repo = InMemoryRepository()
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        created = list(pool.map(lambda i: repo.create({"n": i}), range(1000)))
+    assert sorted(item["id"] for item in created) == list(range(1, 1001))
+    assert len(repo) == 1000
+    print("✓ 동시 생성 시 ID 중복 없음 테스트 통과")
+
+    # 테스트 5: SQLite 저장소 - 조회/수정/삭제, 재시작해도 삭제한 초기 데이터는 돌아오지 않음
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "store.db")
+        initial = {1: {"id": 1, "username": "seed"}}
+        repo = SQLiteRepository(path, "users", initial)
+        assert repo.get(1) == {"id": 1, "username": "seed"}
+        assert repo.update(1, {"username": "renamed"})["username"] == "renamed"
+        assert repo.get(1)["username"] == "renamed"
+        assert repo.update(99, {"username": "x"}) is None
+        assert repo.delete(1) is True
+        assert repo.delete(1) is False
+
+        restarted = SQLiteRepository(path, "users", initial)  # 다른 워커가 시작한 것처럼
+        assert restarted.get(1) is None
+        assert restarted.create({"username": "kim"})["id"] == 2  # AUTOINCREMENT는 재사용 안 함
+        assert len(restarted) == 1
+    print("✓ SQLite 저장소 조회/수정/삭제 및 초기 데이터 1회 삽입 테스트 통과")
+
     print("\n모든 테스트를 통과했습니다!")
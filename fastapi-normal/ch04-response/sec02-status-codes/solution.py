@@ -1,16 +1,150 @@
 # 실행: uvicorn solution:app --reload
 # 테스트: python solution.py
 
-from fastapi import FastAPI, status
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+
+from fastapi import FastAPI, HTTPException, status
 from fastapi.testclient import TestClient
 from pydantic import BaseModel
 from typing import Optional
 
 app = FastAPI()
 
+
+# ── 저장소 계층 (sec01에서 학습한 내용) ──
+# STORE_BACKEND=memory(기본값) 또는 sqlite(STORE_PATH 파일을 워커끼리 공유)
+# 할일에는 초기 데이터가 없으므로 초기 데이터 삽입은 빼고 옮겨 왔습니다.
+
+STORE_BACKEND = os.environ.get("STORE_BACKEND", "memory")
+STORE_PATH = os.environ.get("STORE_PATH", os.path.join(tempfile.gettempdir(), "ch04_store.db"))
+
+class IdAllocator:
+    """스레드 안전한 순차 ID 발급기"""
+
+    def __init__(self, start: int = 1):
+        self._next_id = start
+        self._lock = threading.Lock()
+
+    def allocate(self) -> int:
+        with self._lock:
+            new_id = self._next_id
+            self._next_id += 1
+            return new_id
+
+
+class InMemoryRepository:
+    """프로세스 내부 저장소 (dict + 잠금)"""
+
+    def __init__(self):
+        self._items: dict[int, dict] = {}
+        self._ids = IdAllocator()
+        self._lock = threading.Lock()
+
+    def create(self, data: dict) -> dict:
+        item = {**data, "id": self._ids.allocate()}
+        with self._lock:
+            self._items[item["id"]] = item
+        return item
+
+    def get(self, item_id: int) -> dict | None:
+        return self._items.get(item_id)
+
+    def list(self) -> list[dict]:
+        with self._lock:
+            return list(self._items.values())
+
+    def update(self, item_id: int, changes: dict) -> dict | None:
+        with self._lock:
+            item = self._items.get(item_id)
+            if item is None:
+                return None
+            item.update(changes)
+            return item
+
+    def delete(self, item_id: int) -> bool:
+        with self._lock:
+            return self._items.pop(item_id, None) is not None
+
+
+class SQLiteRepository:
+    """SQLite 파일 저장소 (id는 AUTOINCREMENT, 연결은 스레드마다 하나)"""
+
+    def __init__(self, path: str, table: str):
+        self.path = path
+        self.table = table
+        self._local = threading.local()
+        self._conn().execute(
+            f"CREATE TABLE IF NOT EXISTS {table} "
+            "(id INTEGER PRIMARY KEY AUTOINCREMENT, data TEXT NOT NULL)"
+        )
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _to_item(item_id: int, data: str) -> dict:
+        return {**json.loads(data), "id": item_id}
+
+    def create(self, data: dict) -> dict:
+        cursor = self._conn().execute(
+            f"INSERT INTO {self.table} (data) VALUES (?)", (json.dumps(data),)
+        )
+        return {**data, "id": cursor.lastrowid}
+
+    def get(self, item_id: int) -> dict | None:
+        row = self._conn().execute(
+            f"SELECT id, data FROM {self.table} WHERE id = ?", (item_id,)
+        ).fetchone()
+        return self._to_item(*row) if row else None
+
+    def list(self) -> list[dict]:
+        rows = self._conn().execute(f"SELECT id, data FROM {self.table} ORDER BY id")
+        return [self._to_item(*row) for row in rows]
+
+    def update(self, item_id: int, changes: dict) -> dict | None:
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")  # 읽기-수정-쓰기 사이에 다른 워커가 끼어들지 않게
+        try:
+            item = self.get(item_id)
+            if item is not None:
+                item.update(changes)
+                data = {k: v for k, v in item.items() if k != "id"}
+                conn.execute(
+                    f"UPDATE {self.table} SET data = ? WHERE id = ?", (json.dumps(data), item_id)
+                )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return item
+
+    def delete(self, item_id: int) -> bool:
+        cursor = self._conn().execute(f"DELETE FROM {self.table} WHERE id = ?", (item_id,))
+        return cursor.rowcount > 0
+
+
+def make_repository(table: str):
+    """STORE_BACKEND 설정에 맞는 저장소를 만듭니다."""
+    if STORE_BACKEND == "sqlite":
+        return SQLiteRepository(STORE_PATH, table)
+    return InMemoryRepository()
+
+
 # 가상 데이터베이스
-todos_db = {}
-todo_id_counter = 0
+todos_db = make_repository("todos")
+
+
+def todo_not_found() -> HTTPException:
+    return HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="할일을 찾을 수 없습니다")
 
 
 # ── Pydantic 모델 ──
@@ -37,43 +171,41 @@ class TodoResponse(BaseModel):
 # 새로운 리소스를 생성했으므로 201을 반환합니다.
 @app.post("/todos", response_model=TodoResponse, status_code=status.HTTP_201_CREATED)
 async def create_todo(todo: TodoCreate):
-    global todo_id_counter
-    todo_id_counter += 1
-
     todo_data = todo.model_dump()
-    todo_data["id"] = todo_id_counter
     todo_data["completed"] = False  # 기본값: 미완료
 
-    todos_db[todo_id_counter] = todo_data
-    return todo_data
+    return todos_db.create(todo_data)
 
 
 # ── READ ALL: 200 OK (기본값) ──
 # 목록 조회는 기본 상태 코드 200을 사용합니다.
 @app.get("/todos", response_model=list[TodoResponse])
 async def read_todos():
-    return list(todos_db.values())
+    return todos_db.list()
 
 
 # ── READ ONE: 200 OK ──
 # 단건 조회도 기본 상태 코드 200을 사용합니다.
 @app.get("/todos/{todo_id}", response_model=TodoResponse)
 async def read_todo(todo_id: int):
-    return todos_db[todo_id]
+    todo = todos_db.get(todo_id)
+    if todo is None:
+        raise todo_not_found()
+    return todo
 
 
 # ── UPDATE: 200 OK ──
 # 수정 후 변경된 데이터를 응답에 포함하여 200으로 반환합니다.
 @app.put("/todos/{todo_id}", response_model=TodoResponse)
 async def update_todo(todo_id: int, todo_update: TodoUpdate):
-    stored_todo = todos_db[todo_id]
-
     # exclude_unset=True: 클라이언트가 실제로 보낸 필드만 추출
     # 예: {"completed": True}만 보냈다면, title과 description은 건드리지 않음
     update_data = todo_update.model_dump(exclude_unset=True)
-    stored_todo.update(update_data)
 
-    return stored_todo
+    todo = todos_db.update(todo_id, update_data)
+    if todo is None:
+        raise todo_not_found()
+    return todo
 
 
 # ── DELETE: 204 No Content ──
@@ -81,7 +213,8 @@ async def update_todo(todo_id: int, todo_update: TodoUpdate):
 # 204는 응답 본문이 없어야 하므로 아무것도 return하지 않습니다.
 @app.delete("/todos/{todo_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_todo(todo_id: int):
-    del todos_db[todo_id]
+    if not todos_db.delete(todo_id):
+        raise todo_not_found()
     # return 없음 - 204 No Content
 
 
@@ -138,4 +271,10 @@ if __name__ == "__main__":
     assert len(response.json()) == 0
     print("✓ 삭제 후 목록 비어있음 확인")
 
+    # 테스트 7: 없는 할일은 조회/수정/삭제 모두 404 Not Found
+    assert client.get(f"/todos/{todo_id}").status_code == 404
+    assert client.put(f"/todos/{todo_id}", json={"completed": True}).status_code == 404
+    assert client.delete(f"/todos/{todo_id}").status_code == 404
+    print("✓ 없는 할일 - 404 Not Found 테스트 통과")
+
     print("\n모든 테스트를 통과했습니다!")
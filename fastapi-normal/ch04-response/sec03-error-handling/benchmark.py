@@ -0,0 +1,47 @@
+# 벤치마크: 도서 대량 등록 (any() 전체 순회 vs 제목 해시 인덱스)
+# 실행: python benchmark.py [도서 수]
+
+import sys
+import time
+
+from solution import InMemoryBookRepository
+
+
+def scan_import(books: list[dict]) -> float:
+    """이전 방식: 등록할 때마다 books_db 딕셔너리 전체를 순회하며 제목 비교 → O(n²)"""
+    books_db: dict[int, dict] = {}
+    start = time.perf_counter()
+    for book in books:
+        if any(b["title"] == book["title"] for b in books_db.values()):
+            continue
+        book_id = len(books_db) + 1
+        books_db[book_id] = {**book, "id": book_id}
+    return time.perf_counter() - start
+
+
+def indexed_import(books: list[dict]) -> float:
+    repo = InMemoryBookRepository()
+    start = time.perf_counter()
+    for book in books:
+        if repo.find_by_title(book["title"]) is not None:
+            continue
+        repo.create(book)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+    print("=" * 50)
+    print(f"도서 대량 등록 벤치마크 (최대 {n:,}권)")
+    print("=" * 50)
+
+    size = 1_000
+    while size <= n:
+        books = [{"title": f"도서 {i}", "author": "저자", "price": 10000} for i in range(size)]
+        indexed = indexed_import(books)
+        # 전체 순회 방식은 O(n²)이라 큰 크기에서는 건너뜁니다.
+        scan = scan_import(books) if size <= 10_000 else None
+        scan_text = f"{scan:8.3f} s" if scan is not None else "  (생략)"
+        print(f"  {size:>9,}권  any() 순회: {scan_text}   제목 인덱스: {indexed:8.3f} s")
+        size *= 10
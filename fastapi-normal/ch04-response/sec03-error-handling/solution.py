@@ -1,6 +1,12 @@
 # 실행: uvicorn solution:app --reload
 # 테스트: python solution.py
 
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+
 from fastapi import FastAPI, HTTPException, status
 from fastapi.testclient import TestClient
 from pydantic import BaseModel
@@ -8,12 +14,254 @@ from typing import Optional
 
 app = FastAPI()
 
+
+# ── 저장소 계층 (sec01에서 학습한 내용) ──
+# 이 섹션에서 쓰는 create / get / update / delete만 옮겨 왔습니다 (전체 구현은 sec01).
+# STORE_BACKEND=memory(기본값) 또는 sqlite(STORE_PATH 파일을 워커끼리 공유)
+
+STORE_BACKEND = os.environ.get("STORE_BACKEND", "memory")
+STORE_PATH = os.environ.get("STORE_PATH", os.path.join(tempfile.gettempdir(), "ch04_store.db"))
+
+
+class IdAllocator:
+    """스레드 안전한 순차 ID 발급기"""
+
+    def __init__(self, start: int = 1):
+        self._next_id = start
+        self._lock = threading.Lock()
+
+    def allocate(self) -> int:
+        with self._lock:
+            new_id = self._next_id
+            self._next_id += 1
+            return new_id
+
+
+class InMemoryRepository:
+    """프로세스 내부 저장소 (dict + 잠금)"""
+
+    def __init__(self, initial: dict[int, dict] | None = None):
+        self._items: dict[int, dict] = dict(initial or {})
+        self._ids = IdAllocator(max(self._items, default=0) + 1)
+        self._lock = threading.Lock()
+
+    def get(self, item_id: int) -> dict | None:
+        return self._items.get(item_id)
+
+
+class SQLiteRepository:
+    """SQLite 파일 저장소 (id는 AUTOINCREMENT, 연결은 스레드마다 하나)"""
+
+    def __init__(self, path: str, table: str, initial: dict[int, dict] | None = None):
+        self.path = path
+        self.table = table
+        self._local = threading.local()
+        conn = self._conn()
+        # 초기 데이터는 테이블을 처음 만들 때 한 번만 넣습니다 (store_seeds 표시, 쓰기 잠금 안에서).
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} "
+                "(id INTEGER PRIMARY KEY AUTOINCREMENT, data TEXT NOT NULL)"
+            )
+            conn.execute("CREATE TABLE IF NOT EXISTS store_seeds (name TEXT PRIMARY KEY)")
+            if conn.execute(
+                "INSERT OR IGNORE INTO store_seeds (name) VALUES (?)", (table,)
+            ).rowcount == 1:
+                for item_id, item in (initial or {}).items():
+                    data = {k: v for k, v in item.items() if k != "id"}
+                    conn.execute(
+                        f"INSERT OR IGNORE INTO {table} (id, data) VALUES (?, ?)",
+                        (item_id, json.dumps(data)),
+                    )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _to_item(item_id: int, data: str) -> dict:
+        return {**json.loads(data), "id": item_id}
+
+    def create(self, data: dict) -> dict:
+        cursor = self._conn().execute(
+            f"INSERT INTO {self.table} (data) VALUES (?)", (json.dumps(data),)
+        )
+        return {**data, "id": cursor.lastrowid}
+
+    def get(self, item_id: int) -> dict | None:
+        row = self._conn().execute(
+            f"SELECT id, data FROM {self.table} WHERE id = ?", (item_id,)
+        ).fetchone()
+        return self._to_item(*row) if row else None
+
+    def update(self, item_id: int, changes: dict) -> dict | None:
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")  # 읽기-수정-쓰기 사이에 다른 워커가 끼어들지 않게
+        try:
+            item = self.get(item_id)
+            if item is not None:
+                item.update(changes)
+                data = {k: v for k, v in item.items() if k != "id"}
+                conn.execute(
+                    f"UPDATE {self.table} SET data = ? WHERE id = ?", (json.dumps(data), item_id)
+                )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return item
+
+    def delete(self, item_id: int) -> bool:
+        cursor = self._conn().execute(f"DELETE FROM {self.table} WHERE id = ?", (item_id,))
+        return cursor.rowcount > 0
+
+
+# ── 도서 저장소: 제목 해시 인덱스 ──
+# 등록할 때마다 전체 도서를 순회하며 제목을 비교하면 대량 등록이 O(n²)이 됩니다.
+# 제목(선택적으로 casefold) → ID 인덱스를 create / update / delete에서 함께 갱신해
+# 중복 검사를 O(1)로 만들고, 검사와 삽입을 한 번에 처리해 동시 등록에도 안전하게 합니다.
+
+# True이면 "FastAPI 입문"과 "fastapi 입문"을 같은 제목으로 취급합니다.
+TITLE_CASEFOLD = os.environ.get("TITLE_CASEFOLD", "0") == "1"
+
+
+class DuplicateTitleError(Exception):
+    """같은 제목의 도서가 이미 있을 때 저장소가 발생시키는 예외"""
+
+
+def title_key(title: str, casefold: bool) -> str:
+    return title.casefold() if casefold else title
+
+
+class InMemoryBookRepository(InMemoryRepository):
+    """InMemoryRepository + 제목 → ID 해시 인덱스"""
+
+    def __init__(self, initial: dict[int, dict] | None = None, casefold: bool = TITLE_CASEFOLD):
+        super().__init__(initial)
+        self.casefold = casefold
+        self._title_index: dict[str, int] = {}
+        for book in self._items.values():
+            key = title_key(book["title"], casefold)
+            if key in self._title_index:
+                raise DuplicateTitleError(book["title"])
+            self._title_index[key] = book["id"]
+
+    def find_by_title(self, title: str) -> dict | None:
+        book_id = self._title_index.get(title_key(title, self.casefold))
+        return None if book_id is None else self._items[book_id]
+
+    def create(self, data: dict) -> dict:
+        key = title_key(data["title"], self.casefold)
+        with self._lock:
+            if key in self._title_index:
+                raise DuplicateTitleError(data["title"])
+            item = {**data, "id": self._ids.allocate()}
+            self._items[item["id"]] = item
+            self._title_index[key] = item["id"]
+        return item
+
+    def update(self, item_id: int, changes: dict) -> dict | None:
+        with self._lock:
+            item = self._items.get(item_id)
+            if item is None:
+                return None
+            old_key = title_key(item["title"], self.casefold)
+            new_key = title_key(changes.get("title", item["title"]), self.casefold)
+            if new_key != old_key:
+                if new_key in self._title_index:
+                    raise DuplicateTitleError(changes["title"])
+                del self._title_index[old_key]
+                self._title_index[new_key] = item_id
+            item.update(changes)
+            return item
+
+    def delete(self, item_id: int) -> bool:
+        with self._lock:
+            item = self._items.pop(item_id, None)
+            if item is None:
+                return False
+            del self._title_index[title_key(item["title"], self.casefold)]
+            return True
+
+
+class SQLiteBookRepository(SQLiteRepository):
+    """SQLiteRepository + 제목 UNIQUE 표현식 인덱스
+
+    인덱스를 SQLite가 관리하므로 여러 워커가 동시에 등록해도 중복이 생기지 않습니다.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        table: str,
+        initial: dict[int, dict] | None = None,
+        casefold: bool = TITLE_CASEFOLD,
+    ):
+        self.casefold = casefold
+        self._title_expr = (
+            "py_casefold(json_extract(data, '$.title'))" if casefold
+            else "json_extract(data, '$.title')"
+        )
+        super().__init__(path, table, initial)
+        suffix = "ci" if casefold else "cs"
+        try:
+            self._conn().execute(
+                f"CREATE UNIQUE INDEX IF NOT EXISTS {table}_title_{suffix} "
+                f"ON {table} ({self._title_expr})"
+            )
+        except sqlite3.IntegrityError as exc:
+            raise DuplicateTitleError("기존 데이터에 중복 제목이 있습니다") from exc
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = super()._conn()
+            # 표현식 인덱스에 쓰는 함수는 인덱스를 건드리는 모든 연결에 등록되어야 합니다.
+            conn.create_function("py_casefold", 1, str.casefold, deterministic=True)
+        return conn
+
+    def find_by_title(self, title: str) -> dict | None:
+        row = self._conn().execute(
+            f"SELECT id, data FROM {self.table} WHERE {self._title_expr} = ?",
+            (title_key(title, self.casefold),),
+        ).fetchone()
+        return self._to_item(*row) if row else None
+
+    def create(self, data: dict) -> dict:
+        try:
+            return super().create(data)
+        except sqlite3.IntegrityError as exc:
+            raise DuplicateTitleError(data["title"]) from exc
+
+    def update(self, item_id: int, changes: dict) -> dict | None:
+        try:
+            return super().update(item_id, changes)
+        except sqlite3.IntegrityError as exc:
+            raise DuplicateTitleError(changes.get("title")) from exc
+
+
+def make_book_repository(initial: dict[int, dict] | None = None):
+    """STORE_BACKEND 설정에 맞는 도서 저장소를 만듭니다."""
+    if STORE_BACKEND == "sqlite":
+        return SQLiteBookRepository(STORE_PATH, "books", initial)
+    return InMemoryBookRepository(initial)
+
+
 # 가상 데이터베이스
-books_db = {
+initial_books = {
     1: {"id": 1, "title": "파이썬 기초", "author": "홍길동", "price": 25000},
     2: {"id": 2, "title": "FastAPI 입문", "author": "김철수", "price": 30000},
 }
-book_id_counter = 2
+books_db = make_book_repository(initial_books)
 
 
 # ── Pydantic 모델 ──
@@ -35,39 +283,29 @@ class BookResponse(BaseModel):
 # 존재하지 않는 도서를 요청하면 404 에러를 반환합니다.
 @app.get("/books/{book_id}", response_model=BookResponse)
 async def get_book(book_id: int):
-    if book_id not in books_db:
+    book = books_db.get(book_id)
+    if book is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"ID {book_id}인 도서를 찾을 수 없습니다"
         )
-    return books_db[book_id]
+    return book
 
 
 # ── 도서 등록 ──
 # 같은 제목의 도서가 이미 있으면 400 에러를 반환합니다.
 @app.post("/books", response_model=BookResponse, status_code=status.HTTP_201_CREATED)
 async def create_book(book: BookCreate):
-    global book_id_counter
-
-    # 중복 제목 확인
-    # any()를 사용하여 books_db의 모든 값을 순회하며 같은 제목이 있는지 확인
-    title_exists = any(
-        b["title"] == book.title for b in books_db.values()
-    )
-    if title_exists:
+    # 중복 제목 확인과 등록을 저장소가 한 번에 처리합니다.
+    # 제목 인덱스 덕분에 전체 도서를 순회하지 않습니다. (ID도 저장소가 원자적으로 발급)
+    try:
+        return books_db.create(book.model_dump())
+    except DuplicateTitleError:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"'{book.title}' 제목의 도서가 이미 존재합니다"
         )
 
-    # 새 도서 등록
-    book_id_counter += 1
-    book_data = book.model_dump()
-    book_data["id"] = book_id_counter
-    books_db[book_id_counter] = book_data
-
-    return book_data
-
 
 # ── 도서 삭제 ──
 # 1. 도서가 존재하지 않으면 404 에러
@@ -76,7 +314,7 @@ async def create_book(book: BookCreate):
 @app.delete("/books/{book_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_book(book_id: int, user_role: str = "user"):
     # 먼저 도서 존재 여부를 확인
-    if book_id not in books_db:
+    if books_db.get(book_id) is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="해당 도서를 찾을 수 없습니다"
@@ -90,12 +328,18 @@ async def delete_book(book_id: int, user_role: str = "user"):
         )
 
     # 모든 검증 통과 후 삭제
-    del books_db[book_id]
+    books_db.delete(book_id)
     # 204 No Content - 아무것도 반환하지 않음
 
 
 # --- 테스트 ---
 if __name__ == "__main__":
+    if STORE_BACKEND == "sqlite":
+        # 테스트는 도서를 삭제/등록하므로 매번 빈 임시 DB에서 시작합니다.
+        test_dir = tempfile.TemporaryDirectory()
+        books_db = SQLiteBookRepository(
+            os.path.join(test_dir.name, "books.db"), "books", initial_books
+        )
     client = TestClient(app)
 
     # 테스트 1: 존재하는 도서 조회 (200 OK)
@@ -154,4 +398,60 @@ if __name__ == "__main__":
     assert response.status_code == 404
     print("✓ 삭제된 도서 조회 - 404 Not Found 테스트 통과")
 
+    # 테스트 9: 삭제된 도서의 제목은 인덱스에서 해제되어 다시 등록 가능
+    response = client.post("/books", json={
+        "title": "파이썬 기초",
+        "author": "홍길동",
+        "price": 27000
+    })
+    assert response.status_code == 201
+    assert books_db.find_by_title("파이썬 기초")["id"] == response.json()["id"]
+    print("✓ 삭제 후 같은 제목 재등록 테스트 통과")
+
+    # 테스트 10: casefold 옵션을 켜면 대소문자만 다른 제목도 중복으로 처리
+    repo = InMemoryBookRepository(casefold=True)
+    repo.create({"title": "FastAPI 입문", "author": "김철수", "price": 30000})
+    try:
+        repo.create({"title": "fastapi 입문", "author": "다른 저자", "price": 1000})
+        raise AssertionError("DuplicateTitleError가 발생해야 합니다")
+    except DuplicateTitleError:
+        pass
+    assert InMemoryBookRepository(casefold=False).find_by_title("x") is None
+    print("✓ 제목 casefold 중복 검사 테스트 통과")
+
+    # 테스트 10-1: 제목을 바꾸면 인덱스도 옮겨지고, 다른 도서의 제목으로는 바꿀 수 없음
+    def check_title_update(repo) -> None:
+        first = repo.create({"title": "A", "author": "x", "price": 1})
+        repo.create({"title": "B", "author": "x", "price": 1})
+        assert repo.update(first["id"], {"title": "C"})["title"] == "C"
+        assert repo.find_by_title("A") is None
+        assert repo.find_by_title("C")["id"] == first["id"]
+        try:
+            repo.update(first["id"], {"title": "B"})
+            raise AssertionError("DuplicateTitleError가 발생해야 합니다")
+        except DuplicateTitleError:
+            pass
+        assert repo.get(first["id"])["title"] == "C"
+        assert repo.update(999, {"title": "D"}) is None
+
+    check_title_update(InMemoryBookRepository())
+    with tempfile.TemporaryDirectory() as tmp:
+        check_title_update(SQLiteBookRepository(os.path.join(tmp, "books.db"), "books"))
+    print("✓ 제목 변경 시 인덱스 갱신 테스트 통과")
+
+    # 테스트 11: SQLite 저장소 - 재시작해도 삭제한 초기 도서는 돌아오지 않고, 제목 인덱스 유지
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "books.db")
+        repo = SQLiteBookRepository(path, "books", initial_books)
+        assert repo.get(1)["title"] == "파이썬 기초"
+        assert repo.delete(1) is True
+        assert repo.delete(1) is False
+        readded = repo.create({"title": "파이썬 기초", "author": "홍길동", "price": 27000})
+
+        restarted = SQLiteBookRepository(path, "books", initial_books)  # 다른 워커가 시작한 것처럼
+        assert restarted.get(1) is None
+        assert restarted.find_by_title("파이썬 기초")["id"] == readded["id"]
+        assert restarted.get(2)["title"] == "FastAPI 입문"
+    print("✓ SQLite 저장소 조회/삭제 및 초기 데이터 1회 삽입 테스트 통과")
+
     print("\n모든 테스트를 통과했습니다!")
@@ -1,6 +1,11 @@
 # 실행: uvicorn solution:app --reload
 # 테스트: python solution.py
 
+from bisect import bisect_left, bisect_right
+from collections.abc import Callable
+from heapq import merge
+from typing import Literal
+
 from fastapi import FastAPI, Depends, Query
 from fastapi.testclient import TestClient
 
@@ -32,27 +37,45 @@ class PaginationParams:
     페이지네이션 매개변수를 관리하는 클래스 의존성.
     apply() 메서드로 리스트에 페이지네이션을 적용하고,
     get_info() 메서드로 페이지네이션 메타 정보를 제공합니다.
+
+    total 매개변수로 전체 개수를 얼마나 정확히 셀지 고를 수 있습니다.
+    - exact: 정확한 개수 (같은 조건은 캐시해서 다음 페이지부터는 다시 세지 않음)
+    - estimate: 인덱스 후보 수로 만든 상한 추정치
+    - none: 세지 않음
+    exact가 아닌 모드에서는 limit + 1개까지만 찾아서 has_more를 판단하므로
+    뒤쪽 페이지를 조회해도 필터링된 목록 전체를 만들지 않습니다.
     """
 
     def __init__(
         self,
         skip: int = Query(default=0, ge=0, description="건너뛸 항목 수"),
         limit: int = Query(default=10, ge=1, le=100, description="조회할 항목 수"),
+        total: Literal["exact", "estimate", "none"] = Query(
+            default="exact", description="전체 개수 계산 방식"
+        ),
     ):
         self.skip = skip
         self.limit = limit
+        self.total_mode = total
 
     def apply(self, items: list) -> list:
         """리스트에 페이지네이션을 적용하여 슬라이싱된 결과를 반환"""
         return items[self.skip : self.skip + self.limit]
 
-    def get_info(self, total: int) -> dict:
-        """페이지네이션 메타 정보를 딕셔너리로 반환"""
+    def get_info(self, total: int | None, has_more: bool | None = None) -> dict:
+        """페이지네이션 메타 정보를 딕셔너리로 반환
+
+        has_more를 따로 알고 있으면(limit + 1개 조회) 그 값을 사용하고,
+        아니면 total로 계산합니다.
+        """
+        if has_more is None:
+            has_more = self.skip + self.limit < total
         return {
             "total": total,
+            "total_mode": self.total_mode,
             "skip": self.skip,
             "limit": self.limit,
-            "has_more": self.skip + self.limit < total,
+            "has_more": has_more,
         }
 
 
@@ -62,7 +85,16 @@ def read_books(pagination: PaginationParams = Depends()):
     도서 목록 조회 엔드포인트.
     PaginationParams 클래스 의존성을 사용합니다.
     Depends() 축약 문법으로 타입 힌트에서 자동 추론합니다.
+
+    리스트 길이는 O(1)로 알 수 있으므로 estimate도 정확한 개수를 돌려주고,
+    none이면 total 없이 limit + 1개를 잘라 has_more를 판단합니다.
     """
+    if pagination.total_mode == "none":
+        window = fake_books[pagination.skip : pagination.skip + pagination.limit + 1]
+        return {
+            "books": window[: pagination.limit],
+            "pagination": pagination.get_info(None, len(window) > pagination.limit),
+        }
     return {
         "books": pagination.apply(fake_books),
         "pagination": pagination.get_info(len(fake_books)),
@@ -91,28 +123,144 @@ class BookFilter:
         self.max_price = max_price
         self.author = author
 
+    def matches(self, book: dict) -> bool:
+        """도서 한 권이 모든 필터 조건을 만족하는지 확인"""
+        # 장르 필터: 정확히 일치하는 장르만 선택
+        if self.genre is not None and book["genre"] != self.genre:
+            return False
+        # 가격 범위 필터
+        if not self.min_price <= book["price"] <= self.max_price:
+            return False
+        # 저자 필터: 저자 이름에 검색어가 포함된 항목 선택
+        if self.author is not None and self.author not in book["author"]:
+            return False
+        return True
+
     def apply(self, books: list[dict]) -> list[dict]:
-        """도서 목록에 필터 조건을 적용하여 반환"""
-        result = books
+        """도서 목록에 필터 조건을 적용하여 반환 (목록을 한 번만 순회)"""
+        return [book for book in books if self.matches(book)]
 
-        # 장르 필터: 정확히 일치하는 장르만 선택
-        if self.genre is not None:
-            result = [book for book in result if book["genre"] == self.genre]
 
-        # 가격 범위 필터
-        result = [
-            book for book in result
-            if self.min_price <= book["price"] <= self.max_price
-        ]
+class BookQueryEngine:
+    """
+    미리 만들어 둔 인덱스로 BookFilter + 페이지네이션을 처리하는 검색 엔진.
 
-        # 저자 필터: 저자 이름에 검색어가 포함된 항목 선택
-        if self.author is not None:
-            result = [
-                book for book in result
-                if self.author in book["author"]
+    BookFilter.apply()는 요청마다 전체 목록을 순회합니다. 엔진은 시작 시점에
+    - 장르 → 도서 위치 목록 (장르 인덱스)
+    - 가격 기준으로 정렬한 위치 배열 (가격 범위는 bisect로 O(log n))
+    - 저자 → 도서 위치 목록 (저자 역색인)
+    을 만들어 두고, 요청이 오면 후보가 가장 적은 조건부터 골라 나머지 조건만 확인합니다.
+    조건이 하나뿐이면 후보 수가 곧 total이므로 skip + limit개만 꺼내고 멈춥니다.
+
+    도서 목록이 바뀌면 rebuild()로 인덱스를 다시 만들어야 합니다.
+    """
+
+    TOTAL_CACHE_SIZE = 1024
+
+    def __init__(self, books: list[dict]):
+        self.books = books
+        self.rebuild()
+
+    def rebuild(self) -> None:
+        self._genre_index: dict[str, list[int]] = {}
+        self._author_index: dict[str, list[int]] = {}
+        for pos, book in enumerate(self.books):
+            self._genre_index.setdefault(book["genre"], []).append(pos)
+            self._author_index.setdefault(book["author"], []).append(pos)
+        self._price_order = sorted(range(len(self.books)), key=lambda pos: self.books[pos]["price"])
+        self._prices = [self.books[pos]["price"] for pos in self._price_order]
+        # 필터 조건 → 정확한 total 캐시 (인덱스를 다시 만들면 함께 비움)
+        self._total_cache: dict[tuple, int] = {}
+
+    def _candidate_sources(self, book_filter: BookFilter) -> list[tuple[int, Callable[[], list[int]]]]:
+        """활성화된 조건마다 (후보 수, 후보 위치 목록을 만드는 함수)를 반환"""
+        sources = []
+        if book_filter.genre is not None:
+            postings = self._genre_index.get(book_filter.genre, [])
+            sources.append((len(postings), lambda: postings))
+
+        lo = bisect_left(self._prices, book_filter.min_price)
+        hi = bisect_right(self._prices, book_filter.max_price)
+        if hi - lo < len(self.books):  # 전체 가격대를 덮으면 조건이 없는 것과 같음
+            sources.append((max(hi - lo, 0), lambda: sorted(self._price_order[lo:hi])))
+
+        if book_filter.author is not None:
+            author_postings = [
+                postings for author, postings in self._author_index.items()
+                if book_filter.author in author
             ]
+            sources.append((
+                sum(len(postings) for postings in author_postings),
+                lambda: list(merge(*author_postings)),
+            ))
+        return sources
 
-        return result
+    def search(
+        self,
+        book_filter: BookFilter,
+        skip: int,
+        limit: int,
+        total_mode: str = "exact",
+    ) -> tuple[list[dict], int | None, bool]:
+        """조건에 맞는 도서 중 [skip, skip + limit) 구간, total, has_more를 반환
+
+        total_mode가 exact이고 캐시에 없을 때만 후보를 끝까지 셉니다.
+        그 밖에는 skip + limit + 1번째 결과를 찾는 즉시 멈춥니다.
+        """
+        page, total, has_more = self._search(book_filter, skip, limit, total_mode)
+        return page, None if total_mode == "none" else total, has_more
+
+    def _search(
+        self,
+        book_filter: BookFilter,
+        skip: int,
+        limit: int,
+        total_mode: str,
+    ) -> tuple[list[dict], int, bool]:
+        sources = self._candidate_sources(book_filter)
+        if not sources:
+            total = len(self.books)
+            return self.books[skip : skip + limit], total, skip + limit < total
+
+        size, build = min(sources, key=lambda source: source[0])
+        if size == 0:
+            return [], 0, False
+        positions = build()
+
+        # 조건이 하나뿐이면 후보 전체가 결과이므로 필요한 구간만 꺼냅니다.
+        if len(sources) == 1:
+            page = [self.books[pos] for pos in positions[skip : skip + limit]]
+            return page, size, skip + limit < size
+
+        key = (book_filter.genre, book_filter.min_price, book_filter.max_price, book_filter.author)
+        cached_total = self._total_cache.get(key)
+        count_all = total_mode == "exact" and cached_total is None
+
+        # 가장 작은 후보 집합을 순회하며 나머지 조건을 확인합니다.
+        page: list[dict] = []
+        matched = 0
+        for pos in positions:
+            book = self.books[pos]
+            if book_filter.matches(book):
+                if skip <= matched < skip + limit:
+                    page.append(book)
+                matched += 1
+                if not count_all and matched > skip + limit:
+                    break
+
+        if count_all:
+            if len(self._total_cache) >= self.TOTAL_CACHE_SIZE:
+                self._total_cache.clear()
+            self._total_cache[key] = matched
+            return page, matched, skip + limit < matched
+
+        has_more = matched > skip + limit
+        if cached_total is not None:
+            return page, cached_total, has_more
+        return page, size, has_more  # estimate: 가장 작은 후보 집합 크기 (상한)
+
+
+book_engine = BookQueryEngine(fake_books)
 
 
 @app.get("/books/search")
@@ -125,16 +273,15 @@ def search_books(
     BookFilter와 PaginationParams를 동시에 사용합니다.
 
     처리 순서:
-    1. BookFilter로 필터 조건 적용
-    2. 필터링된 결과에 PaginationParams 적용
+    1. BookQueryEngine이 인덱스로 후보를 좁혀 필터 조건 적용
+    2. 필터링된 결과 중 PaginationParams 구간만 꺼내고 전체 개수 계산
     """
-    # 1단계: 필터링
-    filtered = book_filter.apply(fake_books)
-
-    # 2단계: 페이지네이션 (필터링된 결과 기준)
+    books, total, has_more = book_engine.search(
+        book_filter, pagination.skip, pagination.limit, pagination.total_mode
+    )
     return {
-        "books": pagination.apply(filtered),
-        "pagination": pagination.get_info(len(filtered)),
+        "books": books,
+        "pagination": pagination.get_info(total, has_more),
     }
 
 
@@ -162,6 +309,15 @@ if __name__ == "__main__":
     assert data["pagination"]["has_more"] is True
     print("  [통과] limit=5 도서 목록 조회")
 
+    response = client.get("/books?skip=10&limit=2&total=none")
+    data = response.json()
+    assert [book["id"] for book in data["books"]] == [11, 12]
+    assert data["pagination"]["total"] is None
+    assert data["pagination"]["has_more"] is False
+    response = client.get("/books?skip=9&limit=2&total=none")
+    assert response.json()["pagination"]["has_more"] is True
+    print("  [통과] total=none이면 /books도 개수 없이 has_more만 판단")
+
     response = client.get("/books?skip=10&limit=10")
     assert response.status_code == 200
     data = response.json()
@@ -208,5 +364,40 @@ if __name__ == "__main__":
     assert data["pagination"]["has_more"] is True
     print("  [통과] 필터링 + 페이지네이션 복합 테스트")
 
+    # 인덱스 기반 검색이 BookFilter.apply() + 슬라이싱과 같은 결과인지 확인
+    import itertools
+
+    for genre, author, (min_price, max_price), (skip, limit) in itertools.product(
+        [None, "소설", "프로그래밍", "없는장르"],
+        [None, "작가", "한역사가", "최", "없음"],
+        [(0, 100000), (18000, 25000), (30000, 30000), (50000, 10000)],
+        [(0, 10), (1, 2), (5, 100)],
+    ):
+        book_filter = BookFilter(genre=genre, min_price=min_price, max_price=max_price, author=author)
+        expected = book_filter.apply(fake_books)
+        for total_mode in ["exact", "estimate", "none"]:
+            books, total, has_more = book_engine.search(book_filter, skip, limit, total_mode)
+            assert books == expected[skip : skip + limit]
+            assert has_more == (skip + limit < len(expected))
+            if total_mode == "exact":
+                assert total == len(expected)
+            elif total_mode == "estimate":
+                assert total >= len(expected)
+            else:
+                assert total is None
+    print("  [통과] BookQueryEngine 결과가 전체 순회 필터와 일치")
+
+    # total=none: 전체 개수 없이 limit + 1개 조회로 has_more 판단
+    response = client.get("/books/search?author=작가&max_price=29000&limit=1&total=none")
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data["books"]) == 1
+    assert data["pagination"]["total"] is None
+    assert data["pagination"]["total_mode"] == "none"
+    assert data["pagination"]["has_more"] is True
+    response = client.get("/books/search?author=작가&max_price=29000&skip=1&limit=1&total=none")
+    assert response.json()["pagination"]["has_more"] is False
+    print("  [통과] total=none 모드에서 limit + 1 조회로 has_more 판단")
+
     print()
     print("모든 테스트를 통과했습니다!")
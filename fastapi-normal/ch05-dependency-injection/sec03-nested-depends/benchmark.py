@@ -0,0 +1,81 @@
+# 벤치마크: 주문 100만 건에서 단건/사용자별 조회와 관리자 통계
+#   - 전체 스캔 : 이전 FakeDB.get_order / find_by_user_id / get_admin_stats (리스트를 처음부터 훑기)
+#   - 인덱스    : OrderStore의 기본 키 딕셔너리, user_id 인덱스, 누적 통계(OrderStats)
+# 실행: python benchmark.py [주문 수] [조회 수]
+
+import random
+import sys
+import time
+
+from solution import OrderStats, OrderStore
+
+USERS = 10_000
+STATUSES = ["준비중", "배송중", "완료"]
+
+
+def build_orders(count: int) -> list[dict]:
+    rng = random.Random(0)
+    return [
+        {
+            "order_id": i,
+            "user_id": rng.randrange(USERS),
+            "item": f"상품{i}",
+            "price": rng.randrange(1_000, 1_000_000),
+            "status": rng.choice(STATUSES),
+        }
+        for i in range(1, count + 1)
+    ]
+
+
+def scan_get(orders: list[dict], order_id: int) -> dict | None:
+    for order in orders:
+        if order["order_id"] == order_id:
+            return order
+    return None
+
+
+def scan_by_user(orders: list[dict], user_id: int) -> list[dict]:
+    return [o for o in orders if o["user_id"] == user_id]
+
+
+def measure(fn, keys) -> float:
+    """keys마다 fn을 호출하고 호출당 평균 시간(µs)을 반환합니다."""
+    start = time.perf_counter()
+    for key in keys:
+        fn(key)
+    return (time.perf_counter() - start) / len(keys) * 1_000_000
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    lookups = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    print("=" * 50)
+    print(f"주문 조회 벤치마크 (주문 {count:,}건, 사용자 {USERS:,}명)")
+    print("=" * 50)
+
+    orders = build_orders(count)
+    start = time.perf_counter()
+    store = OrderStore(orders)
+    print(f"  인덱스 구축: {time.perf_counter() - start:.2f} s")
+
+    rng = random.Random(1)
+    order_ids = [rng.randint(1, count) for _ in range(lookups)]
+    user_ids = [rng.randrange(USERS) for _ in range(lookups)]
+    for user_id in user_ids:
+        assert store.by_user(user_id) == scan_by_user(orders, user_id)
+
+    scan_us = measure(lambda key: scan_get(orders, key), order_ids)
+    index_us = measure(store.get, order_ids * 1000)
+    print(f"  단건 조회   전체 스캔: {scan_us:>12,.1f} µs   인덱스: {index_us:>8,.2f} µs"
+          f"   ({scan_us / index_us:,.0f}x)")
+
+    scan_us = measure(lambda key: scan_by_user(orders, key), user_ids)
+    index_us = measure(store.by_user, user_ids * 100)
+    print(f"  사용자별    전체 스캔: {scan_us:>12,.1f} µs   인덱스: {index_us:>8,.2f} µs"
+          f"   ({scan_us / index_us:,.0f}x)")
+
+    scan_us = measure(lambda _: OrderStats.recompute(orders).snapshot(), range(3))
+    index_us = measure(lambda _: store.stats_snapshot(), range(10_000))
+    print(f"  관리자 통계 전체 스캔: {scan_us:>12,.1f} µs   누적값: {index_us:>8,.2f} µs"
+          f"   ({scan_us / index_us:,.0f}x)")
@@ -1,8 +1,18 @@
 # 실행: uvicorn solution:app --reload
 # 테스트: python solution.py
 
-from fastapi import FastAPI, Depends, Header, HTTPException, APIRouter
+import contextlib
+import functools
+import inspect
+import itertools
+import threading
+from collections import Counter
+from collections.abc import Callable
+from enum import Enum
+
+from fastapi import FastAPI, Depends, Header, HTTPException, APIRouter, Request
 from fastapi.testclient import TestClient
+from pydantic import BaseModel
 
 app = FastAPI()
 
@@ -28,10 +38,149 @@ fake_orders = [
 ]
 
 
-class FakeDB:
-    """가상 데이터베이스 클래스"""
+class OrderStats:
+    """
+    주문 통계 집계기.
+
+    주문 생성/상태 변경/삭제 시점에 카운터만 갱신하므로,
+    통계 조회는 주문 수와 관계없이 O(상태 종류 수)입니다.
+    """
 
     def __init__(self):
+        self.total_orders = 0
+        self.total_revenue = 0
+        self.status_counts: Counter[str] = Counter()
+
+    @classmethod
+    def recompute(cls, orders) -> "OrderStats":
+        """모든 주문을 훑어서 통계를 처음부터 다시 계산합니다."""
+        stats = cls()
+        for order in orders:
+            stats.add(order)
+        return stats
+
+    def add(self, order: dict) -> None:
+        self.total_orders += 1
+        self.total_revenue += order["price"]
+        self.status_counts[order["status"]] += 1
+
+    def remove(self, order: dict) -> None:
+        self.total_orders -= 1
+        self.total_revenue -= order["price"]
+        self._decrement(order["status"])
+
+    def change_status(self, old_status: str, new_status: str) -> None:
+        self._decrement(old_status)
+        self.status_counts[new_status] += 1
+
+    def _decrement(self, status: str) -> None:
+        self.status_counts[status] -= 1
+        if self.status_counts[status] <= 0:
+            del self.status_counts[status]
+
+    def snapshot(self) -> dict:
+        return {
+            "total_orders": self.total_orders,
+            "total_revenue": self.total_revenue,
+            "status_counts": dict(self.status_counts),
+        }
+
+
+class OrderStore:
+    """
+    주문 저장소 (프로세스 전체에서 공유).
+
+    주문 ID -> 주문 딕셔너리(기본 키)와 user_id -> {주문 ID: 주문} 인덱스를
+    쓰기 시점에 함께 갱신하므로, 단건 조회는 O(1), 사용자별 조회는 O(k)입니다.
+    사용자별 인덱스도 딕셔너리라서 삭제가 O(1)이고 삽입 순서가 유지됩니다.
+    통계(OrderStats)도 같은 잠금 안에서 갱신됩니다.
+    """
+
+    def __init__(self, orders: list[dict]):
+        self._lock = threading.Lock()
+        self._orders: dict[int, dict] = {}
+        self._by_user: dict[int, dict[int, dict]] = {}
+        self.stats = OrderStats()
+        for order in orders:
+            self._index(order)
+            self.stats.add(order)
+        self._next_id = itertools.count(max(self._orders, default=0) + 1)
+
+    def _index(self, order: dict) -> None:
+        self._orders[order["order_id"]] = order
+        self._by_user.setdefault(order["user_id"], {})[order["order_id"]] = order
+
+    def all(self) -> list[dict]:
+        return list(self._orders.values())
+
+    def get(self, order_id: int) -> dict | None:
+        return self._orders.get(order_id)
+
+    def by_user(self, user_id: int) -> list[dict]:
+        return list(self._by_user.get(user_id, {}).values())
+
+    def insert(self, user_id: int, item: str, price: int, status: str) -> dict:
+        with self._lock:
+            order = {
+                "order_id": next(self._next_id),
+                "user_id": user_id,
+                "item": item,
+                "price": price,
+                "status": status,
+            }
+            self._index(order)
+            self.stats.add(order)
+        return order
+
+    def update_status(self, order_id: int, status: str) -> dict | None:
+        with self._lock:
+            order = self._orders.get(order_id)
+            if order is None:
+                return None
+            updated = {**order, "status": status}
+            self._index(updated)
+            self.stats.change_status(order["status"], status)
+        return updated
+
+    def delete(self, order_id: int) -> dict | None:
+        with self._lock:
+            order = self._orders.pop(order_id, None)
+            if order is None:
+                return None
+            user_orders = self._by_user[order["user_id"]]
+            del user_orders[order_id]
+            if not user_orders:
+                del self._by_user[order["user_id"]]
+            self.stats.remove(order)
+        return order
+
+    def stats_snapshot(self, verify: bool = False) -> dict:
+        """
+        누적 통계를 반환합니다.
+        verify=True이면 전체 주문으로 다시 계산한 값과 비교한 결과를 함께 반환합니다.
+        """
+        with self._lock:
+            snapshot = self.stats.snapshot()
+            if verify:
+                expected = OrderStats.recompute(self._orders.values()).snapshot()
+        if verify:
+            snapshot["consistent"] = snapshot == expected
+            if not snapshot["consistent"]:
+                snapshot["expected"] = expected
+        return snapshot
+
+    def __len__(self) -> int:
+        return len(self._orders)
+
+
+order_store = OrderStore(fake_orders)
+
+
+class FakeDB:
+    """가상 데이터베이스 클래스 (order_store에 위임)"""
+
+    def __init__(self, store: OrderStore | None = None):
+        self.store = store if store is not None else order_store
         self.connected = False
         self.closed = False
 
@@ -46,14 +195,27 @@ class FakeDB:
 
     def get_orders(self) -> list[dict]:
         """모든 주문 반환"""
-        return fake_orders
+        return self.store.all()
 
     def get_order(self, order_id: int) -> dict | None:
-        """특정 주문 반환 (없으면 None)"""
-        for order in fake_orders:
-            if order["order_id"] == order_id:
-                return order
-        return None
+        """특정 주문 반환 (없으면 None) - 기본 키 딕셔너리로 O(1)"""
+        return self.store.get(order_id)
+
+    def get_orders_by_user(self, user_id: int) -> list[dict]:
+        """특정 사용자의 주문 반환 - user_id 인덱스로 O(k)"""
+        return self.store.by_user(user_id)
+
+    def insert_order(self, user_id: int, item: str, price: int, status: str) -> dict:
+        return self.store.insert(user_id, item, price, status)
+
+    def update_order_status(self, order_id: int, status: str) -> dict | None:
+        return self.store.update_status(order_id, status)
+
+    def delete_order(self, order_id: int) -> dict | None:
+        return self.store.delete(order_id)
+
+    def get_stats(self, verify: bool = False) -> dict:
+        return self.store.stats_snapshot(verify)
 
 
 class OrderRepository:
@@ -68,23 +230,196 @@ class OrderRepository:
 
     def find_by_user_id(self, user_id: int) -> list[dict]:
         """특정 사용자의 주문만 조회"""
-        return [o for o in self.db.get_orders() if o["user_id"] == user_id]
+        return self.db.get_orders_by_user(user_id)
 
     def find_by_id(self, order_id: int) -> dict | None:
         """특정 주문 조회"""
         return self.db.get_order(order_id)
 
+    def create(self, user_id: int, item: str, price: int, status: str = "준비중") -> dict:
+        """주문 생성"""
+        return self.db.insert_order(user_id, item, price, status)
+
+    def update_status(self, order_id: int, status: str) -> dict | None:
+        """주문 상태 변경 (없으면 None)"""
+        return self.db.update_order_status(order_id, status)
+
+    def delete(self, order_id: int) -> dict | None:
+        """주문 삭제 (없으면 None)"""
+        return self.db.delete_order(order_id)
+
+    def stats(self, verify: bool = False) -> dict:
+        """주문 통계 조회 (verify=True이면 전체 재계산 결과와 비교)"""
+        return self.db.get_stats(verify)
+
+
+class OrderCreate(BaseModel):
+    item: str
+    price: int
+
+
+class OrderStatusUpdate(BaseModel):
+    status: str
+
+
+# ============================================================
+# 의존성 수명 관리
+# ============================================================
+
+class Lifetime(str, Enum):
+    """
+    의존성 수명.
+
+    - SINGLETON: 프로세스에서 한 번만 생성 (yield 의존성은 사용할 수 없음)
+    - REQUEST: 요청마다 한 번 생성하고, 같은 요청 안의 모든 의존성 체인이 공유
+    - TRANSIENT: 주입될 때마다 새로 생성
+      (FastAPI의 요청 내 캐시를 피하려면 Depends(..., use_cache=False)로 주입)
+    """
+
+    SINGLETON = "singleton"
+    REQUEST = "request"
+    TRANSIENT = "transient"
+
+
+class RequestScope:
+    """요청 하나 동안 유지되는 의존성 값과 생성 횟수
+
+    값은 팩토리 함수 객체로 찾으므로 이름이 같은 팩토리끼리 섞이지 않습니다.
+    생성 횟수는 읽기 쉽도록 함수 이름으로 셉니다.
+    """
+
+    def __init__(self):
+        self.values: dict[Callable, object] = {}
+        self.constructions: Counter[str] = Counter()
+
+
+class DependencyStats:
+    """의존성 생성 횟수 계측 (전체 누적 + 마지막 요청)"""
+
+    def __init__(self):
+        self.requests = 0
+        self.constructions: Counter[str] = Counter()
+        self.last_request: Counter[str] = Counter()
+
+    def reset(self) -> None:
+        self.__init__()
+
+
+dependency_stats = DependencyStats()
+_singletons: dict[Callable, object] = {}
+# 싱글턴 이중 확인과 dependency_stats 갱신을 함께 보호합니다.
+# 동기 의존성은 스레드 풀에서 실행되므로 계측 카운터도 잠금 안에서 올립니다.
+# 싱글턴 생성 중에 _record()를 부르므로 재진입 가능한 잠금을 씁니다.
+_lifetime_lock = threading.RLock()
+
+
+def _request_scope(request: Request) -> RequestScope:
+    scope = getattr(request.state, "dependency_scope", None)
+    if scope is None:
+        with _lifetime_lock:
+            scope = getattr(request.state, "dependency_scope", None)
+            if scope is None:
+                scope = request.state.dependency_scope = RequestScope()
+                dependency_stats.requests += 1
+                dependency_stats.last_request = scope.constructions
+    return scope
+
+
+def _record(request: Request, name: str) -> None:
+    scope = _request_scope(request)
+    with _lifetime_lock:
+        scope.constructions[name] += 1
+        dependency_stats.constructions[name] += 1
+
+
+def lifetime(kind: Lifetime):
+    """
+    의존성 함수에 수명을 지정하는 데코레이터.
+
+    원래 함수의 시그니처(하위 의존성 포함)를 그대로 노출하고,
+    Request 매개변수만 하나 덧붙여 요청 범위 캐시와 계측에 사용합니다.
+    """
+
+    def decorator(factory):
+        name = factory.__name__
+        is_generator = inspect.isgeneratorfunction(factory)
+        if kind is Lifetime.SINGLETON and is_generator:
+            raise TypeError(f"{name}: yield 의존성은 SINGLETON으로 등록할 수 없습니다")
+        managed = contextlib.contextmanager(factory) if is_generator else None
+
+        if kind is Lifetime.SINGLETON:
+            def dependency(*args, _lifetime_request: Request, **kwargs):
+                if factory not in _singletons:
+                    with _lifetime_lock:
+                        if factory not in _singletons:
+                            _singletons[factory] = factory(*args, **kwargs)
+                            _record(_lifetime_request, name)
+                return _singletons[factory]
+
+        elif kind is Lifetime.REQUEST and is_generator:
+            def dependency(*args, _lifetime_request: Request, **kwargs):
+                scope = _request_scope(_lifetime_request)
+                if factory in scope.values:
+                    yield scope.values[factory]
+                    return
+                # 처음 만든 쪽만 정리(finally)를 책임집니다.
+                with managed(*args, **kwargs) as value:
+                    scope.values[factory] = value
+                    _record(_lifetime_request, name)
+                    yield value
+
+        elif kind is Lifetime.REQUEST:
+            def dependency(*args, _lifetime_request: Request, **kwargs):
+                scope = _request_scope(_lifetime_request)
+                if factory not in scope.values:
+                    scope.values[factory] = factory(*args, **kwargs)
+                    _record(_lifetime_request, name)
+                return scope.values[factory]
+
+        elif is_generator:
+            def dependency(*args, _lifetime_request: Request, **kwargs):
+                with managed(*args, **kwargs) as value:
+                    _record(_lifetime_request, name)
+                    yield value
+
+        else:
+            def dependency(*args, _lifetime_request: Request, **kwargs):
+                value = factory(*args, **kwargs)
+                _record(_lifetime_request, name)
+                return value
+
+        functools.update_wrapper(dependency, factory)
+        signature = inspect.signature(factory)
+        request_param = inspect.Parameter(
+            "_lifetime_request", inspect.Parameter.KEYWORD_ONLY, annotation=Request
+        )
+        dependency.__signature__ = signature.replace(
+            parameters=[*signature.parameters.values(), request_param]
+        )
+        dependency.lifetime = kind
+        return dependency
+
+    return decorator
+
+
+@lifetime(Lifetime.SINGLETON)
+def get_order_store() -> OrderStore:
+    """주문 저장소 의존성 (프로세스 전체에서 하나)"""
+    return order_store
+
 
 # ============================================================
 # 문제 1 해답: yield를 사용한 DB 세션 의존성
 # ============================================================
 
-def get_db():
+@lifetime(Lifetime.REQUEST)
+def get_db(store: OrderStore = Depends(get_order_store)):
     """
     DB 세션 의존성 (yield 사용).
     요청 시작 시 DB를 연결하고, 요청 완료 후 자동으로 세션을 닫습니다.
+    요청 범위로 등록되어 있어 한 요청 안에서는 세션을 하나만 엽니다.
     """
-    db = FakeDB()
+    db = FakeDB(store)
     db.connect()
     try:
         yield db
@@ -96,6 +431,7 @@ def get_db():
 # 문제 2 해답: 중첩 의존성 체인
 # ============================================================
 
+@lifetime(Lifetime.REQUEST)
 def get_current_user(x_token: str = Header()) -> dict:
     """
     현재 사용자 인증 의존성.
@@ -108,6 +444,7 @@ def get_current_user(x_token: str = Header()) -> dict:
     return user
 
 
+@lifetime(Lifetime.REQUEST)
 def get_order_repository(db: FakeDB = Depends(get_db)) -> OrderRepository:
     """
     주문 리포지토리 의존성.
@@ -159,6 +496,49 @@ def read_order(
     return order
 
 
+def get_own_order(
+    order_id: int,
+    user: dict = Depends(get_current_user),
+    repo: OrderRepository = Depends(get_order_repository),
+) -> dict:
+    """본인 주문 확인 의존성 (없으면 404, 다른 사용자의 주문이면 403)"""
+    order = repo.find_by_id(order_id)
+    if order is None:
+        raise HTTPException(status_code=404, detail="주문을 찾을 수 없습니다")
+    if order["user_id"] != user["user_id"]:
+        raise HTTPException(status_code=403, detail="다른 사용자의 주문입니다")
+    return order
+
+
+@app.post("/orders", status_code=201)
+def create_order(
+    body: OrderCreate,
+    user: dict = Depends(get_current_user),
+    repo: OrderRepository = Depends(get_order_repository),
+):
+    """현재 사용자의 주문 생성"""
+    return repo.create(user["user_id"], body.item, body.price)
+
+
+@app.patch("/orders/{order_id}/status")
+def update_order_status(
+    body: OrderStatusUpdate,
+    order: dict = Depends(get_own_order),
+    repo: OrderRepository = Depends(get_order_repository),
+):
+    """본인 주문의 상태 변경"""
+    return repo.update_status(order["order_id"], body.status)
+
+
+@app.delete("/orders/{order_id}", status_code=204)
+def delete_order(
+    order: dict = Depends(get_own_order),
+    repo: OrderRepository = Depends(get_order_repository),
+):
+    """본인 주문 삭제"""
+    repo.delete(order["order_id"])
+
+
 # ============================================================
 # 문제 3 해답: 라우터 수준 의존성
 # ============================================================
@@ -187,6 +567,7 @@ admin_router = APIRouter(
 
 @admin_router.get("/stats")
 def get_admin_stats(
+    verify: bool = False,
     repo: OrderRepository = Depends(get_order_repository),
 ):
     """
@@ -195,23 +576,14 @@ def get_admin_stats(
     라우터 수준에서 require_admin 의존성이 이미 적용되어 있으므로,
     이 엔드포인트에서는 별도로 인증 의존성을 추가할 필요가 없습니다.
 
+    통계는 주문 쓰기 시점에 누적되므로 주문을 다시 훑지 않습니다.
+    ?verify=true 이면 전체 주문으로 재계산한 값과 비교해 consistent를 함께 반환합니다.
+
     의존성 체인:
     - [라우터 수준] get_current_user -> require_admin (인증 + 권한 확인)
     - [엔드포인트 수준] get_db -> get_order_repository (데이터 조회)
     """
-    all_orders = repo.find_all()
-
-    # 상태별 주문 수 집계
-    status_counts: dict[str, int] = {}
-    for order in all_orders:
-        status = order["status"]
-        status_counts[status] = status_counts.get(status, 0) + 1
-
-    return {
-        "total_orders": len(all_orders),
-        "total_revenue": sum(order["price"] for order in all_orders),
-        "status_counts": status_counts,
-    }
+    return repo.stats(verify)
 
 
 # 라우터를 앱에 등록
@@ -294,5 +666,202 @@ if __name__ == "__main__":
     assert response.status_code == 401
     print("  [통과] 미인증 관리자 페이지 접근 - 401 에러")
 
+    # 추가 테스트: 인덱스 기반 주문 저장소
+    print()
+    print("=" * 50)
+    print("추가: 인덱스 기반 주문 저장소 테스트")
+    print("=" * 50)
+
+    store = OrderStore(fake_orders)
+    assert store.get(3)["item"] == "키보드"
+    assert [o["order_id"] for o in store.by_user(1)] == [1, 2]
+    assert store.by_user(12345) == []
+    new_order = store.insert(1, "태블릿", 700000, "준비중")
+    assert new_order["order_id"] == 6
+    assert [o["order_id"] for o in store.by_user(1)] == [1, 2, 6]
+    assert store.update_status(6, "배송중")["status"] == "배송중"
+    assert store.get(6)["status"] == "배송중"
+    assert store.by_user(1)[-1]["status"] == "배송중"
+    assert store.delete(6)["order_id"] == 6
+    assert store.get(6) is None and store.delete(6) is None
+    assert store.update_status(6, "완료") is None
+    assert [o["order_id"] for o in store.by_user(1)] == [1, 2]
+    assert store.delete(5) is not None and store.by_user(99) == []
+    assert len(store) == 4
+    # 인덱스 결과가 전체 스캔 결과와 같은지 확인
+    for user_id in (1, 2, 99):
+        assert store.by_user(user_id) == [o for o in store.all() if o["user_id"] == user_id]
+    print("  [통과] 기본 키/사용자 인덱스가 생성/상태 변경/삭제와 함께 갱신됨")
+
+    # 엔드포인트: 생성 → 상태 변경 → 삭제
+    headers = {"x-token": "token-user2"}
+    response = client.post("/orders", json={"item": "헤드셋", "price": 90000}, headers=headers)
+    assert response.status_code == 201
+    created = response.json()
+    assert created["user_id"] == 2 and created["status"] == "준비중"
+    order_id = created["order_id"]
+    assert len(client.get("/orders", headers=headers).json()["orders"]) == 3
+
+    response = client.patch(f"/orders/{order_id}/status", json={"status": "완료"},
+                            headers={"x-token": "token-user1"})
+    assert response.status_code == 403
+    response = client.patch(f"/orders/{order_id}/status", json={"status": "완료"}, headers=headers)
+    assert response.status_code == 200
+    assert client.get(f"/orders/{order_id}", headers=headers).json()["status"] == "완료"
+
+    assert client.delete(f"/orders/{order_id}", headers=headers).status_code == 204
+    assert client.get(f"/orders/{order_id}", headers=headers).status_code == 404
+    assert client.delete(f"/orders/{order_id}", headers=headers).status_code == 404
+    assert len(client.get("/orders", headers=headers).json()["orders"]) == 2
+    print("  [통과] POST/PATCH/DELETE /orders 후 목록과 상세 조회가 일관됨")
+
+    # 추가 테스트: 누적 통계
+    print()
+    print("=" * 50)
+    print("추가: 누적 주문 통계 테스트")
+    print("=" * 50)
+
+    store = OrderStore(fake_orders)
+    assert store.stats_snapshot() == OrderStats.recompute(fake_orders).snapshot()
+    order = store.insert(1, "태블릿", 700000, "준비중")
+    store.update_status(order["order_id"], "배송중")
+    store.update_status(3, "완료")
+    store.delete(5)
+    store.update_status(12345, "완료")  # 없는 주문: 통계 변화 없음
+    stats = store.stats_snapshot(verify=True)
+    assert stats["consistent"] is True
+    assert stats["total_orders"] == 5
+    assert stats["total_revenue"] == 7470000 + 700000 - 5000000
+    assert stats["status_counts"] == {"배송중": 3, "완료": 2}  # 0이 된 "준비중"은 제거됨
+    print("  [통과] 생성/상태 변경/삭제 후 누적 통계가 재계산 결과와 일치")
+
+    store.stats.total_revenue += 1  # 카운터가 어긋난 상황을 흉내냄
+    stats = store.stats_snapshot(verify=True)
+    assert stats["consistent"] is False
+    assert stats["expected"]["total_revenue"] == stats["total_revenue"] - 1
+    print("  [통과] verify 모드가 불일치를 감지하고 기대값을 함께 반환")
+
+    admin = {"x-token": "token-admin"}
+    response = client.post("/orders", json={"item": "케이블", "price": 10000}, headers=admin)
+    new_id = response.json()["order_id"]
+    data = client.get("/admin/stats", params={"verify": True}, headers=admin).json()
+    assert data["consistent"] is True
+    assert data["total_orders"] == 6
+    assert data["status_counts"]["준비중"] == 2
+    client.delete(f"/orders/{new_id}", headers=admin)
+    data = client.get("/admin/stats", params={"verify": True}, headers=admin).json()
+    assert data["consistent"] is True
+    assert data["total_orders"] == 5 and data["total_revenue"] == 7470000
+    assert "consistent" not in client.get("/admin/stats", headers=admin).json()
+    print("  [통과] /admin/stats?verify=true 가 API 쓰기 이후에도 일관됨")
+
+    # 추가 테스트: 의존성 수명 관리
+    print()
+    print("=" * 50)
+    print("추가: 의존성 수명과 생성 횟수 계측 테스트")
+    print("=" * 50)
+
+    dependency_stats.reset()
+    for _ in range(3):
+        assert client.get("/admin/stats", headers=admin).status_code == 200
+    # 라우터(require_admin)와 엔드포인트가 체인을 공유해도 요청당 한 번씩만 생성
+    assert dependency_stats.requests == 3
+    assert dependency_stats.last_request == {
+        "get_current_user": 1, "get_db": 1, "get_order_repository": 1,
+    }
+    # 싱글턴은 이전 요청에서 이미 만들어졌으므로 다시 생성되지 않음
+    assert dependency_stats.constructions["get_order_store"] == 0
+    assert dependency_stats.constructions["get_db"] == 3
+    print("  [통과] 요청 범위 의존성은 요청당 한 번, 싱글턴은 프로세스당 한 번 생성")
+
+    response = client.patch("/orders/1/status", json={"status": "완료"},
+                            headers={"x-token": "token-user1"})
+    assert response.status_code == 200
+    assert dependency_stats.last_request["get_current_user"] == 1
+    assert dependency_stats.last_request["get_db"] == 1
+    print("  [통과] get_own_order와 엔드포인트가 같은 사용자/세션을 공유")
+
+    # FastAPI의 요청 내 캐시를 끈 채로 수명별 동작을 확인하는 작은 앱
+    events: list[str] = []
+
+    @lifetime(Lifetime.REQUEST)
+    def scoped_session():
+        events.append("open")
+        try:
+            yield object()
+        finally:
+            events.append("close")
+
+    @lifetime(Lifetime.TRANSIENT)
+    def transient_token() -> object:
+        return object()
+
+    lifetime_app = FastAPI()
+
+    @lifetime_app.get("/lifetimes")
+    def read_lifetimes(
+        a=Depends(scoped_session, use_cache=False),
+        b=Depends(scoped_session, use_cache=False),
+        c=Depends(transient_token, use_cache=False),
+        d=Depends(transient_token, use_cache=False),
+    ):
+        return {"same_session": a is b, "same_token": c is d}
+
+    with TestClient(lifetime_app) as lifetime_client:
+        dependency_stats.reset()
+        assert lifetime_client.get("/lifetimes").json() == {
+            "same_session": True, "same_token": False,
+        }
+    assert events == ["open", "close"]
+    assert dependency_stats.last_request == {"scoped_session": 1, "transient_token": 2}
+    print("  [통과] REQUEST는 요청 안에서 공유(정리는 한 번), TRANSIENT는 주입마다 새로 생성")
+
+    # 이름이 같은 팩토리라도 캐시를 공유하지 않음
+    def make_named_factories():
+        @lifetime(Lifetime.SINGLETON)
+        def get_order_store() -> str:
+            return "OTHER singleton"
+
+        @lifetime(Lifetime.REQUEST)
+        def get_db() -> str:
+            return "OTHER session"
+
+        return get_order_store, get_db
+
+    other_store, other_db = make_named_factories()
+    named_app = FastAPI()
+
+    @named_app.get("/named")
+    def read_named(
+        store=Depends(get_order_store),
+        other=Depends(other_store),
+        db=Depends(get_db),
+        other_session=Depends(other_db),
+    ):
+        return {
+            "store_is_module": store is order_store,
+            "other": other,
+            "db_is_fake": isinstance(db, FakeDB),
+            "other_session": other_session,
+        }
+
+    with TestClient(named_app) as named_client:
+        assert named_client.get("/named").json() == {
+            "store_is_module": True,
+            "other": "OTHER singleton",
+            "db_is_fake": True,
+            "other_session": "OTHER session",
+        }
+    print("  [통과] 이름이 같은 팩토리도 싱글턴/요청 범위 캐시를 따로 사용")
+
+    try:
+        @lifetime(Lifetime.SINGLETON)
+        def singleton_session():
+            yield object()
+    except TypeError:
+        print("  [통과] yield 의존성을 SINGLETON으로 등록하면 TypeError")
+    else:
+        raise AssertionError("TypeError가 발생해야 합니다")
+
     print()
     print("모든 테스트를 통과했습니다!")
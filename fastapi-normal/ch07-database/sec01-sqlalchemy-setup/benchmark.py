@@ -0,0 +1,65 @@
+# 벤치마크: SQLite 프로필별 읽기/쓰기 처리량 (safe / fast-wal / bulk-load)
+#   - 쓰기: 한 건씩 INSERT + commit (요청마다 commit하는 API와 같은 패턴)
+#   - 읽기: 스레드 여러 개가 세션을 열어 기본 키로 한 건씩 조회
+# 실행: python benchmark.py [쓰기 건수, 기본 2000] [읽기 스레드 수, 기본 8]
+
+import os
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy.orm import sessionmaker
+
+from solution import SQLITE_PROFILES, Base, User, create_sqlite_engine
+
+READS_PER_THREAD = 2_000
+
+
+def bench_writes(Session, count: int) -> float:
+    start = time.perf_counter()
+    for i in range(count):
+        with Session() as db:
+            db.add(User(username=f"user{i}", email=f"user{i}@example.com"))
+            db.commit()
+    return count / (time.perf_counter() - start)
+
+
+def bench_reads(Session, count: int, threads: int) -> float:
+    def worker(seed: int) -> int:
+        rng = random.Random(seed)
+        found = 0
+        for _ in range(READS_PER_THREAD):
+            with Session() as db:
+                found += db.get(User, rng.randint(1, count)) is not None
+        return found
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        found = sum(pool.map(worker, range(threads)))
+    elapsed = time.perf_counter() - start
+    assert found == threads * READS_PER_THREAD
+    return found / elapsed
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+    threads = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+
+    print("=" * 50)
+    print(f"SQLite 프로필 벤치마크 (쓰기 {count:,}건, 읽기 스레드 {threads}개)")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for profile, settings in SQLITE_PROFILES.items():
+            engine = create_sqlite_engine(f"sqlite:///{os.path.join(tmp, profile)}.db", profile=profile)
+            Base.metadata.create_all(bind=engine)
+            Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+            write_rate = bench_writes(Session, count)
+            read_rate = bench_reads(Session, count, threads)
+            engine.dispose()
+            pool = settings["pool_size"] + settings["max_overflow"]
+            print(f"  {profile:<9} (풀 {pool:>2})  쓰기: {write_rate:>9,.0f} commits/s"
+                  f"   읽기: {read_rate:>9,.0f} reads/s")
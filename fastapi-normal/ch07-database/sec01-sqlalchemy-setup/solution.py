@@ -1,8 +1,100 @@
 # 섹션 01: SQLAlchemy 설정 - 모범 답안
 # 실행: python solution.py
 
-from sqlalchemy import create_engine, Column, Integer, String
+import os
+
+from sqlalchemy import create_engine, event, Column, Integer, String
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import StaticPool
+
+# ============================================================
+# 엔진 팩토리: SQLite 성능 프로필
+# ============================================================
+# 연결이 만들어질 때마다 PRAGMA를 적용하고, 프로필별 커넥션 풀 크기를 정합니다.
+#   safe      : 롤백 저널 + synchronous=FULL (SQLite 기본값과 같음, 가장 안전)
+#   fast-wal  : WAL + synchronous=NORMAL + mmap/캐시 확대 (읽기와 쓰기가 동시에 가능)
+#   bulk-load : 대량 적재 전용. synchronous=OFF라서 전원 장애 시 데이터가 손상될 수 있음
+# DB_PROFILE 환경 변수로 기본 프로필을 고릅니다.
+
+DB_PROFILE = os.environ.get("DB_PROFILE", "safe")
+
+SQLITE_PROFILES = {
+    "safe": {
+        "pragmas": {
+            "journal_mode": "DELETE",
+            "synchronous": "FULL",
+            "temp_store": "DEFAULT",
+        },
+        "pool_size": 5,
+        "max_overflow": 10,
+    },
+    "fast-wal": {
+        "pragmas": {
+            "journal_mode": "WAL",
+            "synchronous": "NORMAL",
+            "mmap_size": 256 * 1024 * 1024,
+            "cache_size": -64 * 1024,  # 음수: KiB 단위 (64 MiB)
+            "temp_store": "MEMORY",
+        },
+        "pool_size": 10,
+        "max_overflow": 20,
+    },
+    "bulk-load": {
+        "pragmas": {
+            "journal_mode": "WAL",
+            "synchronous": "OFF",
+            "mmap_size": 256 * 1024 * 1024,
+            "cache_size": -256 * 1024,
+            "temp_store": "MEMORY",
+        },
+        # SQLite는 쓰기가 한 번에 하나뿐이므로 적재용 연결 하나면 충분합니다.
+        "pool_size": 1,
+        "max_overflow": 0,
+    },
+}
+
+
+def create_sqlite_engine(
+    url: str,
+    profile: str = DB_PROFILE,
+    pool_size: int | None = None,
+    max_overflow: int | None = None,
+    pool_timeout: float = 30,
+) -> Engine:
+    """
+    프로필의 PRAGMA를 연결마다 적용하는 SQLite 엔진을 만듭니다.
+
+    pool_size / max_overflow를 넘기면 프로필의 풀 크기 대신 사용합니다.
+    인메모리 DB(":memory:")는 연결마다 다른 DB가 생기므로
+    풀 크기 대신 StaticPool로 연결 하나를 공유합니다.
+    """
+    if profile not in SQLITE_PROFILES:
+        raise ValueError(f"알 수 없는 DB 프로필입니다: {profile} (가능: {', '.join(SQLITE_PROFILES)})")
+    settings = SQLITE_PROFILES[profile]
+
+    if url in ("sqlite://", "sqlite:///:memory:"):
+        engine = create_engine(
+            url, connect_args={"check_same_thread": False}, poolclass=StaticPool
+        )
+    else:
+        engine = create_engine(
+            url,
+            connect_args={"check_same_thread": False},
+            pool_size=settings["pool_size"] if pool_size is None else pool_size,
+            max_overflow=settings["max_overflow"] if max_overflow is None else max_overflow,
+            pool_timeout=pool_timeout,
+        )
+
+    @event.listens_for(engine, "connect")
+    def apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in settings["pragmas"].items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+    return engine
+
 
 # ============================================================
 # 문제 1: 데이터베이스 설정
@@ -11,10 +103,8 @@ from sqlalchemy.orm import sessionmaker, declarative_base
 # SQLite 데이터베이스 엔진 생성
 # - "sqlite:///./test_exercise.db": 현재 디렉토리에 test_exercise.db 파일 생성
 # - check_same_thread=False: SQLite의 단일 스레드 제한을 해제 (FastAPI는 멀티스레드)
-engine = create_engine(
-    "sqlite:///./test_exercise.db",
-    connect_args={"check_same_thread": False}
-)
+#   (create_sqlite_engine이 설정하고, DB_PROFILE의 PRAGMA도 함께 적용)
+engine = create_sqlite_engine("sqlite:///./test_exercise.db")
 
 # 세션 팩토리 생성
 # - autocommit=False: 명시적으로 commit()을 호출해야 변경사항 반영
@@ -103,7 +193,39 @@ if __name__ == "__main__":
 
     db.close()
 
+    # 엔진 팩토리 테스트: 프로필별 PRAGMA 적용 확인
+    import tempfile
+    from sqlalchemy import text
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for profile, settings in SQLITE_PROFILES.items():
+            profile_engine = create_sqlite_engine(
+                f"sqlite:///{os.path.join(tmp, profile)}.db", profile=profile
+            )
+            with profile_engine.connect() as conn:
+                journal = conn.execute(text("PRAGMA journal_mode")).scalar()
+                synchronous = conn.execute(text("PRAGMA synchronous")).scalar()
+            assert journal.upper() == settings["pragmas"]["journal_mode"]
+            # synchronous: 0=OFF, 1=NORMAL, 2=FULL
+            assert synchronous == {"OFF": 0, "NORMAL": 1, "FULL": 2}[settings["pragmas"]["synchronous"]]
+            assert profile_engine.pool.size() == settings["pool_size"]
+            profile_engine.dispose()
+    print("✓ 프로필별 PRAGMA/풀 크기 적용 성공")
+
+    sized = create_sqlite_engine("sqlite:///./test_exercise.db", profile="fast-wal", pool_size=3)
+    assert sized.pool.size() == 3
+    sized.dispose()
+    memory_engine = create_sqlite_engine("sqlite:///:memory:", profile="fast-wal")
+    assert isinstance(memory_engine.pool, StaticPool)
+    try:
+        create_sqlite_engine("sqlite:///:memory:", profile="turbo")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("알 수 없는 프로필은 ValueError가 발생해야 합니다")
+    print("✓ 풀 크기 지정 / 인메모리 StaticPool / 잘못된 프로필 검사 성공")
+
     # 정리: 테스트용 DB 파일 삭제
-    import os
+    engine.dispose()
     os.remove("./test_exercise.db")
     print("\n모든 테스트를 통과했습니다!")
@@ -0,0 +1,377 @@
+# 벤치마크 1 (writes): 게시글 수정/삭제 처리량 (writes/sec)
+#   - ORM 방식 : 조회 → 속성 변경/db.delete → commit → refresh (이전 solution)
+#   - 간결 방식 : UPDATE ... RETURNING / DELETE 한 번 + rowcount로 404 판단
+#   HTTP 계층을 빼고 엔드포인트 함수를 세션과 함께 직접 호출합니다.
+# 벤치마크 2 (bulk): 게시글 N건 생성 - POST /posts N번 vs POST /posts/bulk
+# 벤치마크 3 (cache): Zipf 분포 id로 GET /posts/{id} 반복 - 캐시 없음 vs PostCache
+# 벤치마크 4 (search): 게시글 N건에서 검색 지연 시간 - LIKE '%q%' 전체 스캔 vs FTS5
+# 벤치마크 5 (list): GET /posts 페이지 크기별 rows/sec - mode=orm vs mode=rows
+# 벤치마크 6 (boot): 워커 N개가 같은 DB 파일로 동시에 시작할 때 준비 시간과 DDL 충돌
+#   - import 시 create_all : 이전 solution (잠금 없음)
+#   - lifespan init_db    : 파일 잠금 아래에서 한 번씩 실행
+# 실행: python benchmark.py writes [게시글 수, 기본 5000]
+#       python benchmark.py bulk [게시글 수, 기본 100000] [batch_size, 기본 BULK_BATCH_SIZE]
+#       python benchmark.py cache [게시글 수, 기본 10000] [요청 수, 기본 20000]
+#       python benchmark.py search [게시글 수, 기본 1000000]
+#       python benchmark.py list [게시글 수, 기본 20000]
+#       python benchmark.py boot [워커 수, 기본 8] [반복 횟수, 기본 5]
+
+import itertools
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+# 벤치마크 중 앱 lifespan이 현재 폴더에 DB 파일을 만들지 않도록 (boot 워커는 따로 지정)
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, func, insert, or_, select
+from sqlalchemy.orm import Session, sessionmaker
+
+import solution
+from solution import (
+    BULK_BATCH_SIZE, Base, Post, PostCache, PostCreate, app, create_sqlite_engine, delete_post,
+    get_db, get_post, search_posts, update_post,
+)
+
+
+def orm_update_post(post_id: int, post_update: PostCreate, db: Session):
+    db_post = db.query(Post).filter(Post.id == post_id).first()
+    if db_post is None:
+        raise HTTPException(status_code=404, detail="게시글을 찾을 수 없습니다")
+    db_post.title = post_update.title
+    db_post.content = post_update.content
+    db.commit()
+    db.refresh(db_post)
+    return db_post
+
+
+def orm_delete_post(post_id: int, db: Session):
+    db_post = db.query(Post).filter(Post.id == post_id).first()
+    if db_post is None:
+        raise HTTPException(status_code=404, detail="게시글을 찾을 수 없습니다")
+    db.delete(db_post)
+    db.commit()
+
+
+def make_session(path: str, count: int) -> Session:
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(insert(Post), [
+            {"title": f"제목 {i}", "content": f"내용 {i}", "is_published": False}
+            for i in range(count)
+        ])
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+
+
+def measure(fn, count: int) -> float:
+    start = time.perf_counter()
+    for post_id in range(1, count + 1):
+        fn(post_id)
+    return count / (time.perf_counter() - start)
+
+
+def run_writes(count: int) -> None:
+    body = PostCreate(title="수정된 제목", content="수정된 내용")
+
+    print("=" * 50)
+    print(f"게시글 수정/삭제 처리량 벤치마크 (게시글 {count:,}건)")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        orm = make_session(os.path.join(tmp, "orm.db"), count)
+        lean = make_session(os.path.join(tmp, "lean.db"), count)
+
+        orm_rate = measure(lambda i: orm_update_post(i, body, orm), count)
+        lean_rate = measure(lambda i: update_post(i, body, lean), count)
+        print(f"  수정  ORM: {orm_rate:>10,.0f} writes/s   UPDATE RETURNING: {lean_rate:>10,.0f} writes/s"
+              f"   ({lean_rate / orm_rate:.2f}x)")
+
+        orm_rate = measure(lambda i: orm_delete_post(i, orm), count)
+        lean_rate = measure(lambda i: delete_post(i, lean), count)
+        print(f"  삭제  ORM: {orm_rate:>10,.0f} writes/s   DELETE          : {lean_rate:>10,.0f} writes/s"
+              f"   ({lean_rate / orm_rate:.2f}x)")
+
+        orm.close()
+        lean.close()
+
+
+def run_bulk(count: int, batch_size: int) -> None:
+    posts = [{"title": f"제목 {i}", "content": f"내용 {i}"} for i in range(count)]
+
+    print("=" * 50)
+    print(f"게시글 대량 생성 벤치마크 ({count:,}건, batch_size={batch_size:,})")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, path in [("POST /posts x N", "single.db"), ("POST /posts/bulk", "bulk.db")]:
+            engine = create_engine(
+                f"sqlite:///{os.path.join(tmp, path)}", connect_args={"check_same_thread": False}
+            )
+            Base.metadata.create_all(bind=engine)
+            BenchSession = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+            def override_get_db():
+                db = BenchSession()
+                try:
+                    yield db
+                finally:
+                    db.close()
+
+            app.dependency_overrides[get_db] = override_get_db
+            with TestClient(app) as client:
+                start = time.perf_counter()
+                if path == "single.db":
+                    for post in posts:
+                        client.post("/posts", json=post).raise_for_status()
+                else:
+                    response = client.post("/posts/bulk", params={"batch_size": batch_size}, json=posts)
+                    assert response.json()["count"] == count
+                elapsed = time.perf_counter() - start
+            app.dependency_overrides.clear()
+
+            with engine.connect() as conn:
+                assert conn.scalar(select(func.count()).select_from(Post)) == count
+            engine.dispose()
+            print(f"  {label:<17}: {elapsed:8.2f} s   ({count / elapsed:>10,.0f} rows/s)")
+
+
+def run_cache(count: int, requests: int) -> None:
+    # Zipf(s=1.1): 소수의 인기 게시글에 요청이 몰리는 읽기 위주 트래픽
+    rng = random.Random(0)
+    ids = list(range(1, count + 1))
+    weights = [1 / rank ** 1.1 for rank in ids]
+    rng.shuffle(ids)
+    traffic = rng.choices(ids, weights=weights, k=requests)
+
+    print("=" * 50)
+    print(f"게시글 캐시 벤치마크 (게시글 {count:,}건, Zipf 요청 {requests:,}건)")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = make_session(os.path.join(tmp, "cache.db"), count)
+        BenchSession = sessionmaker(autocommit=False, autoflush=False, bind=db.get_bind())
+        db.close()
+
+        def override_get_db():
+            session = BenchSession()
+            try:
+                yield session
+            finally:
+                session.close()
+
+        app.dependency_overrides[get_db] = override_get_db
+        original_cache = solution.post_cache
+        try:
+            # HTTP 계층 없이 핸들러만 호출 (캐시 효과만 보기)
+            for label, cache in [("캐시 없음", PostCache(max_size=0)),
+                                 ("PostCache", PostCache(max_size=1024))]:
+                solution.post_cache = cache
+                start = time.perf_counter()
+                for post_id in traffic:
+                    with BenchSession() as session:
+                        get_post(post_id, session)
+                elapsed = time.perf_counter() - start
+                print(f"  핸들러    {label:<9}: {requests / elapsed:>8,.0f} req/s"
+                      f"   적중률 {cache.stats()['hit_rate']:.1%}")
+
+            with TestClient(app) as client:
+                for label, cache in [("캐시 없음", PostCache(max_size=0)),
+                                     ("PostCache", PostCache(max_size=1024))]:
+                    solution.post_cache = cache
+                    start = time.perf_counter()
+                    for post_id in traffic:
+                        client.get(f"/posts/{post_id}")
+                    elapsed = time.perf_counter() - start
+                    stats = cache.stats()
+                    print(f"  HTTP      {label:<9}: {requests / elapsed:>8,.0f} req/s"
+                          f"   적중률 {stats['hit_rate']:.1%}")
+        finally:
+            solution.post_cache = original_cache
+            app.dependency_overrides.clear()
+
+
+def random_vocab(rng: random.Random, size: int) -> list[str]:
+    """서로 접두어가 거의 겹치지 않는 임의의 영단어 size개"""
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    words: set[str] = set()
+    while len(words) < size:
+        words.add("".join(rng.choices(letters, k=rng.randint(5, 9))))
+    return sorted(words, key=lambda _: rng.random())
+
+
+def run_search(count: int) -> None:
+    # 단어 5,000개를 Zipf 분포로 뽑아 만든 문장 (앞쪽 단어일수록 흔함)
+    rng = random.Random(0)
+    vocab = random_vocab(rng, 5_000)
+    cum_weights = list(itertools.accumulate(1 / (rank + 1) for rank in range(len(vocab))))
+    queries = [vocab[0], vocab[30], vocab[300], vocab[3_000], f"{vocab[30]} {vocab[300]}"]
+
+    print("=" * 50)
+    print(f"전문 검색 벤치마크 (게시글 {count:,}건)")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_sqlite_engine(f"sqlite:///{os.path.join(tmp, 'search.db')}", profile="bulk-load")
+        # posts만 먼저 만들어 적재한 뒤 create_all()로 색인을 한 번에 구축 ('rebuild')
+        Post.__table__.create(bind=engine)
+        start = time.perf_counter()
+        with engine.begin() as conn:
+            for offset in range(0, count, 50_000):
+                conn.execute(insert(Post), [
+                    {"title": " ".join(rng.choices(vocab, cum_weights=cum_weights, k=4)),
+                     "content": " ".join(rng.choices(vocab, cum_weights=cum_weights, k=30)),
+                     "is_published": False}
+                    for _ in range(min(50_000, count - offset))
+                ])
+        print(f"  게시글 적재: {time.perf_counter() - start:6.1f} s")
+        start = time.perf_counter()
+        Base.metadata.create_all(bind=engine)
+        print(f"  FTS5 색인 구축: {time.perf_counter() - start:6.1f} s")
+
+        with Session(engine) as db:
+            for q in queries:
+                like = select(Post.id).where(*[
+                    or_(Post.title.like(f"%{term}%"), Post.content.like(f"%{term}%"))
+                    for term in q.split()
+                ])
+                start = time.perf_counter()
+                db.execute(like.limit(10)).all()
+                like_first_ms = (time.perf_counter() - start) * 1000
+                start = time.perf_counter()
+                matches = len(db.execute(like).all())
+                like_all_ms = (time.perf_counter() - start) * 1000
+
+                repeat = 3
+                start = time.perf_counter()
+                for _ in range(repeat):
+                    first = search_posts(q=q, limit=10, cursor=None, db=db)
+                fts_ms = (time.perf_counter() - start) * 1000 / repeat
+                start = time.perf_counter()
+                search_posts(q=q, limit=10, cursor=first["next_cursor"], db=db)
+                next_ms = (time.perf_counter() - start) * 1000
+
+                print(f"  q={q!r:<20} 일치 {matches:>9,}건")
+                print(f"    LIKE 첫 10건(순위 없음): {like_first_ms:>9,.1f} ms"
+                      f"   LIKE 전체: {like_all_ms:>9,.1f} ms")
+                print(f"    FTS5 bm25 1페이지   : {fts_ms:>9,.1f} ms"
+                      f"   2페이지  : {next_ms:>9,.1f} ms")
+        engine.dispose()
+
+
+def run_list(count: int) -> None:
+    print("=" * 50)
+    print(f"게시글 목록 직렬화 벤치마크 (게시글 {count:,}건)")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = make_session(os.path.join(tmp, "list.db"), count)
+        BenchSession = sessionmaker(autocommit=False, autoflush=False, bind=db.get_bind())
+        db.close()
+
+        def override_get_db():
+            session = BenchSession()
+            try:
+                yield session
+            finally:
+                session.close()
+
+        app.dependency_overrides[get_db] = override_get_db
+        try:
+            with TestClient(app) as client:
+                # 게시글 수보다 큰 페이지는 건너뜁니다 (count가 1,000보다 작을 때)
+                for limit in sorted(limit for limit in {100, 1_000, count} if limit <= count):
+                    rates = {}
+                    for mode in ("orm", "rows"):
+                        repeat = max(1, 20_000 // limit)
+                        start = time.perf_counter()
+                        for _ in range(repeat):
+                            response = client.get("/posts", params={"limit": limit, "mode": mode})
+                        rates[mode] = repeat * limit / (time.perf_counter() - start)
+                        assert len(response.json()) == limit
+                    print(f"  limit={limit:>6,}  orm: {rates['orm']:>10,.0f} rows/s"
+                          f"   rows: {rates['rows']:>10,.0f} rows/s"
+                          f"   ({rates['rows'] / rates['orm']:.1f}x)")
+        finally:
+            app.dependency_overrides.clear()
+
+
+def boot_worker(mode: str, start_at: float) -> None:
+    """워커 하나: 정해진 시각에 동시에 스키마를 준비하고 결과를 JSON으로 출력합니다."""
+    time.sleep(max(0.0, start_at - time.time()))
+    start = time.perf_counter()
+    error = None
+    try:
+        if mode == "legacy":
+            Base.metadata.create_all(bind=solution.engine)  # 이전 import 시점 코드
+        else:
+            solution.init_db()
+    except Exception as exc:  # 동시 DDL 충돌 (table ... already exists 등)
+        error = type(exc).__name__
+    print(json.dumps({"ms": (time.perf_counter() - start) * 1000, "error": error}))
+
+
+def run_boot(workers: int, rounds: int) -> None:
+    print("=" * 50)
+    print(f"워커 동시 시작 벤치마크 (워커 {workers}개 x {rounds}회)")
+    print("=" * 50)
+
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", "import solution"], check=True)
+    print(f"  import solution (DB 접근 없음): {(time.perf_counter() - start) * 1000:,.0f} ms (인터프리터 포함)")
+
+    for mode, label in [("legacy", "import 시 create_all"), ("lifespan", "lifespan init_db")]:
+        times, errors = [], 0
+        for _ in range(rounds):
+            with tempfile.TemporaryDirectory() as tmp:
+                env = os.environ | {"DATABASE_URL": f"sqlite:///{os.path.join(tmp, 'boot.db')}"}
+                start_at = time.time() + 2.0  # 모든 워커의 import가 끝난 뒤 동시에 시작
+                procs = [
+                    subprocess.Popen(
+                        [sys.executable, __file__, "--boot-worker", mode, repr(start_at)],
+                        env=env, stdout=subprocess.PIPE, text=True,
+                    )
+                    for _ in range(workers)
+                ]
+                for proc in procs:
+                    result = json.loads(proc.communicate()[0].strip().splitlines()[-1])
+                    times.append(result["ms"])
+                    errors += result["error"] is not None
+        times.sort()
+        print(f"  {label:<20}: 중앙값 {times[len(times) // 2]:>7,.1f} ms   최대 {times[-1]:>7,.1f} ms"
+              f"   실패한 워커 {errors}/{len(times)}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 3 and sys.argv[1] == "--boot-worker":
+        boot_worker(sys.argv[2], float(sys.argv[3]))
+        sys.exit()
+
+    command = sys.argv[1] if len(sys.argv) > 1 else "writes"
+    if command == "bulk":
+        count = int(sys.argv[2]) if len(sys.argv) > 2 else 100_000
+        batch_size = int(sys.argv[3]) if len(sys.argv) > 3 else BULK_BATCH_SIZE
+        run_bulk(count, batch_size)
+    elif command == "search":
+        count = int(sys.argv[2]) if len(sys.argv) > 2 else 1_000_000
+        run_search(count)
+    elif command == "boot":
+        workers = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+        rounds = int(sys.argv[3]) if len(sys.argv) > 3 else 5
+        run_boot(workers, rounds)
+    elif command == "list":
+        count = int(sys.argv[2]) if len(sys.argv) > 2 else 20_000
+        run_list(count)
+    elif command == "cache":
+        count = int(sys.argv[2]) if len(sys.argv) > 2 else 10_000
+        requests = int(sys.argv[3]) if len(sys.argv) > 3 else 20_000
+        run_cache(count, requests)
+    else:
+        count = int(sys.argv[2]) if len(sys.argv) > 2 else 5_000
+        run_writes(count)
@@ -2,23 +2,136 @@
 # 실행: python solution.py
 # 필요 패키지: pip install fastapi sqlalchemy httpx
 
-from fastapi import FastAPI, Depends, HTTPException
-from sqlalchemy import create_engine, Column, Integer, String, Boolean
+import contextlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Literal
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from fastapi import FastAPI, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import (
+    create_engine, event, text, Column, Integer, String, Boolean, insert, select, update, delete,
+)
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker, declarative_base, Session
+from sqlalchemy.pool import StaticPool
 from pydantic import BaseModel, ConfigDict
 
 # ============================================================
 # 데이터베이스 설정
 # ============================================================
-SQLALCHEMY_DATABASE_URL = "sqlite:///./test_crud.db"
+# ── 엔진 팩토리 (sec01에서 학습한 내용) ──
+# DB_PROFILE=safe(기본값) / fast-wal / bulk-load: 연결마다 적용할 PRAGMA와 풀 크기
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL,
-    connect_args={"check_same_thread": False}
-)
+DB_PROFILE = os.environ.get("DB_PROFILE", "safe")
+
+SQLITE_PROFILES = {
+    "safe": {
+        "pragmas": {
+            "journal_mode": "DELETE",
+            "synchronous": "FULL",
+            "temp_store": "DEFAULT",
+        },
+        "pool_size": 5,
+        "max_overflow": 10,
+    },
+    "fast-wal": {
+        "pragmas": {
+            "journal_mode": "WAL",
+            "synchronous": "NORMAL",
+            "mmap_size": 256 * 1024 * 1024,
+            "cache_size": -64 * 1024,  # 음수: KiB 단위 (64 MiB)
+            "temp_store": "MEMORY",
+        },
+        "pool_size": 10,
+        "max_overflow": 20,
+    },
+    "bulk-load": {
+        "pragmas": {
+            "journal_mode": "WAL",
+            "synchronous": "OFF",
+            "mmap_size": 256 * 1024 * 1024,
+            "cache_size": -256 * 1024,
+            "temp_store": "MEMORY",
+        },
+        # SQLite는 쓰기가 한 번에 하나뿐이므로 적재용 연결 하나면 충분합니다.
+        "pool_size": 1,
+        "max_overflow": 0,
+    },
+}
+
+
+def create_sqlite_engine(
+    url: str,
+    profile: str = DB_PROFILE,
+    pool_size: int | None = None,
+    max_overflow: int | None = None,
+    pool_timeout: float = 30,
+) -> Engine:
+    """
+    프로필의 PRAGMA를 연결마다 적용하는 SQLite 엔진을 만듭니다.
+
+    pool_size / max_overflow를 넘기면 프로필의 풀 크기 대신 사용합니다.
+    인메모리 DB(":memory:")는 연결마다 다른 DB가 생기므로
+    풀 크기 대신 StaticPool로 연결 하나를 공유합니다.
+    """
+    if profile not in SQLITE_PROFILES:
+        raise ValueError(f"알 수 없는 DB 프로필입니다: {profile} (가능: {', '.join(SQLITE_PROFILES)})")
+    settings = SQLITE_PROFILES[profile]
+
+    if url in ("sqlite://", "sqlite:///:memory:"):
+        engine = create_engine(
+            url, connect_args={"check_same_thread": False}, poolclass=StaticPool
+        )
+    else:
+        engine = create_engine(
+            url,
+            connect_args={"check_same_thread": False},
+            pool_size=settings["pool_size"] if pool_size is None else pool_size,
+            max_overflow=settings["max_overflow"] if max_overflow is None else max_overflow,
+            pool_timeout=pool_timeout,
+        )
+
+    @event.listens_for(engine, "connect")
+    def apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in settings["pragmas"].items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+    return engine
+
+
+SQLALCHEMY_DATABASE_URL = os.environ.get("DATABASE_URL", "sqlite:///./test_crud.db")
+
+engine = create_sqlite_engine(SQLALCHEMY_DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+# 대량 생성 시 INSERT 한 번에 넣을 기본 행 수 (?batch_size로 요청마다 변경 가능)
+BULK_BATCH_SIZE = int(os.environ.get("BULK_BATCH_SIZE", "500"))
+MAX_BULK_BATCH_SIZE = 5_000
+
+# 이 시간(ms) 이상 걸린 SQL은 느린 쿼리 로그에 남깁니다.
+# 바인딩 파라미터에는 사용자 데이터가 들어 있으므로 기본으로 가리고,
+# SLOW_QUERY_LOG_PARAMS=1일 때만 원래 값을 남깁니다 (/diagnostics/db로 노출됨).
+SLOW_QUERY_MS = float(os.environ.get("SLOW_QUERY_MS", "100"))
+SLOW_QUERY_LOG_SIZE = 100
+SLOW_QUERY_LOG_PARAMS = os.environ.get("SLOW_QUERY_LOG_PARAMS", "0") == "1"
+REDACTED = "<redacted>"
+
+# 게시글 상세 응답 캐시 크기(0이면 사용 안 함)와 유효 시간(초)
+POST_CACHE_SIZE = int(os.environ.get("POST_CACHE_SIZE", "1024"))
+POST_CACHE_TTL = float(os.environ.get("POST_CACHE_TTL", "60"))
+
 
 # ============================================================
 # TODO 1: SQLAlchemy 모델 정의
@@ -55,22 +168,463 @@ class PostResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class PostSearchHit(BaseModel):
+    """검색 결과 한 건 (title/snippet의 일치 부분은 <b>...</b>로 강조)"""
+    id: int
+    title: str
+    snippet: str
+    score: float
+
+
+class PostSearchResponse(BaseModel):
+    """게시글 검색 응답 스키마 (next_cursor로 다음 페이지 요청)"""
+    items: list[PostSearchHit]
+    next_cursor: str | None
+
+
+class PostBulkResponse(BaseModel):
+    """게시글 대량 생성 응답 스키마"""
+    count: int
+    ids: list[int]
+
+
 # ============================================================
-# 테이블 생성 및 의존성
+# 목록 조회용 행 직렬화
+# ============================================================
+
+# PostResponse 필드 순서와 같은 컬럼 목록
+POST_LIST_COLUMNS = (Post.id, Post.title, Post.content, Post.is_published)
+POST_LIST_KEYS = tuple(PostResponse.model_fields)
+assert POST_LIST_KEYS == tuple(column.key for column in POST_LIST_COLUMNS)
+
+# FastAPI 기본 JSONResponse와 같은 출력 형식
+_json_encoder = json.JSONEncoder(ensure_ascii=False, allow_nan=False, separators=(",", ":"))
+
+
+def encode_post_rows(rows) -> bytes:
+    """(id, title, content, is_published) 튜플 목록을 JSON 배열 바이트로 만듭니다."""
+    keys = POST_LIST_KEYS
+    return _json_encoder.encode([dict(zip(keys, row)) for row in rows]).encode()
+
+
+# ============================================================
+# 전문 검색 (SQLite FTS5)
 # ============================================================
-Base.metadata.create_all(bind=engine)
+# posts 테이블을 원본으로 하는 외부 콘텐츠(external content) FTS5 테이블을 두고,
+# INSERT/UPDATE/DELETE 트리거로 색인을 동기화합니다.
+# create_all()이 끝날 때마다 실행되며, 색인을 처음 만들 때는 기존 게시글도 색인합니다.
 
+SEARCH_INDEX_DDL = [
+    """CREATE VIRTUAL TABLE posts_fts USING fts5(
+        title, content, content='posts', content_rowid='id'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS posts_fts_insert AFTER INSERT ON posts BEGIN
+        INSERT INTO posts_fts(rowid, title, content) VALUES (new.id, new.title, new.content);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS posts_fts_delete AFTER DELETE ON posts BEGIN
+        INSERT INTO posts_fts(posts_fts, rowid, title, content)
+        VALUES ('delete', old.id, old.title, old.content);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS posts_fts_update AFTER UPDATE OF title, content ON posts BEGIN
+        INSERT INTO posts_fts(posts_fts, rowid, title, content)
+        VALUES ('delete', old.id, old.title, old.content);
+        INSERT INTO posts_fts(rowid, title, content) VALUES (new.id, new.title, new.content);
+    END""",
+]
 
-def get_db():
-    """데이터베이스 세션 의존성"""
-    db = SessionLocal()
+
+@event.listens_for(Base.metadata, "after_create")
+def create_search_index(target, connection, **kw):
+    """posts_fts 가상 테이블과 동기화 트리거를 만듭니다 (이미 있으면 건너뜀)"""
+    exists = connection.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'posts_fts'")
+    ).first()
+    if exists:
+        return
+    for ddl in SEARCH_INDEX_DDL:
+        connection.execute(text(ddl))
+    connection.execute(text("INSERT INTO posts_fts(posts_fts) VALUES ('rebuild')"))
+
+
+def to_match_query(q: str) -> str:
+    """
+    사용자 입력을 FTS5 MATCH 식으로 바꿉니다.
+    단어마다 큰따옴표로 감싸 연산자/특수문자를 글자로 취급하고,
+    접두어 검색(*)으로 한국어 조사가 붙은 단어도 찾습니다 ("안녕" → "안녕하세요").
+    """
+    terms = ['"' + term.replace('"', '""') + '"*' for term in q.split()]
+    return " ".join(terms)
+
+
+def encode_cursor(score: float, post_id: int) -> str:
+    return f"{score!r}:{post_id}"
+
+
+def decode_cursor(cursor: str) -> tuple[float, int]:
     try:
+        score, post_id = cursor.rsplit(":", 1)
+        return float(score), int(post_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="잘못된 cursor입니다")
+
+
+# ============================================================
+# 게시글 상세 응답 캐시
+# ============================================================
+
+class PostCache:
+    """
+    게시글 id -> 직렬화된 PostResponse(JSON 바이트) LRU + TTL 캐시.
+
+    수정/삭제 시 invalidate()로 항목을 지웁니다. 캐시 미스 후 DB를 읽는 동안
+    다른 요청이 같은 게시글을 수정했다면, 읽어 온 값은 이미 낡았으므로
+    put()이 저장하지 않습니다 (get_token()으로 받은 세대 번호로 판단).
+    """
+
+    def __init__(self, max_size: int = POST_CACHE_SIZE, ttl: float = POST_CACHE_TTL,
+                 clock=time.monotonic):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[int, tuple[float, bytes]] = OrderedDict()
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, post_id: int) -> bytes | None:
+        with self._lock:
+            entry = self._entries.get(post_id)
+            if entry is not None and entry[0] > self.clock():
+                self._entries.move_to_end(post_id)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:  # 만료된 항목
+                del self._entries[post_id]
+            self.misses += 1
+            return None
+
+    def get_token(self) -> int:
+        """DB를 읽기 전에 받아 두는 세대 번호"""
+        return self._generation
+
+    def put(self, post_id: int, body: bytes, token: int) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            if token != self._generation:
+                return
+            self._entries[post_id] = (self.clock() + self.ttl, body)
+            self._entries.move_to_end(post_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, post_id: int) -> None:
+        with self._lock:
+            self._generation += 1
+            self.invalidations += 1
+            self._entries.pop(post_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+post_cache = PostCache()
+
+
+# ============================================================
+# DB 계측: 커넥션 풀 / 쿼리 (SQLAlchemy 이벤트)
+# ============================================================
+
+class RequestDBStats:
+    """요청 하나가 DB를 사용한 기록"""
+
+    def __init__(self, route: str):
+        self.route = route
+        self.statements = 0
+        self.statement_ms = 0.0
+        self.checkout_wait_ms = 0.0
+        self.checkout_ms = 0.0
+
+
+class DBInstrumentation:
+    """
+    SQLAlchemy 이벤트로 get_db 세션의 DB 사용량을 기록합니다.
+
+    - 풀 대기 시간: 세션 트랜잭션 시작(after_transaction_create) → 연결 획득(after_begin)
+    - 연결 점유 시간: 풀 checkout → checkin
+    - 요청당 SQL 문 수와 실행 시간: before/after_cursor_execute
+    - 느린 쿼리: slow_query_ms 이상이면 SQL을 최근 log_size건까지 보관
+      (바인딩 파라미터는 log_parameters=True일 때만 원래 값, 아니면 REDACTED)
+    - 경로(route)별 누적 합계
+
+    세션과 연결은 connection.info(풀 연결 레코드에 붙는 딕셔너리)로 이어 줍니다.
+    """
+
+    def __init__(self, engine: Engine, session_factory: sessionmaker,
+                 slow_query_ms: float = SLOW_QUERY_MS, log_size: int = SLOW_QUERY_LOG_SIZE,
+                 log_parameters: bool = SLOW_QUERY_LOG_PARAMS):
+        self.engine = engine
+        self.session_factory = session_factory
+        self.slow_query_ms = slow_query_ms
+        self.log_parameters = log_parameters
+        self._lock = threading.Lock()
+        self.routes: dict[str, dict] = {}
+        self.slow_queries: deque[dict] = deque(maxlen=log_size)
+
+        event.listen(session_factory, "after_transaction_create", self._on_transaction_create)
+        event.listen(session_factory, "after_begin", self._on_begin)
+        event.listen(engine, "before_cursor_execute", self._before_execute)
+        event.listen(engine, "after_cursor_execute", self._after_execute)
+        event.listen(engine, "checkout", self._on_checkout)
+        event.listen(engine, "checkin", self._on_checkin)
+
+    # ── 세션 이벤트 ──
+    def _on_transaction_create(self, session, transaction):
+        if transaction.parent is None and "db_stats" in session.info:
+            session.info["begin_at"] = time.perf_counter()
+
+    def _on_begin(self, session, transaction, connection):
+        stats = session.info.get("db_stats")
+        if stats is None:
+            return
+        begin_at = session.info.pop("begin_at", None)
+        if begin_at is not None:
+            stats.checkout_wait_ms += (time.perf_counter() - begin_at) * 1000
+        connection.info["db_stats"] = stats
+
+    # ── 엔진/풀 이벤트 ──
+    def _before_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info["query_start"] = time.perf_counter()
+
+    def _after_execute(self, conn, cursor, statement, parameters, context, executemany):
+        elapsed_ms = (time.perf_counter() - conn.info.pop("query_start")) * 1000
+        stats = conn.info.get("db_stats")
+        if stats is not None:
+            stats.statements += 1
+            stats.statement_ms += elapsed_ms
+        if elapsed_ms >= self.slow_query_ms:
+            self.slow_queries.append({
+                "route": stats.route if stats is not None else None,
+                "ms": round(elapsed_ms, 3),
+                "statement": statement,
+                "parameters": repr(parameters)[:500] if self.log_parameters else REDACTED,
+            })
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        connection_record.info["checkout_at"] = time.perf_counter()
+
+    def _on_checkin(self, dbapi_connection, connection_record):
+        checkout_at = connection_record.info.pop("checkout_at", None)
+        stats = connection_record.info.pop("db_stats", None)
+        if checkout_at is not None and stats is not None:
+            stats.checkout_ms += (time.perf_counter() - checkout_at) * 1000
+
+    # ── 요청 단위 ──
+    @contextlib.contextmanager
+    def session(self, route: str):
+        """계측되는 세션을 열고, 닫은 뒤 경로별 합계에 더합니다."""
+        stats = RequestDBStats(route)
+        db = self.session_factory(info={"db_stats": stats})
+        try:
+            yield db
+        finally:
+            db.close()  # 연결 반납(checkin)까지 끝난 뒤 기록
+            self._record(stats)
+
+    def _record(self, stats: RequestDBStats) -> None:
+        with self._lock:
+            totals = self.routes.setdefault(stats.route, {
+                "requests": 0, "statements": 0, "statement_ms": 0.0,
+                "checkout_wait_ms": 0.0, "max_checkout_wait_ms": 0.0, "checkout_ms": 0.0,
+            })
+            totals["requests"] += 1
+            totals["statements"] += stats.statements
+            totals["statement_ms"] += stats.statement_ms
+            totals["checkout_wait_ms"] += stats.checkout_wait_ms
+            totals["max_checkout_wait_ms"] = max(totals["max_checkout_wait_ms"], stats.checkout_wait_ms)
+            totals["checkout_ms"] += stats.checkout_ms
+
+    def pool_status(self) -> dict:
+        pool = self.engine.pool
+        status = {"class": type(pool).__name__}
+        for name in ("size", "checkedin", "checkedout", "overflow"):
+            if hasattr(pool, name):
+                status[name] = getattr(pool, name)()
+        return status
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            routes = {
+                route: {
+                    **totals,
+                    "statements_per_request": totals["statements"] / totals["requests"],
+                    "avg_checkout_wait_ms": totals["checkout_wait_ms"] / totals["requests"],
+                }
+                for route, totals in self.routes.items()
+            }
+            slow_queries = list(self.slow_queries)
+        return {
+            "pool": self.pool_status(),
+            "slow_query_ms": self.slow_query_ms,
+            "routes": routes,
+            "slow_queries": slow_queries,
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self.routes.clear()
+            self.slow_queries.clear()
+
+
+db_metrics = DBInstrumentation(engine, SessionLocal)
+
+
+def route_path(request: Request) -> str:
+    """요청이 매칭된 경로 템플릿 (예: /posts/{post_id})"""
+    route = request.scope.get("route")
+    return getattr(route, "path", request.url.path)
+
+
+# ============================================================
+# 테이블 생성 및 의존성
+# ============================================================
+# 모듈 import 시에는 DB에 접근하지 않고(엔진은 첫 연결 때 파일을 엽니다),
+# 서버 시작(lifespan) 때 init_db()로 스키마를 준비합니다.
+# uvicorn 워커 여러 개가 동시에 시작해도 파일 잠금으로 DDL을 한 번에 하나씩만 실행합니다.
+
+@contextlib.contextmanager
+def file_lock(path: str):
+    """프로세스 간 배타 잠금 (POSIX: fcntl, Windows: msvcrt)"""
+    with open(path, "a+b") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        else:
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def init_db(bind: Engine | None = None) -> None:
+    """스키마를 준비합니다 (이미 있는 테이블은 건너뜀)"""
+    bind = engine if bind is None else bind
+    database = bind.url.database
+    if not database or database == ":memory:":
+        Base.metadata.create_all(bind=bind)
+        return
+    with file_lock(f"{database}.lock"):
+        Base.metadata.create_all(bind=bind)
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app: FastAPI):
+    """서버 시작 시 스키마 준비"""
+    init_db()
+    yield
+
+
+def get_db(request: Request):
+    """데이터베이스 세션 의존성 (db_metrics로 풀/쿼리 사용량 기록)"""
+    with db_metrics.session(route_path(request)) as db:
         yield db
-    finally:
-        db.close()
 
 
-app = FastAPI()
+# ============================================================
+# 테스트 하네스: 테스트마다 SAVEPOINT 롤백
+# ============================================================
+
+class RollbackTestHarness:
+    """
+    인메모리 DB에 스키마를 한 번만 만들고, 테스트마다 트랜잭션을 열어
+    get_db 세션이 그 안의 SAVEPOINT에서 commit하도록 한 뒤 테스트가 끝나면 롤백합니다.
+
+    - 테스트 사이에 데이터가 남지 않으므로 각 테스트가 독립적이고 순서에 의존하지 않습니다.
+    - 파일을 만들지 않으므로 여러 프로세스에서 동시에 실행해도 서로 영향이 없습니다.
+    - resets: 테스트 시작 전에 호출할 함수 (DB 밖의 상태, 예: 캐시 비우기)
+    """
+
+    def __init__(self, app: FastAPI, get_db, metadata, resets=()):
+        self.app = app
+        self.get_db = get_db
+        self.resets = tuple(resets)
+        self.engine = create_sqlite_engine("sqlite:///:memory:")
+
+        # pysqlite는 BEGIN을 첫 DML 직전에야 보내서 SAVEPOINT가 트랜잭션 밖에서 실행됩니다.
+        # 드라이버의 트랜잭션 처리를 끄고 BEGIN을 직접 보냅니다 (SQLAlchemy 문서의 방법).
+        @event.listens_for(self.engine, "connect")
+        def disable_driver_transactions(dbapi_connection, connection_record):
+            dbapi_connection.isolation_level = None
+
+        @event.listens_for(self.engine, "begin")
+        def emit_begin(connection):
+            connection.exec_driver_sql("BEGIN")
+
+        metadata.create_all(bind=self.engine)
+
+    @contextlib.contextmanager
+    def transaction(self):
+        """테스트 하나를 감싸는 트랜잭션. 앱에 요청을 보낼 TestClient를 돌려줍니다."""
+        from fastapi.testclient import TestClient
+
+        connection = self.engine.connect()
+        outer = connection.begin()
+
+        def override_get_db():
+            # commit()은 SAVEPOINT만 해제하고, 바깥 트랜잭션은 테스트 끝에 롤백됩니다.
+            db = Session(bind=connection, join_transaction_mode="create_savepoint", autoflush=False)
+            try:
+                yield db
+            finally:
+                db.close()
+
+        for reset in self.resets:
+            reset()
+        self.app.dependency_overrides[self.get_db] = override_get_db
+        try:
+            # with 블록 없이 만들어 앱의 lifespan(운영 DB 준비)은 실행하지 않습니다.
+            yield TestClient(self.app)
+        finally:
+            self.app.dependency_overrides.pop(self.get_db, None)
+            outer.rollback()
+            connection.close()
+
+    def run(self, tests) -> None:
+        """테스트 함수 목록을 각각 트랜잭션 안에서 실행합니다 (docstring을 이름으로 출력)."""
+        start = time.perf_counter()
+        for test in tests:
+            with self.transaction() as client:
+                test(client)
+            print(f"✓ {test.__doc__} 테스트 통과")
+        print(f"  (테스트 {len(tests)}개, {time.perf_counter() - start:.2f} s)")
+
+
+app = FastAPI(lifespan=lifespan)
 
 
 # ============================================================
@@ -93,22 +647,155 @@ def create_post(post: PostCreate, db: Session = Depends(get_db)):
     return db_post
 
 
+@app.post("/posts/bulk", response_model=PostBulkResponse, status_code=201)
+def create_posts_bulk(
+    posts: list[PostCreate],
+    batch_size: int = Query(BULK_BATCH_SIZE, ge=1, le=MAX_BULK_BATCH_SIZE),
+    db: Session = Depends(get_db)
+):
+    """
+    여러 게시글을 한 번에 생성합니다.
+
+    ORM 객체를 만들지 않고 Core insert()를 batch_size 행씩 나눠 실행하며,
+    전체를 하나의 트랜잭션으로 commit합니다 (중간에 실패하면 모두 롤백).
+    생성된 id는 요청 순서대로 반환합니다.
+
+    배치마다 여러 행 INSERT 한 문장을 보냅니다. sort_by_parameter_order=True를 쓰면
+    SQLite에서는 행마다 INSERT를 따로 실행하기 때문입니다. 대신 RETURNING 결과를
+    정렬해 요청 순서를 맞추는데, 이는 SQLite가 쓰기 잠금을 잡은 트랜잭션 안에서
+    새 rowid를 max(rowid) + 1씩 행 순서대로 발급한다는 점에 기대고 있습니다.
+    그래서 배치마다 id 개수와 연속성을 확인하고, 어긋나면 롤백합니다.
+    """
+    statement = insert(Post).returning(Post.id)
+    ids: list[int] = []
+    try:
+        for start in range(0, len(posts), batch_size):
+            rows = [
+                {"title": post.title, "content": post.content, "is_published": False}
+                for post in posts[start:start + batch_size]
+            ]
+            batch_ids = sorted(db.scalars(statement, rows))
+            if len(batch_ids) != len(rows) or batch_ids[-1] - batch_ids[0] != len(rows) - 1:
+                raise RuntimeError("대량 생성된 id가 연속적이지 않아 요청 순서를 보장할 수 없습니다")
+            ids.extend(batch_ids)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return {"count": len(ids), "ids": ids}
+
+
 @app.get("/posts", response_model=list[PostResponse])
-def get_posts(skip: int = 0, limit: int = 10, db: Session = Depends(get_db)):
-    """게시글 목록을 조회합니다 (페이지네이션 지원)"""
-    # offset: 건너뛸 개수, limit: 가져올 최대 개수
-    posts = db.query(Post).offset(skip).limit(limit).all()
-    return posts
+def get_posts(
+    skip: int = 0,
+    limit: int = 10,
+    mode: Literal["rows", "orm"] = "rows",
+    db: Session = Depends(get_db)
+):
+    """
+    게시글 목록을 조회합니다 (페이지네이션 지원)
+
+    mode=rows(기본값): 필요한 컬럼만 튜플로 조회해 바로 JSON 바이트로 만듭니다.
+        ORM 객체 생성(identity map)과 response_model 재검증을 건너뜁니다.
+    mode=orm: Post 객체를 불러와 PostResponse로 변환합니다 (비교용).
+    두 방식의 응답 바이트는 같습니다.
+    """
+    if mode == "orm":
+        # offset: 건너뛸 개수, limit: 가져올 최대 개수
+        posts = db.query(Post).offset(skip).limit(limit).all()
+        return posts
+
+    rows = db.execute(
+        select(*POST_LIST_COLUMNS).offset(skip).limit(limit)
+    ).all()
+    return Response(content=encode_post_rows(rows), media_type="application/json")
+
+
+@app.get("/posts/search", response_model=PostSearchResponse)
+def search_posts(
+    q: str = Query(min_length=1, max_length=200),
+    limit: int = Query(10, ge=1, le=100),
+    cursor: str | None = None,
+    db: Session = Depends(get_db)
+):
+    """
+    제목/내용 전문 검색 (bm25 관련도순, 점수가 같으면 id순).
+
+    OFFSET 대신 마지막 결과의 (score, id)를 cursor로 넘겨 다음 페이지를 가져옵니다.
+    bm25 점수는 낮을수록 관련도가 높습니다.
+    """
+    match = to_match_query(q)
+    if not match:
+        return {"items": [], "next_cursor": None}
+    after_score, after_id = decode_cursor(cursor) if cursor else (float("-inf"), 0)
+
+    # 1단계: 관련도순 페이지의 (id, score)만 계산
+    page = db.execute(text("""
+        SELECT id, score FROM (
+            SELECT rowid AS id, bm25(posts_fts) AS score
+            FROM posts_fts WHERE posts_fts MATCH :match
+        )
+        WHERE score > :after_score OR (score = :after_score AND id > :after_id)
+        ORDER BY score, id
+        LIMIT :limit
+    """), {"match": match, "after_score": after_score, "after_id": after_id,
+           "limit": limit + 1}).all()
+    has_more = len(page) > limit
+    page = page[:limit]
+    if not page:
+        return {"items": [], "next_cursor": None}
+
+    # 2단계: 페이지에 포함된 게시글만 강조 표시/스니펫 생성
+    ids = ",".join(str(row.id) for row in page)
+    highlighted = {
+        row.id: row for row in db.execute(text(f"""
+            SELECT rowid AS id,
+                   highlight(posts_fts, 0, '<b>', '</b>') AS title,
+                   snippet(posts_fts, 1, '<b>', '</b>', '…', 16) AS snippet
+            FROM posts_fts WHERE posts_fts MATCH :match AND rowid IN ({ids})
+        """), {"match": match})
+    }
+    items = [
+        {"id": row.id, "title": highlighted[row.id].title,
+         "snippet": highlighted[row.id].snippet, "score": row.score}
+        for row in page
+    ]
+    last = page[-1]
+    return {
+        "items": items,
+        "next_cursor": encode_cursor(last.score, last.id) if has_more else None,
+    }
 
 
 @app.get("/posts/{post_id}", response_model=PostResponse)
 def get_post(post_id: int, db: Session = Depends(get_db)):
-    """특정 게시글을 조회합니다"""
-    post = db.query(Post).filter(Post.id == post_id).first()
-    # 게시글이 없으면 404 에러
-    if post is None:
-        raise HTTPException(status_code=404, detail="게시글을 찾을 수 없습니다")
-    return post
+    """특정 게시글을 조회합니다 (직렬화된 응답을 캐시에서 먼저 찾음)"""
+    body = post_cache.get(post_id)
+    if body is None:
+        token = post_cache.get_token()
+        post = db.query(Post).filter(Post.id == post_id).first()
+        # 게시글이 없으면 404 에러
+        if post is None:
+            raise HTTPException(status_code=404, detail="게시글을 찾을 수 없습니다")
+        body = PostResponse.model_validate(post).model_dump_json().encode()
+        post_cache.put(post_id, body, token)
+    # 이미 검증/직렬화된 바이트이므로 response_model 변환 없이 그대로 반환
+    return Response(content=body, media_type="application/json")
+
+
+@app.get("/diagnostics/db")
+def get_db_diagnostics():
+    """커넥션 풀 상태, 경로별 DB 사용량 합계, 느린 쿼리 로그 (풀 고갈 진단용)
+
+    느린 쿼리의 바인딩 파라미터는 SLOW_QUERY_LOG_PARAMS=1이 아니면 가려서 보여 줍니다.
+    """
+    return db_metrics.snapshot()
+
+
+@app.get("/cache/stats")
+def get_cache_stats():
+    """게시글 캐시 적중/미스 통계 (모니터링용)"""
+    return post_cache.stats()
 
 
 @app.put("/posts/{post_id}", response_model=PostResponse)
@@ -118,31 +805,32 @@ def update_post(
     db: Session = Depends(get_db)
 ):
     """게시글을 수정합니다"""
-    # 기존 게시글 조회
-    db_post = db.query(Post).filter(Post.id == post_id).first()
-    if db_post is None:
+    # 조회 → 수정 → commit → refresh 대신 UPDATE ... RETURNING 한 번으로 처리
+    # (SQLite 3.35 이상) 수정된 행이 없으면 게시글이 없는 것입니다.
+    row = db.execute(
+        update(Post)
+        .where(Post.id == post_id)
+        .values(title=post_update.title, content=post_update.content)
+        .returning(Post.id, Post.title, Post.content, Post.is_published)
+    ).first()
+    if row is None:
         raise HTTPException(status_code=404, detail="게시글을 찾을 수 없습니다")
 
-    # 속성 업데이트 (SQLAlchemy가 변경을 자동 추적)
-    db_post.title = post_update.title
-    db_post.content = post_update.content
-
-    # 변경사항을 DB에 반영
     db.commit()
-    db.refresh(db_post)
-    return db_post
+    post_cache.invalidate(post_id)
+    return row._mapping
 
 
 @app.delete("/posts/{post_id}", status_code=204)
 def delete_post(post_id: int, db: Session = Depends(get_db)):
     """게시글을 삭제합니다"""
-    db_post = db.query(Post).filter(Post.id == post_id).first()
-    if db_post is None:
+    # 조회 없이 DELETE 한 번 실행하고, 삭제된 행 수(rowcount)로 404를 판단
+    result = db.execute(delete(Post).where(Post.id == post_id))
+    if result.rowcount == 0:
         raise HTTPException(status_code=404, detail="게시글을 찾을 수 없습니다")
 
-    # 세션에서 객체를 삭제하고 DB에 반영
-    db.delete(db_post)
     db.commit()
+    post_cache.invalidate(post_id)
     return None
 
 
@@ -150,86 +838,318 @@ def delete_post(post_id: int, db: Session = Depends(get_db)):
 # 테스트 코드
 # ============================================================
 if __name__ == "__main__":
-    from fastapi.testclient import TestClient
+    # 인메모리 DB에 스키마를 한 번만 만들고, 테스트마다 SAVEPOINT 안에서 실행 후 롤백
+    harness = RollbackTestHarness(app, get_db, Base.metadata, resets=[post_cache.clear])
 
-    # 인메모리 DB로 테스트
-    test_engine = create_engine(
-        "sqlite:///:memory:",
-        connect_args={"check_same_thread": False}
-    )
-    TestSessionLocal = sessionmaker(
-        autocommit=False, autoflush=False, bind=test_engine
-    )
-    Base.metadata.create_all(bind=test_engine)
-
-    def override_get_db():
-        db = TestSessionLocal()
-        try:
-            yield db
-        finally:
-            db.close()
-
-    app.dependency_overrides[get_db] = override_get_db
-    client = TestClient(app)
+    def create_posts(client, *titles: str) -> list[int]:
+        return [
+            client.post("/posts", json={"title": title, "content": f"{title} 내용"}).json()["id"]
+            for title in titles
+        ]
 
     # 테스트 1: 게시글 생성
-    response = client.post(
-        "/posts",
-        json={"title": "첫 번째 글", "content": "안녕하세요!"}
-    )
-    assert response.status_code == 201, f"기대: 201, 실제: {response.status_code}"
-    data = response.json()
-    assert data["title"] == "첫 번째 글"
-    assert data["id"] is not None
-    assert data["is_published"] == False
-    print("✓ 게시글 생성 테스트 통과")
+    def test_create_post(client):
+        """게시글 생성"""
+        response = client.post(
+            "/posts",
+            json={"title": "첫 번째 글", "content": "안녕하세요!"}
+        )
+        assert response.status_code == 201, f"기대: 201, 실제: {response.status_code}"
+        data = response.json()
+        assert data["title"] == "첫 번째 글"
+        assert data["id"] is not None
+        assert data["is_published"] == False
 
-    # 추가 게시글 생성
-    client.post("/posts", json={"title": "두 번째 글", "content": "반갑습니다!"})
+    # 테스트 1-1: 게시글 대량 생성 (batch_size보다 많은 행을 여러 배치로 나눠 삽입)
+    def test_create_posts_bulk(client):
+        """게시글 대량 생성"""
+        response = client.post(
+            "/posts/bulk",
+            params={"batch_size": 2},
+            json=[{"title": f"대량 {i}", "content": f"내용 {i}"} for i in range(5)]
+        )
+        assert response.status_code == 201, f"기대: 201, 실제: {response.status_code}"
+        data = response.json()
+        assert data["count"] == 5
+        bulk_ids = data["ids"]
+        assert bulk_ids == sorted(bulk_ids) and len(set(bulk_ids)) == 5
+        for i, post_id in enumerate(bulk_ids):
+            assert client.get(f"/posts/{post_id}").json()["title"] == f"대량 {i}"
+        assert client.post("/posts/bulk", json=[]).json() == {"count": 0, "ids": []}
+        assert client.post("/posts/bulk", params={"batch_size": 0}, json=[]).status_code == 422
 
     # 테스트 2: 게시글 목록 조회
-    response = client.get("/posts")
-    assert response.status_code == 200
-    data = response.json()
-    assert len(data) == 2, f"기대: 2개, 실제: {len(data)}개"
-    print("✓ 게시글 목록 조회 테스트 통과")
+    def test_get_posts(client):
+        """게시글 목록 조회"""
+        create_posts(client, "첫 번째 글", "두 번째 글")
+        response = client.get("/posts")
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data) == 2, f"기대: 2개, 실제: {len(data)}개"
+
+    # 테스트 2-1: 행 직렬화 경로와 ORM 경로의 응답이 바이트 단위로 같은지 확인
+    def test_get_posts_rows_mode(client):
+        """게시글 목록 행 직렬화 경로"""
+        create_posts(client, "첫 번째 글", "두 번째 글", "세 번째 글")
+        for params in [{}, {"skip": 1}, {"limit": 1}, {"skip": 5}]:
+            rows_body = client.get("/posts", params=params).content
+            orm_body = client.get("/posts", params=params | {"mode": "orm"}).content
+            assert rows_body == orm_body, (rows_body, orm_body)
+        assert client.get("/posts", params={"mode": "fast"}).status_code == 422
 
     # 테스트 3: 게시글 상세 조회
-    response = client.get("/posts/1")
-    assert response.status_code == 200
-    data = response.json()
-    assert data["title"] == "첫 번째 글"
-    print("✓ 게시글 상세 조회 테스트 통과")
+    def test_get_post(client):
+        """게시글 상세 조회"""
+        create_posts(client, "첫 번째 글")
+        response = client.get("/posts/1")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["title"] == "첫 번째 글"
 
     # 테스트 4: 존재하지 않는 게시글 조회
-    response = client.get("/posts/999")
-    assert response.status_code == 404, f"기대: 404, 실제: {response.status_code}"
-    print("✓ 존재하지 않는 게시글 조회 시 404 테스트 통과")
-
-    # 테스트 5: 게시글 수정
-    response = client.put(
-        "/posts/1",
-        json={"title": "수정된 제목", "content": "수정된 내용"}
-    )
-    assert response.status_code == 200
-    data = response.json()
-    assert data["title"] == "수정된 제목"
-    assert data["content"] == "수정된 내용"
-    print("✓ 게시글 수정 테스트 통과")
-
-    # 테스트 6: 게시글 삭제
-    response = client.delete("/posts/1")
-    assert response.status_code == 204, f"기대: 204, 실제: {response.status_code}"
-    print("✓ 게시글 삭제 테스트 통과")
-
-    # 테스트 7: 삭제된 게시글 조회
-    response = client.get("/posts/1")
-    assert response.status_code == 404
-    print("✓ 삭제된 게시글 조회 시 404 테스트 통과")
-
-    # 정리
-    import os
-    if os.path.exists("./test_crud.db"):
-        os.remove("./test_crud.db")
+    def test_get_post_not_found(client):
+        """존재하지 않는 게시글 조회 시 404"""
+        response = client.get("/posts/999")
+        assert response.status_code == 404, f"기대: 404, 실제: {response.status_code}"
+
+    # 테스트 5: 게시글 수정 (수정 결과가 DB에 반영되었는지, is_published 포함 확인)
+    def test_update_post(client):
+        """게시글 수정"""
+        [post_id] = create_posts(client, "첫 번째 글")
+        response = client.put(
+            f"/posts/{post_id}",
+            json={"title": "수정된 제목", "content": "수정된 내용"}
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["title"] == "수정된 제목"
+        assert data["content"] == "수정된 내용"
+        assert client.get(f"/posts/{post_id}").json() == {
+            "id": post_id, "title": "수정된 제목", "content": "수정된 내용", "is_published": False
+        }
+
+    # 테스트 5-1: 존재하지 않는 게시글 수정/삭제
+    def test_update_delete_not_found(client):
+        """존재하지 않는 게시글 수정/삭제 시 404"""
+        response = client.put("/posts/999", json={"title": "없음", "content": "없음"})
+        assert response.status_code == 404, f"기대: 404, 실제: {response.status_code}"
+        response = client.delete("/posts/999")
+        assert response.status_code == 404, f"기대: 404, 실제: {response.status_code}"
+
+    # 테스트 6, 7: 게시글 삭제 후 조회
+    def test_delete_post(client):
+        """게시글 삭제 및 삭제된 게시글 조회 시 404"""
+        [post_id] = create_posts(client, "첫 번째 글")
+        response = client.delete(f"/posts/{post_id}")
+        assert response.status_code == 204, f"기대: 204, 실제: {response.status_code}"
+        response = client.get(f"/posts/{post_id}")
+        assert response.status_code == 404
+
+    # 테스트 8: 게시글 캐시 적중/무효화
+    def test_post_cache(client):
+        """게시글 캐시 적중 및 수정/삭제 시 무효화"""
+        [post_id] = create_posts(client, "캐시 글")
+        first = client.get(f"/posts/{post_id}")
+        second = client.get(f"/posts/{post_id}")
+        assert first.content == second.content
+        assert second.json() == {
+            "id": post_id, "title": "캐시 글", "content": "캐시 글 내용", "is_published": False
+        }
+        stats = client.get("/cache/stats").json()
+        assert stats["hits"] == 1 and stats["misses"] == 1 and stats["size"] == 1
+
+        client.put(f"/posts/{post_id}", json={"title": "캐시 글", "content": "수정"})
+        assert client.get(f"/posts/{post_id}").json()["content"] == "수정"
+        client.delete(f"/posts/{post_id}")
+        assert client.get(f"/posts/{post_id}").status_code == 404
+        stats = client.get("/cache/stats").json()
+        assert stats["invalidations"] == 2 and stats["size"] == 0
+
+    # 캐시 단위 테스트: TTL 만료, LRU 제거, 낡은 값 저장 방지
+    def test_post_cache_policy(client):
+        """캐시 TTL/LRU/낡은 값 방지"""
+        now = [0.0]
+        cache = PostCache(max_size=2, ttl=10, clock=lambda: now[0])
+        cache.put(1, b"1", cache.get_token())
+        cache.put(2, b"2", cache.get_token())
+        assert cache.get(1) == b"1"  # 1이 가장 최근 사용
+        cache.put(3, b"3", cache.get_token())  # 가장 오래 안 쓴 2가 제거됨
+        assert cache.get(2) is None and cache.evictions == 1
+        now[0] = 11
+        assert cache.get(1) is None and cache.get(3) is None  # TTL 만료
+        token = cache.get_token()
+        cache.invalidate(1)  # DB를 읽는 사이에 수정이 일어난 상황
+        cache.put(1, b"stale", token)
+        assert cache.get(1) is None
+        assert PostCache(max_size=0).stats()["size"] == 0
+
+    # 테스트 9: 전문 검색 (트리거 동기화, 관련도순, 강조, cursor 페이지네이션)
+    def create_search_posts(client) -> list[int]:
+        return client.post("/posts/bulk", json=[
+            {"title": "FastAPI 입문", "content": "FastAPI로 API 서버를 만듭니다"},
+            {"title": "SQLite 튜닝", "content": "FastAPI 앱에서 SQLite WAL 모드를 켭니다"},
+            {"title": "FastAPI FastAPI", "content": "FastAPI 의존성 주입과 FastAPI 라우터"},
+            {"title": "파이썬 기초", "content": "안녕하세요, 파이썬을 배웁니다"},
+        ]).json()["ids"]
+
+    def test_search_ranking(client):
+        """전문 검색 관련도순/강조"""
+        search_ids = create_search_posts(client)
+        data = client.get("/posts/search", params={"q": "fastapi"}).json()
+        assert [hit["id"] for hit in data["items"]][0] == search_ids[2]  # 가장 많이 등장
+        assert sorted(hit["id"] for hit in data["items"]) == sorted(search_ids[:3])
+        assert data["items"][0]["title"] == "<b>FastAPI</b> <b>FastAPI</b>"
+        assert all("<b>FastAPI" in hit["snippet"] for hit in data["items"])
+        assert data["next_cursor"] is None
+
+    def test_search_pagination(client):
+        """전문 검색 cursor 페이지네이션"""
+        create_search_posts(client)
+        pages, cursor = [], None
+        while True:
+            params = {"q": "fastapi", "limit": 1} | ({"cursor": cursor} if cursor else {})
+            data = client.get("/posts/search", params=params).json()
+            pages.extend(hit["id"] for hit in data["items"])
+            cursor = data["next_cursor"]
+            if cursor is None:
+                break
+        full = client.get("/posts/search", params={"q": "fastapi"}).json()["items"]
+        assert pages == [hit["id"] for hit in full]
+        assert client.get("/posts/search", params={"q": "x", "cursor": "oops"}).status_code == 400
+
+    def test_search_index_sync(client):
+        """수정/삭제 후 검색 색인 동기화"""
+        search_ids = create_search_posts(client)
+        assert [h["id"] for h in client.get("/posts/search", params={"q": "안녕"}).json()["items"]] \
+            == [search_ids[3]]  # 접두어 검색
+        assert client.get("/posts/search", params={"q": '"AND OR ('}).json()["items"] == []
+        client.put(f"/posts/{search_ids[3]}", json={"title": "러스트 기초", "content": "러스트를 배웁니다"})
+        assert client.get("/posts/search", params={"q": "파이썬"}).json()["items"] == []
+        assert len(client.get("/posts/search", params={"q": "러스트"}).json()["items"]) == 1
+        client.delete(f"/posts/{search_ids[0]}")
+        assert search_ids[0] not in [
+            h["id"] for h in client.get("/posts/search", params={"q": "fastapi"}).json()["items"]
+        ]
+
+    # 하네스 테스트: 이전 테스트의 데이터가 롤백되어 남지 않는지 확인
+    def test_isolation(client):
+        """테스트 간 롤백 격리"""
+        assert client.get("/posts").json() == []
+        assert client.get("/posts/search", params={"q": "fastapi"}).json()["items"] == []
+        assert client.get("/cache/stats").json()["size"] == 0
+        # 첫 id가 다시 1부터 시작 (삽입도 롤백됨)
+        assert create_posts(client, "격리 확인") == [1]
+
+    # 스키마 준비: import 시에는 파일을 만들지 않고, lifespan에서 한 번 준비
+    def test_deferred_schema(client):
+        """import 시 DB 미접근 / lifespan 스키마 준비"""
+        import subprocess
+        import sys
+        import tempfile
+
+        def table_names(engine: Engine) -> set[str]:
+            with engine.connect() as conn:
+                return set(conn.execute(text(
+                    "SELECT name FROM sqlite_master WHERE type = 'table'"
+                )).scalars())
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "boot.db")
+            env = os.environ | {"DATABASE_URL": f"sqlite:///{path}"}
+            cwd = os.path.dirname(os.path.abspath(__file__))
+            subprocess.run([sys.executable, "-c", "import solution"], env=env, check=True, cwd=cwd)
+            assert not os.path.exists(path), "import만으로 DB 파일이 만들어지면 안 됩니다"
+
+            # with TestClient(app)는 lifespan을 실행 → 기본 엔진(DATABASE_URL)에 스키마 준비
+            subprocess.run(
+                [sys.executable, "-c",
+                 "from fastapi.testclient import TestClient\n"
+                 "import solution\n"
+                 "with TestClient(solution.app):\n"
+                 "    pass"],
+                env=env, check=True, cwd=cwd,
+            )
+            boot_engine = create_sqlite_engine(f"sqlite:///{path}")
+            assert {"posts", "posts_fts"} <= table_names(boot_engine)
+            assert os.path.exists(f"{path}.lock")
+
+            init_db(boot_engine)  # 이미 준비된 스키마에 다시 실행해도 안전
+            assert {"posts", "posts_fts"} <= table_names(boot_engine)
+            boot_engine.dispose()
+
+    # DB 계측: 실제 get_db 경로(파일 DB + QueuePool)로 요청을 보내 기록을 확인
+    def test_db_instrumentation(client):
+        """DB 계측 (요청당 SQL 수, 풀 대기/점유 시간, 느린 쿼리, 경로별 합계)"""
+        import tempfile
+        from fastapi.testclient import TestClient
+
+        with tempfile.TemporaryDirectory() as tmp:
+            metrics_engine = create_sqlite_engine(f"sqlite:///{os.path.join(tmp, 'metrics.db')}")
+            init_db(metrics_engine)
+            metrics = DBInstrumentation(
+                metrics_engine,
+                sessionmaker(autocommit=False, autoflush=False, bind=metrics_engine),
+                slow_query_ms=0,  # 모든 쿼리를 느린 쿼리 로그에 남김
+            )
+
+            def instrumented_get_db(request: Request):
+                with metrics.session(route_path(request)) as db:
+                    yield db
+
+            harness_override = app.dependency_overrides[get_db]
+            app.dependency_overrides[get_db] = instrumented_get_db
+            try:
+                metrics_client = TestClient(app)
+                post_id = metrics_client.post("/posts", json={"title": "계측", "content": "내용"}).json()["id"]
+                metrics_client.put(f"/posts/{post_id}", json={"title": "계측", "content": "수정"})
+                metrics_client.put("/posts/999", json={"title": "없음", "content": "없음"})
+                # 기본값: 바인딩 파라미터(사용자 데이터)는 가려서 기록
+                assert metrics.slow_queries and all(
+                    q["parameters"] == REDACTED for q in metrics.slow_queries
+                )
+                metrics.log_parameters = True
+                metrics_client.put("/posts/999", json={"title": "없음", "content": "없음"})
+            finally:
+                app.dependency_overrides[get_db] = harness_override
+
+            snapshot = metrics.snapshot()
+            routes = snapshot["routes"]
+            assert routes["/posts"]["requests"] == 1
+            assert routes["/posts"]["statements"] >= 2  # INSERT + refresh SELECT
+            assert routes["/posts/{post_id}"]["requests"] == 3
+            assert routes["/posts/{post_id}"]["statements"] == 3  # UPDATE ... RETURNING x 3
+            for totals in routes.values():
+                assert totals["checkout_ms"] > 0 and totals["checkout_wait_ms"] >= 0
+            assert snapshot["pool"]["class"] == "QueuePool"
+            assert snapshot["pool"]["checkedout"] == 0  # 모두 반납됨
+            slow = [q for q in snapshot["slow_queries"] if q["statement"].startswith("UPDATE")]
+            assert slow and "999" in slow[-1]["parameters"]
+            assert slow[-1]["route"] == "/posts/{post_id}"
+            metrics.reset()
+            assert metrics.snapshot()["routes"] == {}
+            metrics_engine.dispose()
+
+        data = client.get("/diagnostics/db").json()
+        assert {"pool", "routes", "slow_queries", "slow_query_ms"} <= set(data)
+
+    harness.run([
+        test_create_post,
+        test_create_posts_bulk,
+        test_get_posts,
+        test_get_posts_rows_mode,
+        test_get_post,
+        test_get_post_not_found,
+        test_update_post,
+        test_update_delete_not_found,
+        test_delete_post,
+        test_post_cache,
+        test_post_cache_policy,
+        test_search_ranking,
+        test_search_pagination,
+        test_search_index_sync,
+        test_isolation,
+        test_deferred_schema,
+        test_db_instrumentation,
+    ])
 
     print("\n모든 테스트를 통과했습니다!")
@@ -2,20 +2,63 @@
 # 실행: python solution.py
 # 필요 패키지: pip install fastapi sqlalchemy httpx
 
-from fastapi import FastAPI, Depends, HTTPException
-from sqlalchemy import create_engine, Column, Integer, String, ForeignKey
+import contextlib
+import os
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from fastapi import FastAPI, Depends, HTTPException, Query
+from sqlalchemy import (
+    create_engine, event, desc, func, select, Column, Index, Integer, String, ForeignKey,
+)
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker, declarative_base, Session, relationship
+from sqlalchemy.pool import StaticPool
 from pydantic import BaseModel, ConfigDict
 
 # ============================================================
 # 데이터베이스 설정
 # ============================================================
-SQLALCHEMY_DATABASE_URL = "sqlite:///./test_relations.db"
+# ── 엔진 팩토리 (sec01에서 학습한 내용) ──
+# 이 섹션에서 쓰는 safe / fast-wal 프로필만 옮겨 왔습니다 (bulk-load와 풀 크기 조정은 sec01).
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL,
-    connect_args={"check_same_thread": False}
-)
+DB_PROFILE = os.environ.get("DB_PROFILE", "safe")
+
+SQLITE_PROFILES = {
+    "safe": {"journal_mode": "DELETE", "synchronous": "FULL"},
+    "fast-wal": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": 256 * 1024 * 1024,
+        "cache_size": -64 * 1024,
+        "temp_store": "MEMORY",
+    },
+}
+
+
+def create_sqlite_engine(url: str, profile: str = DB_PROFILE) -> Engine:
+    """프로필의 PRAGMA를 연결마다 적용하는 SQLite 엔진 (인메모리 DB는 StaticPool)"""
+    pragmas = SQLITE_PROFILES[profile]
+    pool_args = {"poolclass": StaticPool} if url in ("sqlite://", "sqlite:///:memory:") else {}
+    engine = create_engine(url, connect_args={"check_same_thread": False}, **pool_args)
+
+    @event.listens_for(engine, "connect")
+    def apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+    return engine
+
+
+SQLALCHEMY_DATABASE_URL = os.environ.get("DATABASE_URL", "sqlite:///./test_relations.db")
+
+engine = create_sqlite_engine(SQLALCHEMY_DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
@@ -53,6 +96,10 @@ class Post(Base):
     # back_populates="posts"는 User 모델의 'posts' 속성과 양방향으로 연결
     author = relationship("User", back_populates="posts")
 
+    # author_id 인덱스: 작성자별 게시글 수(COUNT ... GROUP BY author_id)를
+    # 테이블을 읽지 않고 인덱스만으로 계산할 수 있습니다 (covering index).
+    __table_args__ = (Index("ix_posts_author_id", "author_id"),)
+
 
 # ============================================================
 # TODO 2: Pydantic 스키마 정의
@@ -93,10 +140,91 @@ class UserWithPosts(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class UserPostCount(BaseModel):
+    """사용자별 게시글 수 응답 스키마"""
+    user_id: int
+    username: str
+    post_count: int
+
+
+# ============================================================
+# 집계 쿼리 (SQL에서 GROUP BY / COUNT로 계산)
+# ============================================================
+
+def post_counts_query(after_id: int, limit: int):
+    """
+    사용자별 게시글 수 (id순, after_id 다음부터 limit명).
+    사용자마다 ix_posts_author_id에서 개수만 세므로 게시글이 없는 사용자도 0으로 나옵니다.
+    """
+    post_count = (
+        select(func.count())
+        .where(Post.author_id == User.id)
+        .correlate(User)
+        .scalar_subquery()
+    )
+    return (
+        select(User.id.label("user_id"), User.username, post_count.label("post_count"))
+        .where(User.id > after_id)
+        .order_by(User.id)
+        .limit(limit)
+    )
+
+
+def top_authors_query(limit: int):
+    """게시글이 많은 작성자 순 (같으면 id순) 상위 limit명"""
+    counts = (
+        select(Post.author_id, func.count().label("post_count"))
+        .group_by(Post.author_id)
+        .order_by(desc("post_count"), Post.author_id)
+        .limit(limit)
+        .subquery("counts")
+    )
+    return (
+        select(User.id.label("user_id"), User.username, counts.c.post_count)
+        .join(counts, counts.c.author_id == User.id)
+        .order_by(counts.c.post_count.desc(), User.id)
+    )
+
+
 # ============================================================
 # 테이블 생성 및 의존성
 # ============================================================
-Base.metadata.create_all(bind=engine)
+# ── 지연 스키마 준비 (sec02에서 학습한 내용) ──
+# import 시에는 DB에 접근하지 않고, lifespan에서 파일 잠금을 잡고 create_all을 실행합니다.
+
+@contextlib.contextmanager
+def file_lock(path: str):
+    """프로세스 간 배타 잠금 (POSIX: fcntl, Windows: msvcrt)"""
+    with open(path, "a+b") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        else:
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def init_db() -> None:
+    """스키마를 준비합니다 (파일 DB는 워커끼리 한 번에 하나씩)"""
+    database = engine.url.database
+    if not database or database == ":memory:":
+        Base.metadata.create_all(bind=engine)
+        return
+    with file_lock(f"{database}.lock"):
+        Base.metadata.create_all(bind=engine)
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app: FastAPI):
+    """서버 시작 시 스키마 준비"""
+    init_db()
+    yield
 
 
 def get_db():
@@ -108,7 +236,54 @@ def get_db():
         db.close()
 
 
-app = FastAPI()
+# ── 테스트 하네스 (sec02에서 학습한 내용) ──
+# 스키마는 한 번만 만들고, 테스트마다 SAVEPOINT 안에서 실행한 뒤 롤백
+
+class RollbackTestHarness:
+    """인메모리 DB 하나로 테스트마다 트랜잭션을 열고, 끝나면 롤백합니다."""
+
+    def __init__(self, app: FastAPI, get_db, metadata):
+        self.app = app
+        self.get_db = get_db
+        self.engine = create_sqlite_engine("sqlite:///:memory:")
+
+        # pysqlite가 SAVEPOINT 전에 BEGIN을 보내도록 트랜잭션 시작을 직접 처리합니다.
+        @event.listens_for(self.engine, "connect")
+        def disable_driver_transactions(dbapi_connection, connection_record):
+            dbapi_connection.isolation_level = None
+
+        @event.listens_for(self.engine, "begin")
+        def emit_begin(connection):
+            connection.exec_driver_sql("BEGIN")
+
+        metadata.create_all(bind=self.engine)
+
+    def run(self, tests) -> None:
+        """테스트 함수마다 get_db를 SAVEPOINT 세션으로 바꿔 실행하고 롤백합니다."""
+        from fastapi.testclient import TestClient
+
+        for test in tests:
+            connection = self.engine.connect()
+            outer = connection.begin()
+
+            def override_get_db():
+                db = Session(bind=connection, join_transaction_mode="create_savepoint", autoflush=False)
+                try:
+                    yield db
+                finally:
+                    db.close()
+
+            self.app.dependency_overrides[self.get_db] = override_get_db
+            try:
+                test(TestClient(self.app))  # with 없이: lifespan(운영 DB 준비)은 실행하지 않음
+            finally:
+                self.app.dependency_overrides.pop(self.get_db, None)
+                outer.rollback()
+                connection.close()
+            print(f"✓ {test.__doc__} 테스트 통과")
+
+
+app = FastAPI(lifespan=lifespan)
 
 
 # ============================================================
@@ -152,6 +327,29 @@ def create_post_for_user(
     return db_post
 
 
+@app.get("/stats/post-counts", response_model=list[UserPostCount])
+def get_post_counts(
+    after_id: int = 0,
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db)
+):
+    """
+    사용자별 게시글 수를 조회합니다.
+    user.posts 컬렉션을 불러오지 않고 SQL에서 개수만 셉니다.
+    다음 페이지는 마지막 user_id를 after_id로 넘겨 요청합니다.
+    """
+    return db.execute(post_counts_query(after_id, limit)).mappings().all()
+
+
+@app.get("/stats/top-authors", response_model=list[UserPostCount])
+def get_top_authors(
+    limit: int = Query(10, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    """게시글을 가장 많이 쓴 작성자 순위를 조회합니다"""
+    return db.execute(top_authors_query(limit)).mappings().all()
+
+
 @app.get("/users/{user_id}", response_model=UserWithPosts)
 def get_user_with_posts(user_id: int, db: Session = Depends(get_db)):
     """사용자 정보와 해당 사용자의 게시글 목록을 함께 조회합니다"""
@@ -167,89 +365,144 @@ def get_user_with_posts(user_id: int, db: Session = Depends(get_db)):
 # 테스트 코드
 # ============================================================
 if __name__ == "__main__":
-    from fastapi.testclient import TestClient
-
-    # 인메모리 DB로 테스트
-    test_engine = create_engine(
-        "sqlite:///:memory:",
-        connect_args={"check_same_thread": False}
-    )
-    TestSessionLocal = sessionmaker(
-        autocommit=False, autoflush=False, bind=test_engine
-    )
-    Base.metadata.create_all(bind=test_engine)
-
-    def override_get_db():
-        db = TestSessionLocal()
-        try:
-            yield db
-        finally:
-            db.close()
-
-    app.dependency_overrides[get_db] = override_get_db
-    client = TestClient(app)
+    # 인메모리 DB에 스키마를 한 번만 만들고, 테스트마다 SAVEPOINT 안에서 실행 후 롤백
+    harness = RollbackTestHarness(app, get_db, Base.metadata)
+
+    def create_user(client, username: str = "hong") -> int:
+        response = client.post(
+            "/users",
+            json={"username": username, "email": f"{username}@example.com"}
+        )
+        return response.json()["id"]
+
+    def create_post(client, user_id: int, title: str):
+        return client.post(
+            f"/users/{user_id}/posts",
+            json={"title": title, "content": f"{title} 내용"}
+        )
 
     # 테스트 1: 사용자 생성
-    response = client.post(
-        "/users",
-        json={"username": "hong", "email": "hong@example.com"}
-    )
-    assert response.status_code == 201, f"기대: 201, 실제: {response.status_code}"
-    user_data = response.json()
-    assert user_data["username"] == "hong"
-    assert user_data["id"] is not None
-    user_id = user_data["id"]
-    print("✓ 사용자 생성 테스트 통과")
-
-    # 테스트 2: 게시글 생성 (사용자에게 연결)
-    response = client.post(
-        f"/users/{user_id}/posts",
-        json={"title": "첫 번째 글", "content": "안녕하세요!"}
-    )
-    assert response.status_code == 201, f"기대: 201, 실제: {response.status_code}"
-    post_data = response.json()
-    assert post_data["title"] == "첫 번째 글"
-    assert post_data["author_id"] == user_id
-    print("✓ 게시글 생성 테스트 통과 (게시글 1)")
-
-    # 테스트 3: 두 번째 게시글 생성
-    response = client.post(
-        f"/users/{user_id}/posts",
-        json={"title": "두 번째 글", "content": "반갑습니다!"}
-    )
-    assert response.status_code == 201
-    print("✓ 게시글 생성 테스트 통과 (게시글 2)")
+    def test_create_user(client):
+        """사용자 생성"""
+        response = client.post(
+            "/users",
+            json={"username": "hong", "email": "hong@example.com"}
+        )
+        assert response.status_code == 201, f"기대: 201, 실제: {response.status_code}"
+        user_data = response.json()
+        assert user_data["username"] == "hong"
+        assert user_data["id"] is not None
+
+    # 테스트 2, 3: 게시글 생성 (사용자에게 연결)
+    def test_create_post_for_user(client):
+        """게시글 생성 (사용자에게 연결)"""
+        user_id = create_user(client)
+        response = client.post(
+            f"/users/{user_id}/posts",
+            json={"title": "첫 번째 글", "content": "안녕하세요!"}
+        )
+        assert response.status_code == 201, f"기대: 201, 실제: {response.status_code}"
+        post_data = response.json()
+        assert post_data["title"] == "첫 번째 글"
+        assert post_data["author_id"] == user_id
+
+        response = client.post(
+            f"/users/{user_id}/posts",
+            json={"title": "두 번째 글", "content": "반갑습니다!"}
+        )
+        assert response.status_code == 201
 
     # 테스트 4: 존재하지 않는 사용자에게 게시글 생성
-    response = client.post(
-        "/users/999/posts",
-        json={"title": "실패할 글", "content": "이 글은 생성되면 안 됩니다"}
-    )
-    assert response.status_code == 404, f"기대: 404, 실제: {response.status_code}"
-    print("✓ 존재하지 않는 사용자에게 게시글 생성 시 404 테스트 통과")
-
-    # 테스트 5: 사용자 + 게시글 목록 조회
-    response = client.get(f"/users/{user_id}")
-    assert response.status_code == 200
-    data = response.json()
-    assert data["username"] == "hong"
-    assert len(data["posts"]) == 2, f"기대: 2개, 실제: {len(data['posts'])}개"
-    print("✓ 사용자 + 게시글 조회 테스트 통과")
-
-    # 테스트 6: 게시글의 author_id 확인
-    for post in data["posts"]:
-        assert post["author_id"] == user_id, \
-            f"기대: author_id={user_id}, 실제: {post['author_id']}"
-    print("✓ 게시글에 author_id가 올바르게 설정됨")
+    def test_create_post_user_not_found(client):
+        """존재하지 않는 사용자에게 게시글 생성 시 404"""
+        response = client.post(
+            "/users/999/posts",
+            json={"title": "실패할 글", "content": "이 글은 생성되면 안 됩니다"}
+        )
+        assert response.status_code == 404, f"기대: 404, 실제: {response.status_code}"
+
+    # 테스트 5, 6: 사용자 + 게시글 목록 조회, 게시글의 author_id 확인
+    def test_get_user_with_posts(client):
+        """사용자 + 게시글 조회 (author_id 확인)"""
+        user_id = create_user(client)
+        create_post(client, user_id, "첫 번째 글")
+        create_post(client, user_id, "두 번째 글")
+        response = client.get(f"/users/{user_id}")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["username"] == "hong"
+        assert len(data["posts"]) == 2, f"기대: 2개, 실제: {len(data['posts'])}개"
+        for post in data["posts"]:
+            assert post["author_id"] == user_id, \
+                f"기대: author_id={user_id}, 실제: {post['author_id']}"
 
     # 테스트 7: 존재하지 않는 사용자 조회
-    response = client.get("/users/999")
-    assert response.status_code == 404, f"기대: 404, 실제: {response.status_code}"
-    print("✓ 존재하지 않는 사용자 조회 시 404 테스트 통과")
-
-    # 정리
-    import os
-    if os.path.exists("./test_relations.db"):
-        os.remove("./test_relations.db")
+    def test_get_user_not_found(client):
+        """존재하지 않는 사용자 조회 시 404"""
+        response = client.get("/users/999")
+        assert response.status_code == 404, f"기대: 404, 실제: {response.status_code}"
+
+    # 하네스 테스트: 이전 테스트의 데이터가 롤백되어 남지 않는지 확인
+    def test_isolation(client):
+        """테스트 간 롤백 격리"""
+        assert client.get("/users/1").status_code == 404
+        # 같은 username을 다시 만들어도 UNIQUE 제약에 걸리지 않음
+        assert create_user(client, "hong") == 1
+
+    # 테스트 8: 사용자별 게시글 수 / 상위 작성자 집계
+    def test_post_counts(client):
+        """사용자별 게시글 수 / 상위 작성자 집계"""
+        counts = {"kim": 3, "lee": 0, "park": 5, "choi": 3}
+        user_ids = {}
+        for username, count in counts.items():
+            user_ids[username] = create_user(client, username)
+            for i in range(count):
+                create_post(client, user_ids[username], f"{username} 글 {i}")
+
+        data = client.get("/stats/post-counts").json()
+        assert data == [
+            {"user_id": user_ids[name], "username": name, "post_count": count}
+            for name, count in counts.items()
+        ]
+        page = client.get("/stats/post-counts", params={"after_id": user_ids["lee"], "limit": 1}).json()
+        assert [row["username"] for row in page] == ["park"]
+
+        top = client.get("/stats/top-authors", params={"limit": 3}).json()
+        assert [(row["username"], row["post_count"]) for row in top] == [
+            ("park", 5), ("kim", 3), ("choi", 3),
+        ]
+        assert client.get("/stats/top-authors", params={"limit": 0}).status_code == 422
+
+    # 테스트 9: 집계 쿼리 실행 계획에 전체 테이블 스캔이 없는지 확인
+    def test_aggregate_query_plans(client):
+        """집계 쿼리 실행 계획 (전체 스캔 없음)"""
+        from sqlalchemy import text
+
+        plan_engine = create_sqlite_engine("sqlite:///:memory:")
+        Base.metadata.create_all(bind=plan_engine)
+        with plan_engine.connect() as conn:
+            for statement in (post_counts_query(0, 50), top_authors_query(10)):
+                sql = str(statement.compile(plan_engine, compile_kwargs={"literal_binds": True}))
+                plan = [row.detail for row in conn.execute(text("EXPLAIN QUERY PLAN " + sql))]
+                # 테이블을 처음부터 끝까지 읽는 단계는 "SCAN posts"/"SCAN users" (인덱스 없이)로 표시됨
+                full_scans = [
+                    detail for detail in plan
+                    if detail.split()[:2] in (["SCAN", "posts"], ["SCAN", "users"])
+                    and "COVERING INDEX" not in detail
+                ]
+                assert not full_scans, f"전체 스캔 발생: {plan}"
+                assert any("ix_posts_author_id" in detail for detail in plan), plan
+        plan_engine.dispose()
+
+    harness.run([
+        test_create_user,
+        test_create_post_for_user,
+        test_create_post_user_not_found,
+        test_get_user_with_posts,
+        test_get_user_not_found,
+        test_post_counts,
+        test_aggregate_query_plans,
+        test_isolation,
+    ])
 
     print("\n모든 테스트를 통과했습니다!")
@@ -0,0 +1,55 @@
+# 벤치마크: 사용자 쓰기 지연 시간 (전체 순회 이메일 검사 vs 이메일 인덱스)
+# 실행: python benchmark.py [사용자 수]
+
+import sys
+import time
+
+from solution import DuplicateError, UserCreate, UserRepository
+
+
+def scan_create(users: dict[int, dict], user: UserCreate, next_id: int) -> None:
+    """이전 방식: 모든 사용자를 순회하며 이메일 중복 검사 후 삽입"""
+    for existing_user in users.values():
+        if existing_user["email"] == user.email:
+            raise DuplicateError()
+    users[next_id] = {"id": next_id, "name": user.name, "email": user.email, "age": user.age}
+
+
+def measure(label: str, fn, repeat: int) -> None:
+    start = time.perf_counter()
+    for i in range(repeat):
+        fn(i)
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<28}: {elapsed / repeat * 1_000_000:>12,.1f} µs/op")
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+    print("=" * 50)
+    print(f"사용자 쓰기 지연 시간 벤치마크 (사용자 {n:,}명)")
+    print("=" * 50)
+
+    seed = [
+        {"id": i, "name": f"user{i}", "email": f"user{i}@example.com", "age": 30}
+        for i in range(1, n + 1)
+    ]
+    users = {user["id"]: dict(user) for user in seed}
+    repository = UserRepository(seed)
+
+    measure(
+        "create (전체 순회)",
+        lambda i: scan_create(users, UserCreate(name="new", email=f"scan{i}@example.com", age=20), n + 1 + i),
+        repeat=20,
+    )
+    measure(
+        "create (이메일 인덱스)",
+        lambda i: repository.create(UserCreate(name="new", email=f"new{i}@example.com", age=20)),
+        repeat=100_000,
+    )
+    measure(
+        "update (이메일 인덱스)",
+        lambda i: repository.update(i + 1, UserCreate(name="upd", email=f"upd{i}@example.com", age=21)),
+        repeat=100_000,
+    )
+    measure("delete (이메일 인덱스)", lambda i: repository.delete(i + 1), repeat=100_000)
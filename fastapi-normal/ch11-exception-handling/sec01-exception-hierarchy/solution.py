@@ -178,61 +178,114 @@ async def test_authorization():
 # 문제 2 해답: 도메인별 예외 활용
 # ============================================================
 
-# 가상 사용자 데이터
-fake_users_db: dict[int, dict] = {
-    1: {"id": 1, "name": "홍길동", "email": "hong@example.com", "age": 30},
-    2: {"id": 2, "name": "김철수", "email": "kim@example.com", "age": 25},
-}
-next_user_id = 3
-
-
 class UserCreate(BaseModel):
     name: str
     email: str
     age: int
 
 
-@app.post("/users", status_code=201)
-async def create_user(user: UserCreate):
-    """사용자 생성 - 이메일 중복 시 DuplicateError 발생"""
-    global next_user_id
+class UserRepository:
+    """인메모리 사용자 저장소.
+
+    id → 사용자 딕셔너리와 함께, 정규화된 이메일 → id 보조 해시 인덱스를 유지합니다.
+    이메일 중복 검사가 전체 사용자를 순회하지 않고 O(1)로 끝나며,
+    인덱스는 create / update / delete에서 항상 함께 갱신됩니다.
+    """
 
-    # 이메일 중복 검사
-    for existing_user in fake_users_db.values():
-        if existing_user["email"] == user.email:
+    def __init__(self, users: list[dict] | None = None):
+        self._users: dict[int, dict] = {}
+        self._email_index: dict[str, int] = {}
+        self._next_id = 1
+        for user in users or []:
+            self._check_email(user["email"])
+            self._store(user)
+            self._next_id = max(self._next_id, user["id"] + 1)
+
+    @staticmethod
+    def normalize_email(email: str) -> str:
+        """대소문자와 앞뒤 공백이 달라도 같은 이메일로 취급합니다."""
+        return email.strip().lower()
+
+    def _check_email(self, email: str, user_id: int | None = None) -> None:
+        owner_id = self._email_index.get(self.normalize_email(email))
+        if owner_id is not None and owner_id != user_id:
             raise DuplicateError(
                 error_code=ErrorCode.DUPLICATE_EMAIL,
                 message="이미 등록된 이메일입니다",
-                detail={"email": user.email},
+                detail={"email": email},
             )
 
-    new_user = {"id": next_user_id, "name": user.name, "email": user.email, "age": user.age}
-    fake_users_db[next_user_id] = new_user
-    next_user_id += 1
-    return new_user
+    def _store(self, user: dict) -> None:
+        self._users[user["id"]] = user
+        self._email_index[self.normalize_email(user["email"])] = user["id"]
+
+    def get(self, user_id: int) -> dict | None:
+        return self._users.get(user_id)
+
+    def create(self, user: UserCreate) -> dict:
+        """사용자 생성 - 이메일이 이미 있으면 DuplicateError"""
+        self._check_email(user.email)
+        new_user = {"id": self._next_id, "name": user.name, "email": user.email, "age": user.age}
+        self._store(new_user)
+        self._next_id += 1
+        return new_user
+
+    def update(self, user_id: int, user: UserCreate) -> dict:
+        """사용자 수정 - 다른 사용자가 같은 이메일을 쓰고 있으면 DuplicateError"""
+        self._check_email(user.email, user_id)
+        old_key = self.normalize_email(self._users[user_id]["email"])
+        del self._email_index[old_key]
+        updated = {"id": user_id, "name": user.name, "email": user.email, "age": user.age}
+        self._store(updated)
+        return updated
+
+    def delete(self, user_id: int) -> bool:
+        """사용자 삭제 - 삭제했으면 True, 없으면 False"""
+        user = self._users.pop(user_id, None)
+        if user is None:
+            return False
+        del self._email_index[self.normalize_email(user["email"])]
+        return True
+
+    def __len__(self) -> int:
+        return len(self._users)
+
+
+# 가상 사용자 데이터
+user_repository = UserRepository([
+    {"id": 1, "name": "홍길동", "email": "hong@example.com", "age": 30},
+    {"id": 2, "name": "김철수", "email": "kim@example.com", "age": 25},
+])
+
+
+def user_not_found(user_id: int) -> NotFoundException:
+    return NotFoundException(
+        error_code=ErrorCode.USER_NOT_FOUND,
+        message="사용자를 찾을 수 없습니다",
+        detail={"user_id": user_id},
+    )
+
+
+@app.post("/users", status_code=201)
+async def create_user(user: UserCreate):
+    """사용자 생성 - 이메일 중복 시 DuplicateError 발생"""
+    return user_repository.create(user)
 
 
 @app.get("/users/{user_id}")
 async def get_user(user_id: int):
     """사용자 조회 - 존재하지 않으면 NotFoundException 발생"""
-    if user_id not in fake_users_db:
-        raise NotFoundException(
-            error_code=ErrorCode.USER_NOT_FOUND,
-            message="사용자를 찾을 수 없습니다",
-            detail={"user_id": user_id},
-        )
-    return fake_users_db[user_id]
+    found = user_repository.get(user_id)
+    if found is None:
+        raise user_not_found(user_id)
+    return found
 
 
 @app.put("/users/{user_id}")
 async def update_user(user_id: int, user: UserCreate):
     """사용자 수정 - 존재하지 않으면 NotFoundException, 유효하지 않은 데이터면 CustomValidationError"""
-    if user_id not in fake_users_db:
-        raise NotFoundException(
-            error_code=ErrorCode.USER_NOT_FOUND,
-            message="사용자를 찾을 수 없습니다",
-            detail={"user_id": user_id},
-        )
+    if user_repository.get(user_id) is None:
+        raise user_not_found(user_id)
 
     # 비즈니스 로직 검증: 나이는 0보다 커야 함
     if user.age <= 0:
@@ -242,22 +295,15 @@ async def update_user(user_id: int, user: UserCreate):
             detail={"field": "age", "value": user.age},
         )
 
-    # 이메일 중복 검사 (자기 자신 제외)
-    for uid, existing_user in fake_users_db.items():
-        if uid != user_id and existing_user["email"] == user.email:
-            raise DuplicateError(
-                error_code=ErrorCode.DUPLICATE_EMAIL,
-                message="이미 등록된 이메일입니다",
-                detail={"email": user.email},
-            )
+    # 이메일 중복 검사 (자기 자신 제외)는 저장소의 이메일 인덱스가 처리
+    return user_repository.update(user_id, user)
+
 
-    fake_users_db[user_id] = {
-        "id": user_id,
-        "name": user.name,
-        "email": user.email,
-        "age": user.age,
-    }
-    return fake_users_db[user_id]
+@app.delete("/users/{user_id}", status_code=204)
+async def delete_user(user_id: int):
+    """사용자 삭제 - 존재하지 않으면 NotFoundException 발생"""
+    if not user_repository.delete(user_id):
+        raise user_not_found(user_id)
 
 
 # --- 테스트 ---
@@ -363,5 +409,24 @@ if __name__ == "__main__":
     assert data["error_code"] == "USER_NOT_FOUND"
     print("  [통과] 존재하지 않는 사용자 수정 테스트 (404)")
 
+    # 테스트 2-7: 이메일은 대소문자/공백을 무시하고 중복 검사
+    response = client.post("/users", json={"name": "홍길동3", "email": " HONG@Example.com ", "age": 40})
+    assert response.status_code == 409
+    assert response.json()["error_code"] == "DUPLICATE_EMAIL"
+    print("  [통과] 정규화된 이메일 중복 검사 테스트 (409)")
+
+    # 테스트 2-8: 수정/삭제 후 이메일 인덱스 일관성
+    response = client.put("/users/2", json={"name": "김철수", "email": "kim2@example.com", "age": 25})
+    assert response.status_code == 200
+    response = client.post("/users", json={"name": "박민수", "email": "kim@example.com", "age": 33})
+    assert response.status_code == 201  # 이전 이메일은 인덱스에서 해제됨
+    response = client.put("/users/1", json={"name": "홍길동", "email": "kim2@example.com", "age": 30})
+    assert response.status_code == 409  # 다른 사용자의 새 이메일은 사용 불가
+    assert client.delete("/users/2").status_code == 204
+    response = client.put("/users/1", json={"name": "홍길동", "email": "kim2@example.com", "age": 30})
+    assert response.status_code == 200  # 삭제된 사용자의 이메일은 다시 사용 가능
+    assert client.delete("/users/2").status_code == 404
+    print("  [통과] 수정/삭제 시 이메일 인덱스 일관성 테스트")
+
     print()
     print("모든 테스트를 통과했습니다!")
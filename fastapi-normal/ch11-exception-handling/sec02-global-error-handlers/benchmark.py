@@ -0,0 +1,87 @@
+# 벤치마크: 404 에러 응답 경로 (ErrorResponse + JSONResponse vs render_error)
+# 실행: python benchmark.py [요청 수]
+
+import sys
+import time
+from datetime import datetime
+
+from fastapi import Request
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+
+from solution import AppException, ErrorResponse, app, render_error
+
+
+async def pydantic_app_exception_handler(request: Request, exc: AppException):
+    """기존 방식: ErrorResponse 모델 생성 → model_dump() → JSONResponse 재직렬화"""
+    return JSONResponse(
+        status_code=exc.status_code,
+        content=ErrorResponse(
+            error_code=exc.error_code,
+            message=exc.message,
+            detail=exc.detail,
+            timestamp=datetime.now().isoformat(),
+        ).model_dump(),
+    )
+
+
+def bench_render(n: int) -> None:
+    """핸들러 렌더링 비용만 측정합니다 (HTTP 계층 제외)."""
+    exc = AppException(404, "USER_NOT_FOUND", "사용자를 찾을 수 없습니다", {"user_id": 999})
+
+    start = time.perf_counter()
+    for _ in range(n):
+        JSONResponse(
+            status_code=exc.status_code,
+            content=ErrorResponse(
+                error_code=exc.error_code,
+                message=exc.message,
+                detail=exc.detail,
+                timestamp=datetime.now().isoformat(),
+            ).model_dump(),
+        )
+    pydantic_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(n):
+        render_error(exc.status_code, exc.error_code, exc.message, exc.detail)
+    fast_elapsed = time.perf_counter() - start
+
+    print(f"  렌더링만  pydantic: {n / pydantic_elapsed:>12,.0f} ops/s")
+    print(f"  렌더링만  fast    : {n / fast_elapsed:>12,.0f} ops/s "
+          f"({pydantic_elapsed / fast_elapsed:.1f}x)")
+
+
+def bench_requests(n: int, handler) -> float:
+    """GET /users/999 (404) 를 n번 호출하고 requests/sec를 반환합니다."""
+    fast_handler = app.exception_handlers[AppException]
+    app.exception_handlers[AppException] = handler
+    app.middleware_stack = None  # 핸들러 교체 후 미들웨어 스택을 다시 만들게 함
+    try:
+        with TestClient(app) as client:
+            for _ in range(100):  # 워밍업
+                client.get("/users/999")
+            start = time.perf_counter()
+            for _ in range(n):
+                response = client.get("/users/999")
+            elapsed = time.perf_counter() - start
+            assert response.status_code == 404
+    finally:
+        app.exception_handlers[AppException] = fast_handler
+        app.middleware_stack = None
+    return n / elapsed
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000
+
+    print("=" * 50)
+    print(f"404 에러 응답 벤치마크 (n={n:,})")
+    print("=" * 50)
+
+    bench_render(n * 10)
+
+    pydantic_rps = bench_requests(n, pydantic_app_exception_handler)
+    fast_rps = bench_requests(n, app.exception_handlers[AppException])
+    print(f"  GET 404   pydantic: {pydantic_rps:>12,.0f} req/s")
+    print(f"  GET 404   fast    : {fast_rps:>12,.0f} req/s ({fast_rps / pydantic_rps:.2f}x)")
@@ -2,12 +2,13 @@
 # 실행: uvicorn solution:app --reload
 # 테스트: python solution.py
 
+import json
 from datetime import datetime
 from enum import Enum
 
 from fastapi import FastAPI, Request
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from fastapi.testclient import TestClient
 from pydantic import BaseModel
 
@@ -87,22 +88,77 @@ class ErrorResponse(BaseModel):
     timestamp: str
 
 
+# ============================================================
+# 에러 응답 고속 렌더링: (error_code, message)별 사전 인코딩 테이블
+# ============================================================
+# ErrorResponse(...).model_dump() 후 JSONResponse가 다시 json.dumps 하는 경로는
+# 404가 쏟아지는 상황(스크래핑 등)에서 CPU 대부분을 차지합니다.
+# error_code와 message는 raise 지점마다 고정이므로 JSON 앞부분을 bytes로 한 번만
+# 인코딩해 두고, 요청마다 달라지는 detail과 timestamp만 이어 붙입니다.
+# 결과 바이트는 JSONResponse(content=ErrorResponse(...).model_dump())와 동일합니다.
+
+# JSONResponse.render()와 같은 직렬화 옵션
+_json_encoder = json.JSONEncoder(ensure_ascii=False, allow_nan=False, separators=(",", ":"))
+
+# 동적으로 만든 message가 테이블을 무한히 키우지 않도록 상한을 둡니다.
+ERROR_PREFIX_TABLE_SIZE = 256
+_error_prefix_table: dict[tuple[str, str], bytes] = {}
+
+
+def _encode_json(value) -> bytes:
+    return _json_encoder.encode(value).encode("utf-8")
+
+
+def _error_prefix(error_code: str, message: str) -> bytes:
+    """`{"error_code":...,"message":...` 부분을 캐시에서 꺼내거나 새로 인코딩합니다."""
+    key = (error_code, message)
+    prefix = _error_prefix_table.get(key)
+    if prefix is None:
+        prefix = (
+            b'{"error_code":' + _encode_json(error_code)
+            + b',"message":' + _encode_json(message)
+        )
+        if len(_error_prefix_table) < ERROR_PREFIX_TABLE_SIZE:
+            _error_prefix_table[key] = prefix
+    return prefix
+
+
+def render_error(
+    status_code: int,
+    error_code: str,
+    message: str,
+    detail: dict | list | None = None,
+) -> Response:
+    """ErrorResponse와 같은 JSON을 Pydantic 왕복 없이 바로 만들어 반환합니다."""
+    body = (
+        _error_prefix(error_code, message)
+        + b',"detail":' + (b"null" if detail is None else _encode_json(detail))
+        + b',"timestamp":"' + datetime.now().isoformat().encode("ascii")
+        + b'"}'
+    )
+    return Response(content=body, status_code=status_code, media_type="application/json")
+
+
+# 라우트와 전역 핸들러가 사용하는 조합은 시작 시점에 미리 인코딩해 둡니다.
+for _code, _message in [
+    (ErrorCode.USER_NOT_FOUND, "사용자를 찾을 수 없습니다"),
+    (ErrorCode.DUPLICATE_EMAIL, "이미 등록된 이메일입니다"),
+    (ErrorCode.INTERNAL_ERROR, "내부 서버 오류가 발생했습니다"),
+]:
+    _error_prefix(_code, _message)
+
+
 app = FastAPI()
 
 
 # 전역 핸들러 1: AppException (비즈니스 에러)
 @app.exception_handler(AppException)
 async def app_exception_handler(request: Request, exc: AppException):
-    """AppException과 모든 하위 클래스를 ErrorResponse 형식으로 변환합니다."""
-    return JSONResponse(
-        status_code=exc.status_code,
-        content=ErrorResponse(
-            error_code=exc.error_code,
-            message=exc.message,
-            detail=exc.detail,
-            timestamp=datetime.now().isoformat(),
-        ).model_dump(),
-    )
+    """AppException과 모든 하위 클래스를 ErrorResponse 형식으로 변환합니다.
+
+    응답 본문은 ErrorResponse 스키마를 따르지만, render_error()로 직접 인코딩합니다.
+    """
+    return render_error(exc.status_code, exc.error_code, exc.message, exc.detail)
 
 
 # 전역 핸들러 2: RequestValidationError (입력 검증 에러)
@@ -124,15 +180,7 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
 @app.exception_handler(Exception)
 async def general_exception_handler(request: Request, exc: Exception):
     """모든 미처리 예외를 500 ErrorResponse로 변환합니다."""
-    return JSONResponse(
-        status_code=500,
-        content=ErrorResponse(
-            error_code="INTERNAL_ERROR",
-            message="내부 서버 오류가 발생했습니다",
-            detail=None,
-            timestamp=datetime.now().isoformat(),
-        ).model_dump(),
-    )
+    return render_error(500, ErrorCode.INTERNAL_ERROR, "내부 서버 오류가 발생했습니다")
 
 
 # 문제 1 테스트용 엔드포인트
@@ -313,5 +361,22 @@ if __name__ == "__main__":
         assert "timestamp" in data, f"{path}: timestamp 누락"
     print("  [통과] 모든 에러 응답이 일관된 ErrorResponse 구조")
 
+    # 테스트 2-6: 고속 렌더링 결과가 ErrorResponse 직렬화 결과와 바이트 단위로 동일
+    fast = render_error(409, ErrorCode.DUPLICATE_EMAIL, "이미 등록된 이메일입니다", {"email": "a@b.c"})
+    data = json.loads(fast.body)
+    expected = JSONResponse(
+        status_code=409,
+        content=ErrorResponse(
+            error_code=ErrorCode.DUPLICATE_EMAIL,
+            message="이미 등록된 이메일입니다",
+            detail={"email": "a@b.c"},
+            timestamp=data["timestamp"],
+        ).model_dump(),
+    )
+    assert fast.body == expected.body
+    assert fast.headers["content-type"] == expected.headers["content-type"]
+    assert (ErrorCode.DUPLICATE_EMAIL, "이미 등록된 이메일입니다") in _error_prefix_table
+    print("  [통과] render_error() 출력이 ErrorResponse + JSONResponse와 동일")
+
     print()
     print("모든 테스트를 통과했습니다!")
@@ -0,0 +1,107 @@
+# 벤치마크: 정상 요청(GET /health)에서의 미들웨어 오버헤드
+#   - 미들웨어 없음
+#   - @app.middleware("http") 두 겹 (이전 solution의 trace_id + error_logging)
+#   - ErrorBoundaryMiddleware 한 겹 (순수 ASGI)
+# 실행: python benchmark.py [요청 수]
+#
+# TestClient 오버헤드가 측정값을 가리지 않도록 ASGI 앱을 직접 호출합니다.
+
+import asyncio
+import sys
+import time
+import uuid
+
+from fastapi import FastAPI, Request
+
+from solution import ErrorBoundaryMiddleware, health, render_error
+
+SCOPE = {
+    "type": "http",
+    "asgi": {"version": "3.0"},
+    "http_version": "1.1",
+    "method": "GET",
+    "scheme": "http",
+    "path": "/health",
+    "raw_path": b"/health",
+    "root_path": "",
+    "query_string": b"",
+    "headers": [(b"host", b"testserver")],
+    "client": ("testclient", 50000),
+    "server": ("testserver", 80),
+}
+
+
+def build_bare_app() -> FastAPI:
+    bare = FastAPI()
+    bare.get("/health")(health)
+    return bare
+
+
+def build_http_middleware_app() -> FastAPI:
+    """이전 구조: try-except를 각자 가진 @app.middleware("http") 두 겹"""
+    legacy = build_bare_app()
+    legacy_error_log: list[dict] = []
+
+    @legacy.middleware("http")
+    async def error_logging_middleware(request: Request, call_next):
+        try:
+            response = await call_next(request)
+        except Exception:
+            trace_id = getattr(request.state, "trace_id", None)
+            response = render_error(500, "INTERNAL_ERROR", "내부 서버 오류가 발생했습니다", None, trace_id)
+        if response.status_code >= 400:
+            legacy_error_log.append({"trace_id": getattr(request.state, "trace_id", "unknown")})
+        return response
+
+    @legacy.middleware("http")
+    async def trace_id_middleware(request: Request, call_next):
+        trace_id = str(uuid.uuid4())
+        request.state.trace_id = trace_id
+        try:
+            response = await call_next(request)
+        except Exception:
+            response = render_error(500, "INTERNAL_ERROR", "내부 서버 오류가 발생했습니다", None, trace_id)
+        response.headers["X-Trace-ID"] = trace_id
+        return response
+
+    return legacy
+
+
+def build_boundary_app() -> FastAPI:
+    boundary = build_bare_app()
+    boundary.add_middleware(ErrorBoundaryMiddleware)
+    return boundary
+
+
+async def drive(asgi_app, n: int) -> float:
+    """ASGI 앱에 GET /health를 n번 보내고 요청당 평균 시간(µs)을 반환합니다."""
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    for _ in range(200):  # 워밍업 (미들웨어 스택 생성 포함)
+        await asgi_app(dict(SCOPE), receive, send)
+
+    start = time.perf_counter()
+    for _ in range(n):
+        await asgi_app(dict(SCOPE), receive, send)
+    return (time.perf_counter() - start) / n * 1_000_000
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+
+    print("=" * 50)
+    print(f"정상 요청 미들웨어 오버헤드 벤치마크 (n={n:,})")
+    print("=" * 50)
+
+    bare_us = asyncio.run(drive(build_bare_app(), n))
+    legacy_us = asyncio.run(drive(build_http_middleware_app(), n))
+    boundary_us = asyncio.run(drive(build_boundary_app(), n))
+
+    print(f"  {'미들웨어 없음':<24}: {bare_us:8.1f} µs/req")
+    print(f"  {'@app.middleware x 2':<24}: {legacy_us:8.1f} µs/req (+{legacy_us - bare_us:.1f} µs)")
+    print(f"  {'ErrorBoundaryMiddleware':<24}: {boundary_us:8.1f} µs/req (+{boundary_us - bare_us:.1f} µs)")
@@ -2,14 +2,19 @@
 # 실행: uvicorn solution:app --reload
 # 테스트: python solution.py
 
+import json
+import time
 import uuid
+from collections import Counter, deque
 from datetime import datetime
 from enum import Enum
 
-from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, Query, Request
+from fastapi.responses import Response
 from fastapi.testclient import TestClient
 from pydantic import BaseModel
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 
 # ============================================================
@@ -60,110 +65,266 @@ class ErrorResponse(BaseModel):
     trace_id: str | None = None
 
 
-# FastAPI 앱 생성
-app = FastAPI()
-
-
-# 테스트용 에러 로그 저장소 (문제 2에서 사용)
-error_log: list[dict] = []
-
-
 # ============================================================
-# 미들웨어 등록
+# 에러 응답 고속 렌더링 (sec02에서 학습)
 # ============================================================
-# @app.middleware("http") 데코레이터는 나중에 등록한 것이 바깥쪽(먼저 실행)입니다.
-# 등록 순서:
-#   1. error_logging_middleware (먼저 등록 = 안쪽)
-#   2. trace_id_middleware (나중에 등록 = 바깥쪽, 먼저 실행)
-# 실행 순서: trace_id(바깥) → error_logging(안쪽) → 라우트 핸들러
+# (error_code, message) 부분은 미리 bytes로 인코딩해 두고,
+# 요청마다 달라지는 detail, timestamp, trace_id만 이어 붙입니다.
 
+_json_encoder = json.JSONEncoder(ensure_ascii=False, allow_nan=False, separators=(",", ":"))
 
-# ============================================================
-# 문제 2 해답: 에러 로깅 미들웨어 (안쪽, 먼저 등록)
-# ============================================================
+ERROR_PREFIX_TABLE_SIZE = 256
+_error_prefix_table: dict[tuple[str, str], bytes] = {}
 
-@app.middleware("http")
-async def error_logging_middleware(request: Request, call_next):
-    """에러 로깅 미들웨어.
 
-    에러 응답(status_code >= 400)이 발생하면 error_log에 기록합니다.
+def _encode_json(value) -> bytes:
+    return _json_encoder.encode(value).encode("utf-8")
 
-    주의: @app.middleware("http") 미들웨어에서 call_next()는
-    등록된 exception_handler가 처리하지 못한 예외를 그대로 전파할 수 있습니다.
-    따라서 try-except로 예외를 직접 잡아서 에러 응답을 생성하고 로깅해야 합니다.
-    """
-    try:
-        response = await call_next(request)
-    except Exception:
-        # 미들웨어까지 전파된 예외 → 500 에러 응답 생성
-        trace_id = getattr(request.state, "trace_id", "unknown")
-        response = JSONResponse(
-            status_code=500,
-            content=ErrorResponse(
-                error_code="INTERNAL_ERROR",
-                message="내부 서버 오류가 발생했습니다",
-                detail=None,
-                timestamp=datetime.now().isoformat(),
-                trace_id=trace_id if trace_id != "unknown" else None,
-            ).model_dump(),
+
+def _error_prefix(error_code: str, message: str) -> bytes:
+    """`{"error_code":...,"message":...` 부분을 캐시에서 꺼내거나 새로 인코딩합니다."""
+    key = (error_code, message)
+    prefix = _error_prefix_table.get(key)
+    if prefix is None:
+        prefix = (
+            b'{"error_code":' + _encode_json(error_code)
+            + b',"message":' + _encode_json(message)
         )
+        if len(_error_prefix_table) < ERROR_PREFIX_TABLE_SIZE:
+            _error_prefix_table[key] = prefix
+    return prefix
+
+
+def render_error(
+    status_code: int,
+    error_code: str,
+    message: str,
+    detail: dict | list | None = None,
+    trace_id: str | None = None,
+) -> Response:
+    """ErrorResponse와 같은 JSON을 Pydantic 왕복 없이 바로 만들어 반환합니다."""
+    body = (
+        _error_prefix(error_code, message)
+        + b',"detail":' + (b"null" if detail is None else _encode_json(detail))
+        + b',"timestamp":"' + datetime.now().isoformat().encode("ascii")
+        + b'","trace_id":' + (b"null" if trace_id is None else _encode_json(trace_id))
+        + b"}"
+    )
+    return Response(content=body, status_code=status_code, media_type="application/json")
 
-    # 에러 응답(4xx, 5xx)인 경우 로깅
-    if response.status_code >= 400:
-        error_log.append({
-            "trace_id": getattr(request.state, "trace_id", "unknown"),
-            "method": request.method,
-            "path": request.url.path,
-            "status_code": response.status_code,
-            "error_type": f"HTTP_{response.status_code}",
-            "error_message": f"에러 응답 반환: {response.status_code}",
-        })
 
-    return response
+for _code, _message in [
+    (ErrorCode.USER_NOT_FOUND, "사용자를 찾을 수 없습니다"),
+    (ErrorCode.INTERNAL_ERROR, "내부 서버 오류가 발생했습니다"),
+]:
+    _error_prefix(_code, _message)
+
+
+# FastAPI 앱 생성
+app = FastAPI()
 
 
 # ============================================================
-# 문제 1 해답: trace_id 미들웨어 (바깥쪽, 나중에 등록)
+# 에러 이벤트 저장소: 링 버퍼 + 분 단위 집계 카운터
 # ============================================================
+# 리스트에 계속 append 하면 메모리가 무한히 늘어나고, 통계를 내려면 전체를
+# 훑어야 합니다. 원본 이벤트는 최근 maxlen개만 링 버퍼(deque)에 남기고,
+# (path, status_code, error_code) 카운터를 분 단위 버킷에 함께 쌓아 둡니다.
+# 집계 쿼리는 최대 window_minutes개 버킷 × max_keys개 키만 보므로
+# 로그 크기와 무관하게 상수 시간에 끝납니다.
+
+ErrorKey = tuple[str, int, str | None]
+
+# 어떤 라우트에도 맞지 않은 요청(404 스캔 등)은 URL마다 키를 만들지 않고
+# 이 이름 하나로 셉니다. 그래야 스캔이 실제 라우트의 키 자리를 차지하지 못합니다.
+UNMATCHED_PATH = "<unmatched>"
 
-@app.middleware("http")
-async def trace_id_middleware(request: Request, call_next):
-    """trace_id 미들웨어.
+# 카운터 키 개수 상한을 넘으면 새 키는 모두 이 키 하나로 합산합니다.
+# 여러 상태 코드가 섞이므로 status_code는 0, error_code는 None으로 둡니다.
+OTHER_PATH = "<other>"
+OTHER_KEY: ErrorKey = (OTHER_PATH, 0, None)
 
-    모든 요청에 고유한 trace_id를 부여합니다.
-    - uuid4로 trace_id 생성
-    - request.state.trace_id에 저장
-    - 응답 헤더 X-Trace-ID에 추가
 
-    예외가 발생해도 trace_id를 응답 헤더에 추가하기 위해
-    try-except로 감싸고, 에러 시 500 응답을 직접 생성합니다.
+class ErrorEventStore:
+    """크기가 제한된 에러 이벤트 저장소.
+
+    리스트처럼 append / len / 인덱싱 / 순회 / clear를 지원하고,
+    최근 N분 동안의 에러 통계를 원본 로그 복사 없이 조회할 수 있습니다.
+
+    Attributes:
+        maxlen: 링 버퍼에 보관할 최근 이벤트 수
+        window_minutes: 집계 카운터를 유지할 기간(분)
+        max_keys: 버킷 하나가 가질 수 있는 (path, status, error_code) 키 수
+            (OTHER_KEY 자리 하나 포함)
+        totals: 시작 이후 전체 누적 카운터
     """
-    # trace_id 생성
-    trace_id = str(uuid.uuid4())
-
-    # request.state에 저장 (핸들러와 에러 핸들러에서 사용 가능)
-    request.state.trace_id = trace_id
-
-    # 요청 처리 (예외가 전파될 수 있음)
-    try:
-        response = await call_next(request)
-    except Exception:
-        # 미처리 예외 → 500 에러 응답 생성
-        response = JSONResponse(
-            status_code=500,
-            content=ErrorResponse(
-                error_code="INTERNAL_ERROR",
-                message="내부 서버 오류가 발생했습니다",
-                detail=None,
-                timestamp=datetime.now().isoformat(),
-                trace_id=trace_id,
-            ).model_dump(),
-        )
 
-    # 응답 헤더에 trace_id 추가
-    response.headers["X-Trace-ID"] = trace_id
+    def __init__(
+        self,
+        maxlen: int = 1000,
+        window_minutes: int = 60,
+        max_keys: int = 500,
+        clock=time.time,
+    ):
+        self.maxlen = maxlen
+        self.window_minutes = window_minutes
+        self.max_keys = max_keys
+        self._clock = clock
+        self._events: deque[dict] = deque(maxlen=maxlen)
+        # slot = minute % window_minutes, 값은 (minute, Counter)
+        self._buckets: list[tuple[int, Counter] | None] = [None] * window_minutes
+        self.totals: Counter = Counter()
+
+    def _count(self, counter: Counter, key: ErrorKey) -> None:
+        # 마지막 한 자리는 OTHER_KEY 몫으로 남겨 두어 키 수가 max_keys를 넘지 않게 합니다.
+        if key not in counter and len(counter) >= self.max_keys - 1:
+            key = OTHER_KEY
+        counter[key] += 1
+
+    def append(self, event: dict) -> None:
+        """이벤트를 링 버퍼에 넣고 카운터를 갱신합니다."""
+        self._events.append(event)
+        key = (event.get("route") or event["path"], event["status_code"], event.get("error_code"))
+        self._count(self.totals, key)
+
+        minute = int(self._clock() // 60)
+        slot = minute % self.window_minutes
+        bucket = self._buckets[slot]
+        if bucket is None or bucket[0] != minute:
+            bucket = (minute, Counter())
+            self._buckets[slot] = bucket
+        self._count(bucket[1], key)
+
+    def counts(self, minutes: int = 5) -> Counter:
+        """최근 minutes분 동안의 (path, status_code, error_code)별 건수"""
+        minutes = max(1, min(minutes, self.window_minutes))
+        now = int(self._clock() // 60)
+        merged: Counter = Counter()
+        for minute in range(now - minutes + 1, now + 1):
+            bucket = self._buckets[minute % self.window_minutes]
+            if bucket is not None and bucket[0] == minute:
+                merged.update(bucket[1])
+        return merged
+
+    def top_paths(self, minutes: int = 5, limit: int = 10) -> list[dict]:
+        """최근 minutes분 동안 에러가 가장 많이 발생한 경로"""
+        return self.summary(minutes, limit)["top_paths"]
+
+    def rate(self, minutes: int = 5) -> float:
+        """최근 minutes분 동안의 분당 에러 발생 건수"""
+        return self.summary(minutes)["rate_per_minute"]
+
+    def summary(self, minutes: int = 5, limit: int = 10) -> dict:
+        """최근 minutes분 통계를 counts() 스냅샷 하나에서 계산합니다.
+
+        total, rate_per_minute, top_paths, top_errors가 같은 시점의 카운터를
+        보므로 집계 도중 에러가 추가되어도 서로 어긋나지 않습니다.
+        """
+        counts = self.counts(minutes)
+        total = sum(counts.values())
+        by_path: Counter = Counter()
+        for (path, _, _), count in counts.items():
+            by_path[path] += count
+        return {
+            "minutes": minutes,
+            "total": total,
+            "rate_per_minute": total / max(1, min(minutes, self.window_minutes)),
+            "top_paths": [
+                {"path": path, "count": count} for path, count in by_path.most_common(limit)
+            ],
+            "top_errors": [
+                {"path": path, "status_code": status_code, "error_code": error_code, "count": count}
+                for (path, status_code, error_code), count in counts.most_common(limit)
+            ],
+        }
+
+    def clear(self) -> None:
+        self._events.clear()
+        self._buckets = [None] * self.window_minutes
+        self.totals.clear()
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def __iter__(self):
+        return iter(self._events)
+
+    def __getitem__(self, index: int) -> dict:
+        return self._events[index]
+
+
+# 에러 로그 저장소 (문제 2에서 사용)
+error_log = ErrorEventStore()
+
+
+# ============================================================
+# 문제 1 + 문제 2 해답: ASGI 에러 경계(Error Boundary) 미들웨어
+# ============================================================
+# trace_id 부여, 예외 캐칭, 에러 응답 렌더링, 에러 로깅을 하나의 순수 ASGI
+# 미들웨어에서 처리합니다. @app.middleware("http") 두 겹을 쓰면 요청마다
+# call_next가 두 번(태스크 + 스트림 생성 포함) 실행되고, 두 곳에서 각자
+# try-except로 500 응답을 만들게 됩니다.
+#
+# 실행 순서: ErrorBoundaryMiddleware → ExceptionMiddleware(전역 핸들러) → 라우트 핸들러
+
+class ErrorBoundaryMiddleware:
+    """trace_id 부여와 에러 캐칭/로깅을 한 번에 처리하는 ASGI 미들웨어.
+
+    - uuid4로 trace_id를 생성해 request.state.trace_id에 저장합니다
+    - 모든 응답 헤더에 X-Trace-ID를 추가합니다
+    - 에러 응답(status_code >= 400)을 error_log에 기록합니다
+    - 전역 핸들러까지 빠져나온 예외는 500 ErrorResponse로 한 번만 렌더링합니다
+    """
 
-    return response
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        trace_id = str(uuid.uuid4())
+        # request.state는 scope["state"] 딕셔너리를 감싼 객체입니다.
+        scope.setdefault("state", {})["trace_id"] = trace_id
+        response_started = False
+
+        async def send_with_trace_id(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+                MutableHeaders(scope=message).append("X-Trace-ID", trace_id)
+                status_code = message["status"]
+                if status_code >= 400:
+                    # 라우팅 후에는 scope["route"]로 경로 템플릿(/users/{user_id})을 알 수 있습니다.
+                    # 라우트가 없으면 원본 URL 대신 UNMATCHED_PATH로 기록합니다.
+                    route = scope.get("route")
+                    error_log.append({
+                        "trace_id": trace_id,
+                        "method": scope["method"],
+                        "path": scope["path"],
+                        "route": getattr(route, "path", None) or UNMATCHED_PATH,
+                        "status_code": status_code,
+                        "error_code": scope["state"].get("error_code"),
+                        "error_type": f"HTTP_{status_code}",
+                        "error_message": f"에러 응답 반환: {status_code}",
+                    })
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_trace_id)
+        except Exception:
+            # 응답을 이미 보내기 시작했다면 새 응답을 만들 수 없으므로 그대로 전파
+            if response_started:
+                raise
+            scope["state"]["error_code"] = ErrorCode.INTERNAL_ERROR
+            response = render_error(
+                500, ErrorCode.INTERNAL_ERROR, "내부 서버 오류가 발생했습니다", None, trace_id
+            )
+            await response(scope, receive, send_with_trace_id)
+
+
+app.add_middleware(ErrorBoundaryMiddleware)
 
 
 # 전역 핸들러: AppException
@@ -173,16 +334,8 @@ async def app_exception_handler(request: Request, exc: AppException):
     request.state.trace_id를 에러 응답에 포함합니다.
     """
     trace_id = getattr(request.state, "trace_id", None)
-    return JSONResponse(
-        status_code=exc.status_code,
-        content=ErrorResponse(
-            error_code=exc.error_code,
-            message=exc.message,
-            detail=exc.detail,
-            timestamp=datetime.now().isoformat(),
-            trace_id=trace_id,
-        ).model_dump(),
-    )
+    request.state.error_code = exc.error_code
+    return render_error(exc.status_code, exc.error_code, exc.message, exc.detail, trace_id)
 
 
 # 전역 핸들러: catch-all
@@ -190,16 +343,8 @@ async def app_exception_handler(request: Request, exc: AppException):
 async def general_exception_handler(request: Request, exc: Exception):
     """모든 미처리 예외를 500 ErrorResponse로 변환합니다."""
     trace_id = getattr(request.state, "trace_id", None)
-    return JSONResponse(
-        status_code=500,
-        content=ErrorResponse(
-            error_code="INTERNAL_ERROR",
-            message="내부 서버 오류가 발생했습니다",
-            detail=None,
-            timestamp=datetime.now().isoformat(),
-            trace_id=trace_id,
-        ).model_dump(),
-    )
+    request.state.error_code = ErrorCode.INTERNAL_ERROR
+    return render_error(500, ErrorCode.INTERNAL_ERROR, "내부 서버 오류가 발생했습니다", None, trace_id)
 
 
 # 엔드포인트
@@ -240,6 +385,15 @@ async def error_runtime():
     raise RuntimeError("예상치 못한 오류 발생!")
 
 
+@app.get("/admin/errors")
+async def error_stats(
+    minutes: int = Query(5, ge=1, le=60),
+    limit: int = Query(10, ge=1, le=100),
+):
+    """최근 minutes분 동안의 에러 통계 (원본 로그를 복사하지 않고 카운터에서 계산)"""
+    return {**error_log.summary(minutes, limit), "buffered_events": len(error_log)}
+
+
 # --- 테스트 ---
 if __name__ == "__main__":
     # 매 테스트 실행 전 에러 로그 초기화
@@ -353,5 +507,76 @@ if __name__ == "__main__":
         assert "error_message" in log_entry
     print("  [통과] 모든 에러 로그가 올바른 구조를 가짐")
 
+    # 테스트 2-7: 미처리 예외는 한 번만 렌더링되고 로그도 한 건만 남음
+    log_count_before = len(error_log)
+    response = client.get("/error/runtime")
+    data = ErrorResponse.model_validate(response.json())
+    assert response.status_code == 500
+    assert data.error_code == "INTERNAL_ERROR"
+    assert data.trace_id == response.headers["x-trace-id"]
+    assert len(error_log) == log_count_before + 1
+    assert error_log[-1]["trace_id"] == data.trace_id
+    print("  [통과] 에러 경계 미들웨어가 500 응답을 한 번만 생성하고 기록")
+
+    # 에러 이벤트 저장소 테스트
+    print()
+    print("=" * 50)
+    print("추가: 에러 이벤트 저장소와 집계 테스트")
+    print("=" * 50)
+
+    # 테스트 3-1: 에러 로그 엔트리에 error_code, 경로 템플릿 기록
+    error_log.clear()
+    client.get("/users/998")
+    client.get("/users/999")
+    client.get("/error/runtime")
+    assert error_log[0]["error_code"] == "USER_NOT_FOUND"
+    assert error_log[0]["route"] == "/users/{user_id}"
+    assert error_log[-1]["error_code"] == "INTERNAL_ERROR"
+    print("  [통과] 에러 로그에 error_code와 경로 템플릿 기록")
+
+    # 테스트 3-2: 관리자 통계 엔드포인트
+    response = client.get("/admin/errors", params={"minutes": 5})
+    assert response.status_code == 200
+    stats = response.json()
+    assert stats["total"] == 3
+    assert stats["top_paths"][0] == {"path": "/users/{user_id}", "count": 2}
+    assert stats["top_errors"][0]["error_code"] == "USER_NOT_FOUND"
+    assert stats["rate_per_minute"] == 3 / 5
+    print("  [통과] /admin/errors 상위 에러 경로와 분당 발생률 조회")
+
+    # 테스트 3-2b: 없는 URL 스캔은 <unmatched> 하나로 모여 실제 라우트 키를 밀어내지 않음
+    for i in range(600):
+        client.get(f"/scan/{i}")
+    client.get("/users/997")  # 스캔 뒤에 생긴 실제 에러도 자기 키로 집계
+    top_errors = client.get("/admin/errors", params={"limit": 100}).json()["top_errors"]
+    keys = {(item["path"], item["error_code"]): item["count"] for item in top_errors}
+    assert keys[("/users/{user_id}", "USER_NOT_FOUND")] == 3
+    assert keys[(UNMATCHED_PATH, None)] == 600
+    assert OTHER_KEY not in error_log.totals
+    print("  [통과] 404 스캔은 <unmatched>로 합산되고 라우트별 집계는 유지")
+
+    # 테스트 3-3: 링 버퍼 크기 제한과 시간 창 밖 이벤트 제외
+    now = [0.0]
+    store = ErrorEventStore(maxlen=3, window_minutes=10, clock=lambda: now[0])
+    for i in range(5):
+        store.append({"path": f"/p{i % 2}", "status_code": 404, "error_code": None})
+    assert len(store) == 3
+    assert store.totals[("/p0", 404, None)] == 3
+    now[0] = 11 * 60  # 11분 후: 첫 버킷은 시간 창 밖
+    store.append({"path": "/p1", "status_code": 500, "error_code": "INTERNAL_ERROR"})
+    assert sum(store.counts(10).values()) == 1
+    assert store.top_paths(10) == [{"path": "/p1", "count": 1}]
+    print("  [통과] 링 버퍼 크기 제한과 시간 창 집계")
+
+    # 테스트 3-4: 키 개수 상한을 넘는 키는 <other> 하나로 합산 (상태 코드가 달라도 상한 유지)
+    store = ErrorEventStore(max_keys=3)
+    for i in range(6):
+        store.append({"path": f"/scan/{i}", "status_code": 404 + i % 2, "error_code": None})
+    assert len(store.totals) == 3
+    assert store.totals[OTHER_KEY] == 4
+    summary = store.summary()
+    assert summary["total"] == sum(item["count"] for item in summary["top_errors"]) == 6
+    print("  [통과] 카운터 키 개수 상한 유지")
+
     print()
     print("모든 테스트를 통과했습니다!")